@@ -0,0 +1,224 @@
+"""NPC decisions on staggered think ticks, less often the farther an NPC is from the player."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Optional, TYPE_CHECKING
+
+import pygame
+
+from npc_character import NPCRegister
+
+if TYPE_CHECKING:
+    from npc_character import NPCCharacter
+
+
+# ─────────────────────────────────────────────────────────────
+# Brains
+# ─────────────────────────────────────────────────────────────
+
+class NPCBrain:
+    """
+    Base class for NPC decision logic.
+    Brains hold no state, one instance is shared by every NPC of a type.
+    """
+
+    def think(self, npc: NPCCharacter, scheduler: AIScheduler, interval: int) -> None:
+        """
+        Decides what the NPC does until its next think, ``interval`` ticks from now.
+        The NPC keeps moving toward its target in between.
+        """
+        raise NotImplementedError("NPC brain must implement 'think'")
+
+
+class ChaseBrain(NPCBrain):
+    """Runs to where the player's head will be by the next think, or reaches earlier."""
+
+    def think(self, npc: NPCCharacter, scheduler: AIScheduler, interval: int) -> None:
+        head = scheduler.head
+        distance = math.hypot(head[0] - npc.pos.x, head[1] - npc.pos.y)
+        # Lead the head by the ticks until the next think, but not past the time to get there
+        lead = min(interval, distance / npc.move_speed)
+        velocity = scheduler.head_velocity
+        npc.set_target_pos((head[0] + velocity[0] * lead - npc.pos.x, head[1] + velocity[1] * lead - npc.pos.y))
+
+
+class AIRegister:
+    """
+    Level of detail: name, farthest distance to the player's head and ticks
+    between two thinks. On screen NPCs use NEAR or SCREEN, the others MID or FAR.
+    """
+    NAME = 0
+    DISTANCE = 1
+    INTERVAL = 2
+
+    NEAR = ("near", 600, 2)
+    SCREEN = ("screen", math.inf, 6)
+    MID = ("mid", 2000, 15)
+    FAR = ("far", math.inf, 60)
+    LEVELS = [NEAR, SCREEN, MID, FAR]
+
+    # Brain of each NPCRegister entry, NPCs without one are not scheduled
+    BRAINS = {
+        NPCRegister.VAMPIRE: ChaseBrain(),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Scheduler
+# ─────────────────────────────────────────────────────────────
+
+class AIScheduler:
+    def __init__(self, budget_ms: float = 1.0, lod: bool = True) -> None:
+        """
+        Runs the brains of registered NPCs on think ticks. Each NPC thinks
+        again after the interval of its level of detail, which is picked from
+        its distance to the player's head and whether it is on screen. Think
+        ticks are kept in a timing wheel (tick -> NPCs), so only NPCs that are
+        due are looked at, and new NPCs are spread over the next ticks.
+
+        A frame stops thinking once ``budget_ms`` is used up. The NPCs left
+        are deferred to the next frame and go first there.
+
+        Args:
+            budget_ms: Milliseconds per frame brains may take.
+            lod: False makes every NPC think every tick, for comparison.
+        """
+        self.budget_ms = budget_ms
+        self.lod = lod
+
+        self.brains: dict[NPCCharacter, NPCBrain] = {}
+        self.next_think: dict[NPCCharacter, int] = {}
+        self.wheel: dict[int, list[NPCCharacter]] = {}
+        self.overdue: deque[NPCCharacter] = deque()
+        self.tick = 0
+        self.registered = 0
+
+        # Player state brains read, set each update
+        self.head = (0.0, 0.0)
+        self.head_velocity = (0.0, 0.0)
+        self._last_head: Optional[tuple[float, float]] = None
+        self.view = pygame.Rect(0, 0, 0, 0)
+
+        # Per frame numbers
+        self.last_ms = 0.0
+        self.last_thinks = 0
+        self.last_deferred = 0
+        self.level_counts = {level[AIRegister.NAME]: 0 for level in AIRegister.LEVELS}
+        self.frame_ms: deque[float] = deque(maxlen=600)
+        self.max_ms = 0.0
+        self.thinks = 0
+        self.deferred = 0
+
+    def __len__(self) -> int:
+        return len(self.brains)
+
+    def register(self, npc: NPCCharacter) -> bool:
+        """Schedules an NPC if its type has a brain. Returns True if it was scheduled."""
+        brain = AIRegister.BRAINS.get(npc.character)
+        if brain is None:
+            return False
+        self.brains[npc] = brain
+        # Spread new NPCs over the next ticks, so a wave does not think all at once
+        self._schedule(npc, self.tick + self.registered % AIRegister.MID[AIRegister.INTERVAL])
+        self.registered += 1
+        return True
+
+    def unregister(self, npc: NPCCharacter) -> None:
+        self.brains.pop(npc, None)
+        self.next_think.pop(npc, None)
+
+    def clear(self) -> None:
+        self.brains.clear()
+        self.next_think.clear()
+        self.wheel.clear()
+        self.overdue.clear()
+
+    def _schedule(self, npc: NPCCharacter, tick: int) -> None:
+        self.next_think[npc] = tick
+        self.wheel.setdefault(tick, []).append(npc)
+
+    def level_of(self, npc: NPCCharacter) -> tuple:
+        """The AIRegister level of detail of an NPC."""
+        dx = npc.pos.x - self.head[0]
+        dy = npc.pos.y - self.head[1]
+        distance_sq = dx * dx + dy * dy
+        if self.view.collidepoint(npc.pos.x, npc.pos.y):
+            near = AIRegister.NEAR[AIRegister.DISTANCE]
+            return AIRegister.NEAR if distance_sq <= near * near else AIRegister.SCREEN
+        mid = AIRegister.MID[AIRegister.DISTANCE]
+        return AIRegister.MID if distance_sq <= mid * mid else AIRegister.FAR
+
+    # ──────────────────────────────────────────────────────────────
+    # Tick
+    # ──────────────────────────────────────────────────────────────
+
+    def update(self, head: tuple[float, float], view: tuple[float, float, float, float]) -> None:
+        """
+        Lets the NPCs that are due think, within the budget. Call once per tick.
+
+        Args:
+            head: Position of the player's head.
+            view: Left, top, right and bottom of the visible world.
+        """
+        start = time.perf_counter()
+        if self._last_head is not None:
+            self.head_velocity = (head[0] - self._last_head[0], head[1] - self._last_head[1])
+        self._last_head = self.head = (head[0], head[1])
+        self.view = pygame.Rect(view[0], view[1], view[2] - view[0], view[3] - view[1])
+
+        # Everything due now queues up behind what was deferred, dropping outdated wheel entries.
+        # Queued NPCs are marked, so a stale wheel entry cannot add them a second time
+        for npc in self.wheel.pop(self.tick, ()):
+            if self.next_think.get(npc) == self.tick:
+                self.next_think[npc] = -1
+                self.overdue.append(npc)
+
+        for level in self.level_counts:
+            self.level_counts[level] = 0
+        thinks = 0
+        budget_s = self.budget_ms / 1000
+        while self.overdue:
+            npc = self.overdue.popleft()
+            brain = self.brains.get(npc)
+            if brain is None:
+                continue
+            if npc.HP <= 0:
+                self.unregister(npc)
+                continue
+
+            level = self.level_of(npc)
+            interval = level[AIRegister.INTERVAL] if self.lod else 1
+            brain.think(npc, self, interval)
+            self._schedule(npc, self.tick + interval)
+            self.level_counts[level[AIRegister.NAME]] += 1
+            thinks += 1
+            if time.perf_counter() - start >= budget_s:
+                break
+
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.last_thinks = thinks
+        self.last_deferred = len(self.overdue)
+        self.frame_ms.append(self.last_ms)
+        self.max_ms = max(self.max_ms, self.last_ms)
+        self.thinks += thinks
+        self.deferred += self.last_deferred
+        self.tick += 1
+
+    def stats(self) -> dict:
+        """Thinks, deferred decisions and used budget of the last frame, and totals."""
+        average_ms = sum(self.frame_ms) / len(self.frame_ms) if self.frame_ms else 0.0
+        return {
+            "npcs": len(self.brains),
+            "last_ms": self.last_ms,
+            "budget_used": self.last_ms / self.budget_ms if self.budget_ms else 0.0,
+            "average_budget_used": average_ms / self.budget_ms if self.budget_ms else 0.0,
+            "max_ms": self.max_ms,
+            "last_thinks": self.last_thinks,
+            "last_deferred": self.last_deferred,
+            "levels": dict(self.level_counts),
+            "thinks": self.thinks,
+            "deferred": self.deferred,
+        }
@@ -0,0 +1,293 @@
+"""Opt-in allocation profiler that groups tracemalloc data by game subsystem."""
+
+import ast
+import gc
+import json
+import os
+import time
+import tracemalloc
+from collections import deque
+from typing import Optional
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+
+class SubsystemRegister:
+    """Game subsystem of each module, by file name without extension."""
+    MODULES = {
+        "main": "game",
+        "headless": "game",
+        "frame_stats": "game",
+        "gc_scheduler": "game",
+        "sampling_profiler": "game",
+        "player_character": "player",
+        "snake_path": "player",
+        "stat_modifiers": "player",
+        "weapon_mounts": "player",
+        "player_attachments": "weapons",
+        "area_damage": "weapons",
+        "npc_character": "npcs",
+        "wave_spawner": "npcs",
+        "ai_scheduler": "npcs",
+        "crowd_steering": "npcs",
+        "visibility": "npcs",
+        "particles": "effects",
+        "sound_bank": "effects",
+        "hub": "world",
+        "tarain": "world",
+        "resolution_scaler": "render",
+        "lighting": "render",
+        "render_queue": "render",
+        "frame_capture": "render",
+        "player_hud": "hud",
+        "minimap": "hud",
+    }
+    OTHER = "other"
+
+
+# ─────────────────────────────────────────────────────────────
+# Source Lookup
+# ─────────────────────────────────────────────────────────────
+
+_function_ranges: dict[str, list[tuple[int, int, str]]] = {}
+
+
+def _ranges(filename: str) -> list[tuple[int, int, str]]:
+    """(first line, last line, qualified name) of every function in a file, parsed once."""
+    ranges = _function_ranges.get(filename)
+    if ranges is not None:
+        return ranges
+
+    ranges = []
+    try:
+        with open(filename, encoding="utf-8") as file:
+            tree = ast.parse(file.read())
+    except (OSError, SyntaxError, ValueError):
+        tree = None
+
+    def visit(node, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    ranges.append((child.lineno, child.end_lineno or child.lineno, name))
+                visit(child, name + ".")
+
+    if tree is not None:
+        visit(tree, "")
+    _function_ranges[filename] = ranges
+    return ranges
+
+
+def function_at(filename: str, lineno: int) -> str:
+    """Name of the innermost function that contains a line, '<module>' outside of functions."""
+    best = "<module>"
+    best_size = None
+    for first, last, name in _ranges(filename):
+        if first <= lineno <= last and (best_size is None or last - first < best_size):
+            best, best_size = name, last - first
+    return best
+
+
+def subsystem_of(filename: str) -> str:
+    module = os.path.splitext(os.path.basename(filename))[0]
+    return SubsystemRegister.MODULES.get(module, SubsystemRegister.OTHER)
+
+
+# ─────────────────────────────────────────────────────────────
+# Profiler
+# ─────────────────────────────────────────────────────────────
+
+class AllocationProfiler:
+    def __init__(self, interval_frames: int = 120, report_path: Optional[str] = None, top: int = 15) -> None:
+        """
+        Takes a tracemalloc snapshot every ``interval_frames`` frames and diffs it
+        with the previous one. Three numbers are collected per frame:
+
+        - net bytes and blocks each subsystem and function kept alive (snapshot diffs)
+        - peak short lived bytes per frame phase (tracemalloc peaks between marks)
+        - GC collections per generation and their pause times (gc callbacks)
+
+        Tracing slows the game down, so it is only started on request.
+
+        Args:
+            interval_frames: Frames between two snapshots.
+            report_path: JSON file the report is written to by finish(), none if None.
+            top: Number of functions listed in the report.
+        """
+        self.interval_frames = max(1, interval_frames)
+        self.report_path = report_path
+        self.top = top
+
+        self.frame = 0
+        self.running = False
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._phase_base = 0
+
+        # Summed over all intervals
+        self.sampled_frames = 0
+        self.subsystems: dict[str, dict[str, int]] = {}
+        self.functions: dict[tuple[str, str], dict[str, int]] = {}
+        self.phase_peaks: dict[str, deque[int]] = {}
+
+        self.gc_collections = [0, 0, 0]
+        self.gc_pauses_ms: list[deque[float]] = [deque(maxlen=1000) for _ in range(3)]
+        self._gc_start = 0.0
+
+        # Where the profiling itself allocates
+        self.filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, ast.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+
+    def start(self) -> None:
+        if self.running:
+            return
+        tracemalloc.start()
+        gc.callbacks.append(self._on_gc)
+        self._snapshot = self._take()
+        self.running = True
+        cprint(f"Allocation profiler on, snapshot every {self.interval_frames} frames", VC.MAGENTA)
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
+        self._snapshot = None
+        self.running = False
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self.filters)
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        else:
+            generation = info["generation"]
+            self.gc_collections[generation] += 1
+            self.gc_pauses_ms[generation].append((time.perf_counter() - self._gc_start) * 1000)
+
+    # ──────────────────────────────────────────────────────────────
+    # Frame Hooks
+    # ──────────────────────────────────────────────────────────────
+
+    def start_frame(self) -> None:
+        if not self.running:
+            return
+        tracemalloc.reset_peak()
+        self._phase_base = tracemalloc.get_traced_memory()[0]
+
+    def mark(self, phase: str) -> None:
+        """Ends a frame phase and records how far memory rose above its start during it."""
+        if not self.running:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if phase not in self.phase_peaks:
+            self.phase_peaks[phase] = deque(maxlen=1000)
+        self.phase_peaks[phase].append(peak - self._phase_base)
+        tracemalloc.reset_peak()
+        self._phase_base = current
+
+    def end_frame(self) -> None:
+        if not self.running:
+            return
+        self.frame += 1
+        if self.frame % self.interval_frames == 0:
+            self._sample()
+
+    def _sample(self) -> None:
+        """Diffs a new snapshot with the last one and adds it up per subsystem and function."""
+        snapshot = self._take()
+        for stat in snapshot.compare_to(self._snapshot, "lineno"):
+            if not stat.size_diff and not stat.count_diff:
+                continue
+            frame = stat.traceback[0]
+            subsystem = subsystem_of(frame.filename)
+            function = function_at(frame.filename, frame.lineno)
+
+            for totals in (self.subsystems.setdefault(subsystem, {}),
+                           self.functions.setdefault((subsystem, f"{os.path.basename(frame.filename)}:{function}"), {})):
+                totals["bytes"] = totals.get("bytes", 0) + stat.size_diff
+                totals["blocks"] = totals.get("blocks", 0) + stat.count_diff
+                totals["grown"] = totals.get("grown", 0) + max(0, stat.size_diff)
+
+        self._snapshot = snapshot
+        self.sampled_frames += self.interval_frames
+
+    # ──────────────────────────────────────────────────────────────
+    # Reports
+    # ──────────────────────────────────────────────────────────────
+
+    def report(self) -> dict:
+        """Everything collected so far, with per frame values."""
+        frames = max(1, self.sampled_frames)
+
+        def per_frame(totals: dict) -> dict:
+            return {
+                "bytes_per_frame": totals.get("bytes", 0) / frames,
+                "blocks_per_frame": totals.get("blocks", 0) / frames,
+                "grown_bytes_per_frame": totals.get("grown", 0) / frames,
+            }
+
+        functions = sorted(self.functions.items(), key=lambda item: -abs(item[1].get("bytes", 0)))
+        return {
+            "frames": self.frame,
+            "sampled_frames": self.sampled_frames,
+            "subsystems": {name: per_frame(totals) for name, totals in sorted(self.subsystems.items())},
+            "functions": [
+                {"subsystem": subsystem, "function": function, **per_frame(totals)}
+                for (subsystem, function), totals in functions[:self.top]
+            ],
+            "phase_peak_bytes": {
+                phase: sum(peaks) / len(peaks) for phase, peaks in self.phase_peaks.items() if peaks
+            },
+            "gc": {
+                "collections": list(self.gc_collections),
+                "collections_per_frame": [count / max(1, self.frame) for count in self.gc_collections],
+                "pause_ms_avg": [sum(p) / len(p) if p else 0.0 for p in self.gc_pauses_ms],
+                "pause_ms_max": [max(p) if p else 0.0 for p in self.gc_pauses_ms],
+            },
+        }
+
+    def text_report(self, report: Optional[dict] = None) -> str:
+        report = report or self.report()
+        lines = [f"Allocations over {report['sampled_frames']} sampled frames ({report['frames']} profiled)"]
+
+        lines.append(f"{'subsystem':>10} {'net B/frame':>12} {'blocks/frame':>13} {'grown B/frame':>14}")
+        for name, values in report["subsystems"].items():
+            lines.append(f"{name:>10} {values['bytes_per_frame']:>12.1f} {values['blocks_per_frame']:>13.2f} "
+                         f"{values['grown_bytes_per_frame']:>14.1f}")
+
+        lines.append("top functions by net bytes per frame")
+        for entry in report["functions"]:
+            lines.append(f"  {entry['bytes_per_frame']:>10.1f} B {entry['blocks_per_frame']:>8.2f} blocks  "
+                         f"[{entry['subsystem']}] {entry['function']}")
+
+        peaks = " | ".join(f"{phase} {peak / 1024:.1f} kB" for phase, peak in report["phase_peak_bytes"].items())
+        lines.append(f"short lived peak per phase: {peaks or '-'}")
+
+        gc_report = report["gc"]
+        lines.append("gc collections per generation: " + ", ".join(
+            f"gen{gen} {count} ({per_frame:.3f}/frame, avg {avg:.2f} ms, max {peak:.2f} ms)"
+            for gen, (count, per_frame, avg, peak) in enumerate(zip(
+                gc_report["collections"], gc_report["collections_per_frame"],
+                gc_report["pause_ms_avg"], gc_report["pause_ms_max"]))
+        ))
+        return "\n".join(lines)
+
+    def finish(self) -> dict:
+        """Stops profiling, prints the text report and writes the JSON report if a path is set."""
+        report = self.report()
+        self.stop()
+        cprint(self.text_report(report), VC.GREEN)
+        if self.report_path:
+            with open(self.report_path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+            cprint(f"Allocation report written to {self.report_path}", VC.MAGENTA)
+        return report
@@ -0,0 +1,90 @@
+"""Batched damage of area blasts against every NPC in their radius."""
+
+from __future__ import annotations
+
+import time
+from itertools import chain
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from entity_activity import ActivityManager
+    from npc_character import NPCCharacter
+    from player_attachments import MagicBlast
+
+
+class AreaDamageResolver:
+    def __init__(self) -> None:
+        """
+        Resolves all blasts of a tick at once. The candidates are the active
+        NPCs, whose positions are gathered once per tick, and the dormant ones
+        a single grid query per blast finds. Distances of every blast to every
+        candidate are one array operation, so a blast costs about the same
+        whether it hits three NPCs or three hundred.
+
+        Damage falls off linearly from the full amount at the center to
+        ``MagicBlast.edge_damage`` of it at the edge. Overlapping blasts add up
+        and each NPC is damaged once with the sum.
+        """
+        # Counters
+        self.blasts = 0
+        self.hits = 0
+        self.last_candidates = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+
+    def resolve(self, blasts: list[MagicBlast], activity: ActivityManager) -> list[tuple[NPCCharacter, int]]:
+        """
+        Marks the blasts as detonated and returns every NPC they hit with its damage.
+        Applying the damage is left to the caller.
+
+        Args:
+            blasts: Blasts set off this tick.
+            activity: The activity manager of the NPCs.
+        """
+        if not blasts:
+            return []
+        start = time.perf_counter()
+
+        # An NPC is either active or dormant, dormant ones may be in reach of several blasts
+        dormant = {}
+        for blast in blasts:
+            blast.detonated = True
+            dormant.update(dict.fromkeys(activity.dormant.query_radius(blast.pos, blast.radius)))
+        npcs = [npc for npc in chain(activity.active, dormant) if npc.active and npc.HP > 0]
+
+        hits = []
+        if npcs:
+            positions = np.fromiter(chain.from_iterable([npc.pos for npc in npcs]), np.float64,
+                                    2 * len(npcs)).reshape(-1, 2)
+            centers = np.array([(blast.pos.x, blast.pos.y) for blast in blasts], np.float64)
+            radii = np.array([blast.radius for blast in blasts], np.float64)
+            damages = np.array([blast.damage for blast in blasts], np.float64)
+            edge = np.array([blast.edge_damage for blast in blasts], np.float64)
+
+            # Blasts x NPCs
+            offsets = positions[None, :, :] - centers[:, None, :]
+            distance = np.sqrt((offsets * offsets).sum(axis=2)) / radii[:, None]
+            falloff = 1.0 - (1.0 - edge[:, None]) * distance
+            damage = np.where(distance <= 1.0, falloff * damages[:, None], 0.0).sum(axis=0)
+
+            hit = np.flatnonzero(damage > 0)
+            totals = np.maximum(1, np.rint(damage[hit])).astype(int)
+            hits = [(npcs[i], int(total)) for i, total in zip(hit.tolist(), totals.tolist())]
+
+        self.blasts += len(blasts)
+        self.hits += len(hits)
+        self.last_candidates = len(npcs)
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.max_ms = max(self.max_ms, self.last_ms)
+        return hits
+
+    def stats(self) -> dict:
+        return {
+            "blasts": self.blasts,
+            "hits": self.hits,
+            "last_candidates": self.last_candidates,
+            "last_ms": self.last_ms,
+            "max_ms": self.max_ms,
+        }
@@ -0,0 +1,60 @@
+"""benchmark for dormant ground items and NPCs
+
+fills the world with loot and idle NPCs and runs the full game loop on SDL's
+dummy drivers while the snake circles. reports the update and render time
+per frame and the active and dormant counts for growing numbers of items.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_activity
+"""
+
+import contextlib
+import io
+import math
+import random
+
+from game_config import GameConfig
+from headless import init_headless
+from main import Game
+from npc_character import NPCCharacter, NPCRegister
+from player_attachments import Attachment, WeaponRegister
+
+FRAMES = 300
+WORLD = 20_000
+
+
+def run(items: int, npcs: int) -> tuple[float, float, dict]:
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(GameConfig(sound=False))
+        weapon_types = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.HEALING]
+        for _ in range(items):
+            pos = (rng.uniform(-WORLD, WORLD), rng.uniform(-WORLD, WORLD))
+            game.add_ground_weapon(Attachment(game.world_screen, game.player, pos, rng.choice(weapon_types)))
+        for i in range(npcs):
+            pos = (rng.uniform(-WORLD, WORLD), rng.uniform(-WORLD, WORLD))
+            game.add_npc(f"npc_{i}", NPCCharacter(game.world_screen, NPCRegister.WIZARD, pos, active=True))
+
+        player = game.player
+        for frame in range(FRAMES):
+            angle = frame * 0.03
+            head = player.snake_pos[0]
+            player.target_pos = (head[0] + math.cos(angle) * 300, head[1] + math.sin(angle) * 300)
+            game.run_frame()
+
+    return game.frame_stats.average("update"), game.frame_stats.average("render"), game.activity_counts()
+
+
+def main() -> None:
+    init_headless()
+    print(f"{'items':>7} {'npcs':>6} {'update ms':>10} {'render ms':>10} {'weapons active/dormant':>23} "
+          f"{'npcs active/dormant':>20}")
+    for items, npcs in ((0, 0), (1_000, 100), (10_000, 1_000), (50_000, 5_000)):
+        update_ms, render_ms, counts = run(items, npcs)
+        weapons = f"{counts['weapons']['active']}/{counts['weapons']['dormant']}"
+        npc_counts = f"{counts['npcs']['active']}/{counts['npcs']['dormant']}"
+        print(f"{items:>7} {npcs:>6} {update_ms:>10.3f} {render_ms:>10.3f} {weapons:>23} {npc_counts:>20}")
+
+
+if __name__ == "__main__":
+    main()
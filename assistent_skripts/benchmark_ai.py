@@ -0,0 +1,73 @@
+"""benchmark for the AI scheduler
+
+scatters chasing enemies up to 4000 pixels around a head that walks in a
+circle and lets the scheduler run their brains for a few hundred ticks.
+reports the AI time per frame, the part of the budget that was used, how
+many decisions were made and deferred per frame, and the mean distance of
+the enemies that started on screen to the head at the end, once with every
+enemy thinking every tick and once with levels of detail under the budget.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_ai
+"""
+
+import contextlib
+import io
+import math
+import random
+
+from ai_scheduler import AIScheduler
+from headless import HeadlessGame
+from npc_character import NPCRegister
+
+TICKS = 300
+BUDGET_MS = 1.0
+
+
+def run(game: HeadlessGame, count: int, lod: bool) -> tuple[dict, float]:
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.reset_world()
+        game.ai = AIScheduler(BUDGET_MS if lod else 1e9, lod=lod)
+        npcs = []
+        for i in range(count):
+            angle = rng.uniform(0, math.tau)
+            distance = rng.uniform(100, 4000)
+            npc = game.spawn_npc(f"npc_{i}", NPCRegister.VAMPIRE,
+                                 (math.cos(angle) * distance, math.sin(angle) * distance))
+            game.ai.register(npc)
+            npcs.append(npc)
+
+    width, height = game.screen.get_size()
+    near = [npc for npc in npcs if abs(npc.pos.x) < width / 2 and abs(npc.pos.y) < height / 2]
+    total_ms = 0.0
+    for tick in range(TICKS):
+        head = (math.cos(tick / 60) * 300, math.sin(tick / 60) * 300)
+        view = (head[0] - width / 2, head[1] - height / 2, head[0] + width / 2, head[1] + height / 2)
+        game.ai.update(head, view)
+        total_ms += game.ai.last_ms
+        for npc in npcs:
+            npc.update()
+
+    stats = game.ai.stats()
+    stats["average_ms"] = total_ms / TICKS
+    distance = sum(math.hypot(npc.pos.x - head[0], npc.pos.y - head[1]) for npc in near) / max(1, len(near))
+    return stats, distance
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame()
+
+    print(f"{'npcs':>6} {'scheduling':>11} {'avg ms':>7} {'max ms':>7} {'budget used':>12} "
+          f"{'thinks/frame':>13} {'deferred/frame':>15} {'on screen dist':>15}")
+    for count in (500, 2_000, 5_000):
+        for label, lod in (("every tick", False), ("lod", True)):
+            stats, distance = run(game, count, lod)
+            budget_used = f"{stats['average_ms'] / BUDGET_MS:.0%}"
+            print(f"{count:>6} {label:>11} {stats['average_ms']:>7.2f} {stats['max_ms']:>7.2f} {budget_used:>12} "
+                  f"{stats['thinks'] / TICKS:>13.0f} {stats['deferred'] / TICKS:>15.1f} {distance:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
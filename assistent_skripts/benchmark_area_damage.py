@@ -0,0 +1,82 @@
+"""benchmark for the area damage resolver
+
+surrounds the snake with a crowd of NPCs and sets off several magic blasts
+in the same tick. reports the time per blast of the batched resolver and of
+a plain loop over every NPC for each blast, for growing crowds and stacks of
+magic weapons.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_area_damage
+"""
+
+import contextlib
+import io
+import math
+import random
+import time
+
+import pygame
+
+from headless import HeadlessGame
+from npc_character import NPCRegister
+from player_attachments import MagicBehavior, MagicBlast, WeaponRegister, WeaponType
+
+REPEATS = 50
+
+
+def loop_resolve(blasts: list[MagicBlast], npcs) -> list:
+    """One pass over all NPCs per blast, what the resolver replaces."""
+    hits = []
+    for blast in blasts:
+        for npc in npcs:
+            if not npc.active or npc.HP <= 0:
+                continue
+            distance = (npc.pos - blast.pos).length()
+            if distance <= blast.radius:
+                falloff = 1 - (1 - blast.edge_damage) * distance / blast.radius
+                hits.append((npc, max(1, round(blast.damage * falloff))))
+    return hits
+
+
+def main() -> None:
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame()
+    magic = WeaponType.get(WeaponRegister.MAGIC, game.world_screen)
+
+    print(f"{'npcs':>6} {'blasts':>7} {'hits':>6} {'batched us/blast':>17} {'loop us/blast':>14}")
+    for count in (100, 500, 2_000):
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.reset_world()
+            for i in range(count):
+                angle = rng.uniform(0, math.tau)
+                distance = rng.uniform(0, 1500)
+                npc = game.spawn_npc(f"npc_{i}", NPCRegister.VAMPIRE,
+                                     (math.cos(angle) * distance, math.sin(angle) * distance))
+                # Keep them walking, so they stay in the active set like a chasing crowd
+                npc.set_target_pos((10_000, 0))
+
+        for blast_count in (1, 4, 8):
+            centers = [pygame.Vector2(rng.uniform(-300, 300), rng.uniform(-300, 300)) for _ in range(blast_count)]
+
+            batched = 0.0
+            for _ in range(REPEATS):
+                blasts = [MagicBlast(magic, center, magic.damage, MagicBehavior.radius) for center in centers]
+                start = time.perf_counter()
+                hits = game.area_damage.resolve(blasts, game.npc_activity)
+                batched += time.perf_counter() - start
+
+            looped = 0.0
+            npcs = list(game.npc_characters.values())
+            for _ in range(REPEATS):
+                blasts = [MagicBlast(magic, center, magic.damage, MagicBehavior.radius) for center in centers]
+                start = time.perf_counter()
+                loop_resolve(blasts, npcs)
+                looped += time.perf_counter() - start
+
+            per_blast = 1e6 / (REPEATS * blast_count)
+            print(f"{count:>6} {blast_count:>7} {len(hits):>6} {batched * per_blast:>17.1f} {looped * per_blast:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
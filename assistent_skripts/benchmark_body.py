@@ -0,0 +1,64 @@
+"""benchmark for the snake body in chain and path mode
+
+times the body update alone, and a whole frame of the snake: the update,
+submitting the body to the render queue and drawing it. the snake walks
+in a square around the view, so most of a long body is off screen.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_body
+"""
+
+import time
+
+from headless import init_headless
+from player_character import Player, BodyMode
+from render_queue import RenderQueue
+
+
+def walk(player: Player, frame: int) -> None:
+    # circle around so the body has to bend
+    player.target_pos = (400 * (frame % 2), 400 * ((frame // 2) % 2))
+
+
+def time_body_update(screen, body_mode: str, length: int, frames: int = 60) -> float:
+    """returns the average milliseconds of one update_body_positions call"""
+    player = Player(screen, (640, 360), (0, 0), 10, body_mode=body_mode)
+    for _ in range(length - len(player.snake_pos)):
+        player.add_snake_part()
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        walk(player, frame)
+        player.update_body_positions()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def time_frame(screen, body_mode: str, length: int, frames: int = 60) -> float:
+    """returns the average milliseconds of updating, submitting and drawing the snake"""
+    player = Player(screen, (640, 360), (0, 0), 10, body_mode=body_mode)
+    for _ in range(length - len(player.snake_pos)):
+        player.add_snake_part()
+    queue = RenderQueue(screen)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        walk(player, frame)
+        player.update_body_positions()
+        player.render(queue, (640, 360))
+        queue.flush((640, 360))
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main() -> None:
+    screen = init_headless()
+    print(f"{'segments':>10} {'chain ms':>10} {'path ms':>10} {'chain frame ms':>15} {'path frame ms':>14}")
+    for length in (100, 1_000, 10_000, 50_000):
+        chain = time_body_update(screen, BodyMode.CHAIN, length, frames=10)
+        path = time_body_update(screen, BodyMode.PATH, length)
+        chain_frame = time_frame(screen, BodyMode.CHAIN, length, frames=10)
+        path_frame = time_frame(screen, BodyMode.PATH, length)
+        print(f"{length:>10} {chain:>10.3f} {path:>10.3f} {chain_frame:>15.3f} {path_frame:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
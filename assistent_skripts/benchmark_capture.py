@@ -0,0 +1,73 @@
+"""benchmark for recording frames to disk
+
+runs the same frames of a walking snake on SDL's dummy drivers at 60 fps:
+without recording, with every frame saved as png right after the flip
+inside the game loop, and with the shared memory ring and its writer
+process in a few settings. reports the average and worst frame time, how
+many frames were captured, dropped and written, and the writer's backlog
+when the run ended.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_capture
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pygame
+
+from game_config import GameConfig
+from headless import HeadlessGame
+from npc_character import NamedNPCs, NPCRegister
+from frame_capture import CaptureRegister
+
+FRAMES = 200
+
+
+def run(directory: str, mode: str, **capture) -> tuple[float, float, dict]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False, capture_dir=directory if capture else None, **capture))
+        # The game loop moves this NPC around every 300 ticks
+        game.spawn_npc(NamedNPCs.NIBBIN, NPCRegister.WIZARD, (300, 300))
+        game.player.target_pos = (3000, 500)
+
+        frame_ms = []
+        for frame in range(FRAMES):
+            start = time.perf_counter()
+            game.run_frame()
+            if mode == "sync":
+                pygame.image.save(game.screen, os.path.join(directory, f"frame_{frame:07d}.png"))
+            frame_ms.append((time.perf_counter() - start) * 1000)
+            # Paced like the game, the idle time is what the writer gets on a single core
+            game.clock.tick(60)
+
+        stats = {"captured": FRAMES if mode == "sync" else 0, "dropped": 0, "backlog": 0,
+                 "written": FRAMES if mode == "sync" else 0}
+        if game.capture:
+            stats = game.capture.stats()
+            game.capture.close()
+            stats["written"] = game.capture.stats()["written"]
+    return sum(frame_ms) / FRAMES, max(frame_ms), stats
+
+
+def main() -> None:
+    print(f"{'recording':>28} {'avg ms':>7} {'max ms':>7} {'captured':>9} {'dropped':>8} {'backlog':>8} {'written':>8}")
+    for label, mode, capture in (
+        ("off", "off", {}),
+        ("png in the loop", "sync", {}),
+        ("ring, png, every frame", "ring", {"capture_format": CaptureRegister.PNG}),
+        ("ring, raw, every frame", "ring", {"capture_format": CaptureRegister.RAW}),
+        ("ring, png, every 2nd, 0.5x", "ring", {"capture_format": CaptureRegister.PNG, "capture_every": 2,
+                                                "capture_scale": 0.5}),
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            average, worst, stats = run(directory, mode, **capture)
+        print(f"{label:>28} {average:>7.2f} {worst:>7.2f} {stats['captured']:>9} {stats['dropped']:>8} "
+              f"{stats['backlog']:>8} {stats['written']:>8}")
+
+
+if __name__ == "__main__":
+    main()
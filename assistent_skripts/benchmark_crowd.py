@@ -0,0 +1,74 @@
+"""benchmark for the crowd steering
+
+lets crowds of enemies spawned around the snake chase its head for a few
+seconds, once with crowd steering and once without. reports the time the
+steering takes per tick, the neighbour pairs it handled, and the share of
+enemies that ended up stacked on another one (closer than 20 pixels).
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_crowd
+"""
+
+import contextlib
+import io
+import math
+import random
+
+import numpy as np
+
+from crowd_steering import CrowdSteering, neighbour_pairs
+from game_config import GameConfig
+from headless import HeadlessGame
+from npc_character import NPCRegister
+
+TICKS = 600
+STACKED = 20
+
+
+def stacked_share(npcs) -> float:
+    positions = np.array([(npc.pos.x, npc.pos.y) for npc in npcs])
+    first, second = neighbour_pairs(positions, STACKED)
+    offsets = positions[second] - positions[first]
+    close = np.hypot(offsets[:, 0], offsets[:, 1]) < STACKED
+    return len(np.unique(first[close])) / len(npcs)
+
+
+def run(game: HeadlessGame, count: int, steering: bool) -> tuple[float, float, float]:
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.reset_world()
+        game.crowd = CrowdSteering() if steering else None
+        # Even the farthest enemies reach the head within the run
+        radius = 300 + 25 * math.sqrt(count)
+        npcs = []
+        for i in range(count):
+            angle = rng.uniform(0, math.tau)
+            distance = radius * math.sqrt(rng.uniform(0.1, 1.0))
+            npcs.append(game.spawn_npc(f"npc_{i}", NPCRegister.VAMPIRE,
+                                       (math.cos(angle) * distance, math.sin(angle) * distance)))
+
+    steer_ms = pairs = 0.0
+    for _ in range(TICKS):
+        head = game.player.snake_pos[0]
+        for npc in npcs:
+            npc.set_target_pos((head[0] - npc.pos.x, head[1] - npc.pos.y))
+        game.step()
+        if game.crowd:
+            steer_ms += game.crowd.last_ms
+            pairs += game.crowd.last_pairs
+    return steer_ms / TICKS, pairs / TICKS, stacked_share(npcs)
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False, static_layer=False))
+
+    print(f"{'agents':>7} {'steering ms/tick':>17} {'pairs/tick':>11} {'stacked with':>13} {'stacked without':>16}")
+    for count in (100, 1_000, 5_000):
+        steer_ms, pairs, stacked = run(game, count, steering=True)
+        _, _, stacked_without = run(game, count, steering=False)
+        print(f"{count:>7} {steer_ms:>17.2f} {pairs:>11.0f} {stacked:>13.0%} {stacked_without:>16.0%}")
+
+
+if __name__ == "__main__":
+    main()
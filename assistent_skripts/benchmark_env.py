@@ -0,0 +1,61 @@
+"""benchmark for the training environments
+
+steps a single SnakeEnv in this process and VectorSnakeEnvs of 1, 8 and 64
+environments with random actions, and reports environment steps per second.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_env [seconds per run]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+from snake_env import SnakeEnv, VectorSnakeEnv
+
+
+def single_env(seconds: float) -> float:
+    rng = np.random.default_rng(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = SnakeEnv()
+        env.reset(seed=0)
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            _, _, terminated, truncated, _ = env.step(env.action_space.sample(rng))
+            if terminated or truncated:
+                env.reset()
+            steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def vector_env(num_envs: int, seconds: float) -> tuple[float, int]:
+    rng = np.random.default_rng(0)
+    with VectorSnakeEnv(num_envs) as envs:
+        envs.reset(seed=0)
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            actions = rng.uniform(envs.single_action_space.low, envs.single_action_space.high,
+                                  (num_envs, len(envs.single_action_space.low))).astype(np.float32)
+            envs.step(actions)
+            steps += num_envs
+        return steps / (time.perf_counter() - start), envs.workers
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    print(f"{os.cpu_count()} cores, {seconds:.0f}s per run")
+    print(f"{'envs':>6} {'workers':>8} {'steps/s':>9}")
+    print(f"{'1':>6} {'-':>8} {single_env(seconds):>9.0f}   (in process)")
+    for num_envs in (1, 8, 64):
+        rate, workers = vector_env(num_envs, seconds)
+        print(f"{num_envs:>6} {workers:>8} {rate:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
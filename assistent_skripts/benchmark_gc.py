@@ -0,0 +1,96 @@
+"""benchmark for garbage collection between frames
+
+runs a busy scene (a long snake full of weapons in a crowd of chasing
+enemies) paced at 60 fps on SDL's dummy drivers, once with python's own
+collections and once with the frame mode that freezes the startup objects
+and collects in the idle time before the next frame. reports how many
+frames a collection paused and for how long, the full collections inside
+frames, the collection time moved between frames, and the slowest frames.
+
+the game itself makes little cyclic garbage, so the scene also runs with
+extra churn: every frame leaves CHURN small reference cycles behind.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_gc
+"""
+
+import contextlib
+import gc
+import io
+
+import numpy as np
+
+from assistent_skripts.benchmark_pipeline import build
+from gc_scheduler import GCRegister
+from game_config import GameConfig
+from headless import HeadlessGame
+from main import FRAME_MS
+
+FRAMES = 600
+CHURN = 2_000
+
+
+def churn() -> None:
+    """Garbage only the cyclic collector can free."""
+    for _ in range(CHURN):
+        node = {}
+        node["self"] = node
+
+
+def run(mode: str, with_churn: bool) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False, gc_mode=mode))
+        build(game)
+        scheduler = game.gc_scheduler
+        stats = game.frame_stats
+        full_before = scheduler.collections[2]
+        if with_churn:
+            update = game.update
+
+            def update_with_churn() -> None:
+                churn()
+                update()
+            game.update = update_with_churn
+
+        frame_ms, gc_ms, idle_ms = [], [], []
+        full_in_frames = 0
+        for _ in range(FRAMES):
+            idle_full = scheduler.idle_collections[2]
+            full = scheduler.collections[2]
+            frame_ms.append(game.run_frame())
+            gc_ms.append(stats.current_gc_ms)
+            scheduler.idle(FRAME_MS - frame_ms[-1])
+            idle_ms.append(stats.idle_gc_pauses[-1] if mode == GCRegister.FRAME else 0.0)
+            full_in_frames += (scheduler.collections[2] - full) - (scheduler.idle_collections[2] - idle_full)
+            game.clock.tick(60)
+        collections = scheduler.collections[2] - full_before
+        scheduler.close()
+    gc.collect()
+
+    frame_ms, gc_ms = np.array(frame_ms), np.array(gc_ms)
+    return {
+        "paused_frames": int((gc_ms > 0).sum()),
+        "gc_avg": gc_ms.mean(),
+        "gc_max": gc_ms.max(),
+        "full_in_frames": full_in_frames,
+        "full": collections,
+        "idle_ms": sum(idle_ms) / FRAMES,
+        "p99": np.percentile(frame_ms, 99),
+        "max": frame_ms.max(),
+    }
+
+
+def main() -> None:
+    print(f"{FRAMES} frames at 60 fps")
+    print(f"{'scene':>6} {'mode':>6} {'paused frames':>14} {'gc ms/frame':>12} {'gc max ms':>10} {'full in frames':>15} "
+          f"{'idle gc ms':>11} {'p99 ms':>7} {'max ms':>7}")
+    for scene, with_churn in (("game", False), ("churn", True)):
+        for mode in GCRegister.MODES:
+            stats = run(mode, with_churn)
+            print(f"{scene:>6} {mode:>6} {stats['paused_frames']:>14} {stats['gc_avg']:>12.3f} {stats['gc_max']:>10.2f} "
+                  f"{stats['full_in_frames']:>8}/{stats['full']:<6} {stats['idle_ms']:>11.3f} {stats['p99']:>7.2f} "
+                  f"{stats['max']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
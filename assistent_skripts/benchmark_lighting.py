@@ -0,0 +1,72 @@
+"""benchmark for the lightmap and fog of war
+
+draws a walking snake firing shots at 1080p and 4k on SDL's dummy drivers,
+with a few, a hundred and a thousand shots lighting the world. reports the
+time the lighting takes per frame, split into the light grid and the
+smoothscaled multiply blit, the size of the light grid and how many light
+layers were kept from the frame before instead of lit again.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_lighting
+"""
+
+import contextlib
+import io
+import math
+import random
+
+import pygame
+
+from game_config import GameConfig
+from headless import HeadlessGame
+from lighting import LightMap
+from player_attachments import Projectile, WeaponRegister, WeaponType
+
+FRAMES = 120
+LENGTH = 30
+
+
+def run(size: tuple[int, int], shots: int) -> dict:
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False, lighting=True), size=size)
+        player = game.player
+        for _ in range(LENGTH - len(player.snake_pos)):
+            player.add_snake_part()
+        player.target_pos = (3000, 800)
+        kind = WeaponType.get(WeaponRegister.GUN, game.world_screen)
+
+    grid_ms = total_ms = 0.0
+    lighting: LightMap = game.lighting
+    for _ in range(FRAMES):
+        # Shots in flight around the head, the same number every frame
+        head = player.snake_pos[0]
+        game.projectiles = []
+        for _ in range(shots):
+            angle = rng.uniform(0, math.tau)
+            distance = rng.uniform(0, size[0] * 0.5)
+            pos = pygame.Vector2(head[0] + math.cos(angle) * distance, head[1] + math.sin(angle) * distance)
+            game.projectiles.append(Projectile(kind, pos, pygame.Vector2(math.cos(angle), math.sin(angle)), 1))
+        game.step()
+        game.render()
+        grid_ms += lighting.last_grid_ms
+        total_ms += lighting.last_ms
+
+    stats = lighting.stats()
+    width, height = lighting.grid.get_size()
+    pygame.display.quit()
+    return {"grid_ms": grid_ms / FRAMES, "blit_ms": (total_ms - grid_ms) / FRAMES, "cells": f"{width}x{height}",
+            "kept": stats["kept_layers"] / max(1, stats["kept_layers"] + stats["lit_layers"])}
+
+
+def main() -> None:
+    print(f"{'resolution':>11} {'lights':>7} {'grid':>8} {'grid ms':>8} {'blit ms':>8} {'kept layers':>12}")
+    for size in ((1920, 1080), (3840, 2160)):
+        for shots in (10, 100, 1_000):
+            stats = run(size, shots)
+            print(f"{size[0]:>5}x{size[1]:<5} {shots + LENGTH:>7} {stats['cells']:>8} {stats['grid_ms']:>8.2f} "
+                  f"{stats['blit_ms']:>8.2f} {stats['kept']:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
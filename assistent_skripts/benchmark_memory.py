@@ -0,0 +1,80 @@
+"""benchmark for the memory footprint of weapons, projectiles and NPCs
+
+keeps 100k live entities of each kind and reports the python heap bytes per
+entity (tracemalloc), the texture pixel bytes per entity (surfaces live
+outside the python heap, so they are counted per unique surface) and the
+time of a full gc.collect() while they are alive.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_memory
+"""
+
+import contextlib
+import gc
+import os
+import time
+import tracemalloc
+
+import pygame
+
+from headless import init_headless
+from npc_character import NPCCharacter, NPCRegister
+from player_attachments import Attachment, Projectile, SwordSwingProjectile, WeaponRegister, WeaponType
+from player_character import Player
+
+COUNT = 100_000
+
+
+def texture_bytes(entities: list) -> int:
+    """pixel bytes of all distinct surfaces the entities reference"""
+    surfaces = {}
+    for entity in entities:
+        kind = getattr(entity, "kind", None)
+        for name in ("texture_attached", "texture_detached"):
+            surface = getattr(kind, name, None)
+            if surface is not None:
+                surfaces[id(surface)] = surface
+        for frames in getattr(kind, "frames", {}).values():
+            for surface in frames:
+                surfaces[id(surface)] = surface
+    return sum(s.get_bytesize() * s.get_width() * s.get_height() for s in surfaces.values())
+
+
+def measure(make) -> tuple[float, float, float]:
+    """bytes per entity on the heap, texture bytes per entity and gc ms with all of them alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [make(i) for i in range(COUNT)]
+    heap = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()
+    gc_ms = (time.perf_counter() - start) * 1000
+    return heap / COUNT, texture_bytes(entities) / COUNT, gc_ms
+
+
+def main() -> None:
+    screen = init_headless()
+    player = Player(screen, (640, 360), (0, 0), 10)
+    gun = WeaponType.get(WeaponRegister.GUN, screen)
+    direction = pygame.Vector2(1, 0)
+
+    kinds = [
+        ("Attachment", lambda i: Attachment(screen, player, (i, 0), WeaponRegister.GUN)),
+        ("Projectile", lambda i: Projectile(gun, pygame.Vector2(i, 0), direction, 1)),
+        ("SwordSwingProjectile", lambda i: SwordSwingProjectile(gun, pygame.Vector2(i, 0), direction, 1)),
+        ("NPCCharacter", lambda i: NPCCharacter(screen, NPCRegister.WIZARD, (i, 0))),
+    ]
+
+    print(f"{COUNT} live entities per kind")
+    print(f"{'kind':>22} {'heap B/entity':>14} {'texture B/entity':>17} {'gc ms':>8}")
+    for name, make in kinds:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            heap, textures, gc_ms = measure(make)
+        print(f"{name:>22} {heap:>14.0f} {textures:>17.1f} {gc_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""benchmark for the minimap marker refresh
+
+the world entities are stand-ins that only carry what the minimap reads,
+so worlds with 100k entities can be built quickly.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_minimap
+"""
+
+import random
+
+import pygame
+
+from headless import init_headless
+from hub import HUB
+from minimap import Minimap
+from player_character import Player
+
+
+class StandIn:
+    """entity with just the attributes the minimap looks at"""
+    def __init__(self, pos: tuple[float, float]) -> None:
+        self.pos = pygame.Vector2(pos)
+        self.attached = False
+        self.active = True
+
+
+def main() -> None:
+    screen = init_headless()
+    hub = HUB(screen, (640, 360), (0, 0))
+    minimap = Minimap(hub, (150, 150), pygame.Rect(-1500, -1500, 3000, 3000), refresh_frames=1)
+    rng = random.Random(0)
+
+    print(f"{'entities':>10} {'refresh ms':>11}")
+    for count in (10, 1_000, 10_000, 100_000):
+        player = Player(screen, (640, 360), (0, 0), 10)
+        for _ in range(min(count, 2_000)):
+            player.add_snake_part()
+        npcs = [StandIn((rng.uniform(-1500, 1500), rng.uniform(-1500, 1500))) for _ in range(count)]
+        weapons = [StandIn((rng.uniform(-1500, 1500), rng.uniform(-1500, 1500))) for _ in range(count)]
+
+        # The cost of a refresh holds picking the markers and drawing them
+        minimap.cost_ms.clear()
+        for _ in range(100):
+            minimap.update(player, minimap.markers(npcs, weapons))
+        print(f"{count:>10} {minimap.average_cost_ms():>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
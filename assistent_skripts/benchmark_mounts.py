@@ -0,0 +1,93 @@
+"""benchmark for moving the weapons mounted on the snake
+
+walks snakes with 10 to 2000 mounted guns on SDL's dummy drivers and
+times one tick of moving the weapons: the old way, where every weapon took
+its segment, built vectors around it for its angle and did that again when
+drawn, and the single pass of MountTransforms. reports the milliseconds per
+tick, the speedup, and how far the new angles are from the old ones.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_mounts
+"""
+
+import contextlib
+import io
+import time
+
+import pygame
+
+from game_config import GameConfig
+from headless import HeadlessGame
+from player_attachments import WeaponRegister
+
+FRAMES = 200
+
+
+def slot_angle(player, idx: int) -> float:
+    """The angle a weapon on segment ``idx`` used to be drawn at, one weapon at a time."""
+    if 0 < idx < len(player.snake_pos) - 1:
+        direction = pygame.Vector2(player.snake_pos[idx + 1]) - pygame.Vector2(player.snake_pos[idx - 1])
+        return direction.angle_to(pygame.Vector2(1, 0))
+    elif idx > 0:
+        direction = pygame.Vector2(player.snake_pos[idx]) - pygame.Vector2(player.snake_pos[idx - 1])
+        return direction.angle_to(pygame.Vector2(1, 0))
+    return 0
+
+
+def per_weapon(player, previous: dict) -> None:
+    """Game.update and Player.render each moved every weapon, the render also worked out its angle."""
+    for _ in range(2):
+        for weapon in player.weapon_slots.values():
+            # Stand in for the previous_pos and previous_angle the weapons kept
+            previous[weapon] = (weapon.pos, weapon.last_angle)
+            weapon.pos = player.snake_pos[weapon.attached_to]
+    for idx, weapon in player.weapon_slots.items():
+        weapon.last_angle = slot_angle(player, idx)
+
+
+def run(weapons: int) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False))
+        player = game.player
+        length = player.weapon_start_index + weapons * player.weapon_interval + 2
+        for _ in range(length - len(player.snake_pos)):
+            player.add_snake_part()
+        for idx in game.free_slots(player)[:weapons]:
+            game.equip(player, WeaponRegister.GUN, idx)
+        player.target_pos = (5000, 2000)
+
+    previous = {}
+    old_s = new_s = 0.0
+    error = 0.0
+    for frame in range(FRAMES):
+        # Turn now and then, so the angles change
+        if frame % 50 == 0:
+            player.target_pos = (player.target_pos[1], -player.target_pos[0])
+        player.update_body_positions()
+
+        start = time.perf_counter()
+        player.mounts.update()
+        new_s += time.perf_counter() - start
+        angles = [weapon.last_angle for weapon in player.weapon_slots.values()]
+
+        start = time.perf_counter()
+        per_weapon(player, previous)
+        old_s += time.perf_counter() - start
+        for angle, weapon in zip(angles, player.weapon_slots.values()):
+            error = max(error, abs((angle - weapon.last_angle + 180) % 360 - 180))
+
+    pygame.display.quit()
+    return {"old_ms": old_s * 1000 / FRAMES, "new_ms": new_s * 1000 / FRAMES, "error": error}
+
+
+def main() -> None:
+    print(f"{FRAMES} ticks")
+    print(f"{'weapons':>8} {'old ms':>8} {'one pass ms':>12} {'speedup':>8} {'max angle diff':>15}")
+    for weapons in (10, 100, 500, 2000):
+        stats = run(weapons)
+        print(f"{weapons:>8} {stats['old_ms']:>8.3f} {stats['new_ms']:>12.3f} "
+              f"{stats['old_ms'] / stats['new_ms']:>7.1f}x {stats['error']:>15.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""benchmark for the game server and clients on localhost
+
+starts the server in its own process and connects a few bot clients that
+steer in circles. reports bandwidth per client, server tick time and the
+time from sending an input until a snapshot acknowledges it, under a few
+simulated network conditions.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_netcode
+"""
+
+import contextlib
+import math
+import multiprocessing
+import os
+import time
+
+from game_client import GameClient
+from game_server import GameServer
+
+# name, one way latency ms, jitter ms, loss
+SCENARIOS = [
+    ("clean", 0, 0, 0.0),
+    ("50ms 2% loss", 50, 10, 0.02),
+    ("100ms 10% loss", 100, 20, 0.10),
+]
+
+
+def run_server(address_queue, stats_queue, duration: float, latency_ms: float, jitter_ms: float, loss: float) -> None:
+    """server process, prints are swallowed so they do not slow it down"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        server = GameServer(snake_length=40, latency_ms=latency_ms, jitter_ms=jitter_ms, loss=loss, seed=1)
+        address_queue.put(server.address)
+        server.serve_forever(duration)
+        stats_queue.put(server.stats())
+        server.close()
+
+
+def run_scenario(clients_count: int, duration: float, latency_ms: float, jitter_ms: float, loss: float) -> dict:
+    address_queue = multiprocessing.Queue()
+    stats_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(
+        target=run_server, args=(address_queue, stats_queue, duration + 1.0, latency_ms, jitter_ms, loss)
+    )
+    server_process.start()
+    address = address_queue.get()
+
+    clients = [GameClient(address, latency_ms=latency_ms, jitter_ms=jitter_ms, loss=loss, seed=i)
+               for i in range(clients_count)]
+
+    start = time.perf_counter()
+    frame = 0
+    while time.perf_counter() - start < duration:
+        for i, client in enumerate(clients):
+            client.poll()
+            if client.player_id is None:
+                if frame % 10 == 0:
+                    client.connect()
+                continue
+            angle = frame * 0.03 + i
+            client.send_input((math.cos(angle) * 600 + i * 300, math.sin(angle) * 600))
+            client.interpolated_state()
+        frame += 1
+        time.sleep(1 / 60)
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        client.disconnect()
+    server_stats = stats_queue.get()
+    server_process.join()
+
+    latencies = sorted(ms for client in clients for ms in client.latencies_ms)
+    result = {
+        "kbps_per_client": sum(c.bytes_received for c in clients) / len(clients) / elapsed / 1000,
+        "bytes_per_snapshot": sum(c.bytes_received for c in clients) / max(1, sum(c.snapshots_received for c in clients)),
+        "undecodable": sum(c.snapshots_undecodable for c in clients),
+        "latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+        "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+        "interpolation_ms": clients[0].interpolation_ticks / clients[0].tick_rate * 1000,
+    }
+    result.update(server_stats)
+    for client in clients:
+        client.close()
+    return result
+
+
+def main() -> None:
+    clients_count = 4
+    duration = 5.0
+    print(f"{clients_count} clients, {duration:.0f}s per scenario, snakes of 40 segments")
+    print(f"{'scenario':>16} {'kB/s/client':>12} {'B/snapshot':>11} {'full':>5} {'tick ms':>8} {'tick p95':>9} "
+          f"{'input->ack':>11} {'p95':>7} {'+interp':>8}")
+    for name, latency_ms, jitter_ms, loss in SCENARIOS:
+        r = run_scenario(clients_count, duration, latency_ms, jitter_ms, loss)
+        print(f"{name:>16} {r['kbps_per_client']:>12.2f} {r['bytes_per_snapshot']:>11.1f} {r['full_snapshots']:>5} "
+              f"{r['tick_ms_avg']:>8.3f} {r['tick_ms_p95']:>9.3f} {r['latency_avg']:>9.1f}ms "
+              f"{r['latency_p95']:>5.1f}ms {r['interpolation_ms']:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
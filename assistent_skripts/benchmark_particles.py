@@ -0,0 +1,49 @@
+"""benchmark for the particle system
+
+keeps a given number of particles alive on screen and reports the time of
+the vectorized step and of drawing, together with how many particles the
+draw budget let through.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_particles
+"""
+
+import time
+
+from headless import init_headless
+from particles import ParticleRegister, ParticleSystem
+
+FRAMES = 120
+
+
+def main() -> None:
+    screen = init_headless()
+    width, height = screen.get_size()
+    origin = (width * 0.5, height * 0.5)
+
+    print(f"{'particles':>10} {'budget ms':>10} {'step ms':>8} {'draw ms':>8} {'drawn':>7} {'skipped':>8}")
+    for count in (1_000, 10_000, 100_000):
+        for budget_ms in (2.0, 8.0):
+            particles = ParticleSystem(screen, capacity=count, budget_ms=budget_ms, seed=0)
+            effects = ParticleRegister.EFFECTS
+            step_ms = 0.0
+            for frame in range(FRAMES):
+                # Keep the ring full with long lived particles spread over the screen
+                for i, effect in enumerate(effects):
+                    particles.emit(effect, ((frame * 37 + i * 300) % width - origin[0], (i * 170) % height - origin[1]),
+                                   count // 30)
+
+                start = time.perf_counter()
+                particles.step()
+                step_ms += (time.perf_counter() - start) * 1000
+
+                screen.fill((0, 0, 0))
+                particles.draw(origin)
+
+            stats = particles.stats()
+            print(f"{count:>10} {budget_ms:>10.1f} {step_ms / FRAMES:>8.3f} {stats['draw_ms_avg']:>8.3f} "
+                  f"{stats['drawn']:>7} {stats['skipped']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""benchmark for the pipelined game loop
+
+builds a busy scene on SDL's dummy drivers: a long snake full of weapons
+walking through a crowd of chasing enemies. runs the same frames with the
+serial loop (input, update, render) and with the pipeline that simulates
+the next tick on a worker thread while the last one is drawn. reports the
+frames per second and the phase split of both, and the gain of the pipeline.
+
+how much can overlap depends on the cores and on how much of the drawing
+runs in pygame without holding the interpreter lock.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_pipeline
+"""
+
+import contextlib
+import io
+import math
+import os
+import random
+import time
+
+from frame_pipeline import FramePipeline
+from headless import HeadlessGame
+from npc_character import NamedNPCs, NPCRegister
+from player_attachments import WeaponRegister
+
+FRAMES = 600
+NPCS = 400
+LENGTH = 60
+
+
+def build(game: HeadlessGame) -> None:
+    rng = random.Random(0)
+    game.reset_world()
+    game.player_hud.player_snake = game.player
+    player = game.player
+    for _ in range(LENGTH - len(player.snake_pos)):
+        player.add_snake_part()
+    weapons = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.MAGIC]
+    for i, idx in enumerate(game.free_slots(player)):
+        game.equip(player, weapons[i % len(weapons)], idx)
+
+    # The serial loop moves this NPC around every 300 ticks
+    game.spawn_npc(NamedNPCs.NIBBIN, NPCRegister.WIZARD, (300, 300))
+    for i in range(NPCS):
+        angle = rng.uniform(0, math.tau)
+        distance = rng.uniform(200, 1500)
+        npc = game.spawn_npc(f"npc_{i}", NPCRegister.VAMPIRE, (math.cos(angle) * distance, math.sin(angle) * distance))
+        game.ai.register(npc)
+    player.target_pos = (4000, 1000)
+
+
+def run(game: HeadlessGame, pipelined: bool) -> tuple[float, str]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        build(game)
+        game.frame_stats.phases.clear()
+        pipeline = FramePipeline(game) if pipelined else None
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            if pipeline:
+                pipeline.run_frame()
+            else:
+                game.run_frame()
+        elapsed = time.perf_counter() - start
+        summary = game.frame_stats.summary()
+        if pipeline:
+            pipeline.close()
+            summary += f" | worker tick {pipeline.stats()['simulate_ms']:.2f}ms"
+    return FRAMES / elapsed, summary
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame()
+
+    print(f"{os.cpu_count()} cpu, {FRAMES} frames, {NPCS} npcs, snake of {LENGTH}")
+    serial_fps, serial_summary = run(game, pipelined=False)
+    pipelined_fps, pipelined_summary = run(game, pipelined=True)
+    print(f"serial     {serial_fps:>7.1f} fps | {serial_summary}")
+    print(f"pipelined  {pipelined_fps:>7.1f} fps | {pipelined_summary}")
+    print(f"gain       {pipelined_fps / serial_fps - 1:>+7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""benchmark for the sampling profiler
+
+runs a busy scene (a long snake full of weapons in a crowd of chasing
+enemies) on SDL's dummy drivers without the profiler, with the hitch
+trigger armed and with a manual capture of every frame. one frame in the
+middle stalls in a busy loop. reports the average frame time, the share
+of the run the sampling thread took, the samples, the captures saved and
+the functions with the most samples in the hitch capture.
+
+frame times on a single core are noisy, the sampling share is the steadier
+measure of the overhead.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_profiler
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from assistent_skripts.benchmark_pipeline import build
+from game_config import GameConfig
+from headless import HeadlessGame
+from sampling_profiler import SamplingProfiler
+
+FRAMES = 300
+HITCH_FRAME = 150
+HITCH_MS = 40
+
+
+def stall(ms: float) -> None:
+    """Stands in for a slow function, busy in Python for ``ms`` milliseconds."""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def run(game: HeadlessGame, profiler: SamplingProfiler, manual: bool) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        build(game)
+        game.profiler = profiler
+        if manual:
+            profiler.start(FRAMES)
+        total_ms = 0.0
+        for frame in range(FRAMES):
+            start = time.perf_counter()
+            game.frame_stats.start_frame()
+            game.handle_input([])
+            game.update()
+            game.render()
+            if frame == HITCH_FRAME:
+                stall(HITCH_MS)
+            frame_ms = game.frame_stats.end_frame()
+            profiler.end_frame(frame_ms)
+            total_ms += (time.perf_counter() - start) * 1000
+        profiler.close()
+    return total_ms / FRAMES
+
+
+def top_functions(path: str, count: int = 8) -> list[tuple[str, int]]:
+    """Functions by samples with them on top of the stack."""
+    own: dict[str, int] = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            stack, samples = line.rsplit(" ", 1)
+            function = stack.split(";")[-1]
+            own[function] = own.get(function, 0) + int(samples)
+    return sorted(own.items(), key=lambda item: -item[1])[:count]
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False))
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{FRAMES} frames, frame {HITCH_FRAME} stalls for {HITCH_MS} ms")
+        print(f"{'profiler':>16} {'avg ms':>7} {'vs off':>7} {'sampling':>9} {'samples':>8} {'us/sample':>10} "
+              f"{'captures':>9}")
+        # Loads textures and fills caches, so the first measured run is not slower for it
+        run(game, SamplingProfiler(directory), False)
+        baseline = None
+        hitch_file = None
+        for label, hitch_ms, manual in (("off", 0.0, False), ("hitch trigger", 30.0, False),
+                                        ("manual capture", 0.0, True)):
+            profiler = SamplingProfiler(directory, tag=label.replace(" ", "_"), hitch_ms=hitch_ms)
+            average = run(game, profiler, manual)
+            baseline = baseline or average
+            stats = profiler.stats()
+            share = stats["samples"] * stats["average_sample_us"] / 1000 / (average * FRAMES)
+            print(f"{label:>16} {average:>7.2f} {average / baseline - 1:>+7.1%} {share:>9.1%} {stats['samples']:>8} "
+                  f"{stats['average_sample_us']:>10.1f} {len(stats['saved']):>9}")
+            if hitch_ms and stats["saved"]:
+                hitch_file = stats["saved"][-1]
+
+        if hitch_file:
+            print(f"\n{os.path.basename(hitch_file)}, functions by own samples:")
+            for function, samples in top_functions(hitch_file):
+                print(f"  {samples:>5}  {function}")
+
+
+if __name__ == "__main__":
+    main()
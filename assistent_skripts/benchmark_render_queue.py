@@ -0,0 +1,107 @@
+"""benchmark for the render queue
+
+draws hundreds to thousands of shots and wounded NPCs on SDL's dummy
+drivers. every frame they are drawn both ways: each entity drawing itself
+as it used to (a circle or blit per entity plus the rects of the health
+bars), and through the render queue with cached stamps and one blits call
+per layer. reports the median milliseconds per frame and the draw calls.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_render_queue
+"""
+
+import contextlib
+import io
+import math
+import random
+import statistics
+import time
+
+import pygame
+
+from game_config import GameConfig
+from headless import HeadlessGame
+from npc_character import NPCRegister
+from player_attachments import Projectile, WeaponRegister, WeaponType
+
+FRAMES = 60
+LENGTH = 30
+
+
+def draw_directly(game: HeadlessGame, npcs: list, origin: tuple[float, float]) -> int:
+    """Every shot and NPC draws itself, returns the draw calls."""
+    screen = game.world_screen
+    calls = 0
+    for projectile in game.projectiles:
+        screen_pos = projectile.pos + pygame.Vector2(origin)
+        pygame.draw.circle(screen, (255, 200, 200), screen_pos, projectile.radius)
+        calls += 1
+    for npc in npcs:
+        image = npc.kind.frame_image(npc.animation_state, npc.frame, npc.size)
+        width = image.get_width()
+        screen_pos = pygame.Vector2(origin) + pygame.Vector2(npc.pos.x - width * 0.5, npc.pos.y - npc.size * 0.8)
+        screen.blit(image, screen_pos)
+        bar = (screen_pos.x, screen_pos.y - 20, width, 10)
+        pygame.draw.rect(screen, (200, 50, 50), bar, border_radius=3)
+        pygame.draw.rect(screen, (50, 200, 50), (bar[0], bar[1], width * npc.HP // npc.max_HP, 10), border_radius=3)
+        calls += 3
+    return calls
+
+
+def draw_queued(game: HeadlessGame, npcs: list, origin: tuple[float, float]) -> int:
+    """Every shot and NPC is submitted to the render queue, returns the draw calls."""
+    queue = game.render_queue
+    Projectile.submit_all(queue, game.projectiles)
+    for npc in npcs:
+        npc.render(queue)
+    queue.flush(origin)
+    return queue.blit_calls
+
+
+def run(shots: int, wounded: int) -> dict:
+    rng = random.Random(0)
+    npcs = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False))
+        kind = WeaponType.get(WeaponRegister.GUN, game.world_screen)
+
+        def spot() -> tuple[float, float]:
+            angle = rng.uniform(0, math.tau)
+            distance = rng.uniform(100, 600)
+            return math.cos(angle) * distance, math.sin(angle) * distance
+
+        for _ in range(shots):
+            game.projectiles.append(Projectile(kind, pygame.Vector2(spot()), pygame.Vector2(1, 0), 1))
+        for i in range(wounded):
+            # The wizard is the NPC with textures
+            npc = game.spawn_npc(f"npc_{i}", NPCRegister.WIZARD, spot())
+            npc.HP = rng.randint(1, npc.max_HP - 1)
+            npcs.append(npc)
+    game._update_camera()
+    origin = game.origin
+
+    # Both ways draw every frame, so they share the noise of the machine
+    times = {"direct": [], "queued": []}
+    calls = {}
+    for _ in range(FRAMES):
+        for label, draw in (("direct", draw_directly), ("queued", draw_queued)):
+            game.world_screen.fill((0, 0, 0))
+            start = time.perf_counter()
+            calls[label] = draw(game, npcs, origin)
+            times[label].append((time.perf_counter() - start) * 1000)
+    pygame.display.quit()
+    return {f"{label}_ms": statistics.median(values) for label, values in times.items()} | \
+        {f"{label}_calls": count for label, count in calls.items()}
+
+
+def main() -> None:
+    print(f"{FRAMES} frames, median frame")
+    print(f"{'shots':>6} {'npcs':>5} {'direct ms':>10} {'calls':>7} {'queued ms':>10} {'calls':>6} {'speedup':>8}")
+    for shots, wounded in ((300, 0), (1_000, 0), (5_000, 0), (0, 300), (0, 1_000), (1_000, 300)):
+        stats = run(shots, wounded)
+        print(f"{shots:>6} {wounded:>5} {stats['direct_ms']:>10.2f} {stats['direct_calls']:>7} "
+              f"{stats['queued_ms']:>10.2f} {stats['queued_calls']:>6} {stats['direct_ms'] / stats['queued_ms']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
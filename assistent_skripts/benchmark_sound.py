@@ -0,0 +1,52 @@
+"""benchmark for the sound bank under a burst of weapon events
+
+every tick twenty swords and a few guns fire at once, and hits land on
+random ticks. runs on SDL's dummy audio driver in real time and reports the
+voice counters and how long a play request takes.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_sound
+"""
+
+import random
+import time
+
+from headless import init_headless
+from sound_bank import SoundBank, SoundRegister
+
+TICKS = 180
+SWORDS = 20
+GUNS = 4
+
+
+def main() -> None:
+    init_headless()
+    bank = SoundBank(channels=8)
+    rng = random.Random(0)
+
+    play_times = []
+    for tick in range(TICKS):
+        events = [SoundRegister.SWORD] * SWORDS
+        if tick % 10 == 0:
+            events += [SoundRegister.GUN] * GUNS
+        if rng.random() < 0.3:
+            events.append(SoundRegister.HIT)
+        if rng.random() < 0.02:
+            events.append(SoundRegister.DEATH)
+
+        start = time.perf_counter()
+        for event in events:
+            bank.play(event)
+        play_times.append((time.perf_counter() - start) * 1000)
+        time.sleep(1 / 60)
+
+    stats = bank.stats()
+    requests = stats["played"] + stats["dropped"]
+    print(f"{TICKS} ticks, {requests} play requests, {len(bank.channels)} channels")
+    print(f"played {stats['played']} | stolen {stats['stolen']} | dropped by rate limit {stats['dropped_rate_limit']} "
+          f"| dropped busy {stats['dropped_busy']}")
+    print(f"sound work per tick: avg {sum(play_times) / len(play_times):.3f} ms, max {max(play_times):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
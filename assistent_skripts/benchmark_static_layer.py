@@ -0,0 +1,71 @@
+"""benchmark for the static layer
+
+puts resting weapons around the hub and runs the full game loop on SDL's
+dummy drivers while the snake circles, once drawing the hub and every
+resting weapon each frame and once from the baked static layer. reports the
+render time per frame, how often the layer was baked, scrolled or repainted
+and the longest bake and scroll, with a weapon picked up and dropped again
+every 60 frames.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_static_layer
+"""
+
+import contextlib
+import io
+import math
+import random
+
+from game_config import GameConfig
+from headless import init_headless
+from main import Game
+from player_attachments import Attachment, WeaponRegister
+
+FRAMES = 300
+SPREAD = 1500
+
+
+def run(items: int, static_layer: bool) -> tuple[float, dict]:
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(GameConfig(sound=False, static_layer=static_layer))
+        weapon_types = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.HEALING]
+        for _ in range(items):
+            pos = (rng.uniform(-SPREAD, SPREAD), rng.uniform(-SPREAD, SPREAD))
+            game.add_ground_weapon(Attachment(game.world_screen, game.player, pos, rng.choice(weapon_types)))
+
+        player = game.player
+        for frame in range(FRAMES):
+            angle = frame * 0.03
+            head = player.snake_pos[0]
+            player.target_pos = (head[0] + math.cos(angle) * 300, head[1] + math.sin(angle) * 300)
+
+            # Move a resting weapon like a drag and drop would
+            if frame % 60 == 30:
+                weapon = rng.choice(game.ground_weapons)
+                if weapon.is_idle():
+                    game.static_changed(weapon.pos)
+                    weapon.pos = head + (rng.uniform(-400, 400), rng.uniform(-400, 400))
+                    game.weapon_activity.wake(weapon)
+                    game.static_changed(weapon.pos)
+            game.run_frame()
+
+    stats = game.static_layer.stats() if game.static_layer else {"bakes": "-", "scrolls": "-", "repaints": "-",
+                                                               "max_bake_ms": 0.0, "max_scroll_ms": 0.0}
+    return game.frame_stats.average("render"), stats
+
+
+def main() -> None:
+    init_headless()
+    print(f"{'weapons':>8} {'layer':>6} {'render ms':>10} {'bakes':>6} {'scrolls':>8} {'repaints':>9} "
+          f"{'max bake ms':>12} {'max scroll ms':>14}")
+    for items in (20, 200, 2_000):
+        for static_layer in (False, True):
+            render_ms, stats = run(items, static_layer)
+            print(f"{items:>8} {'on' if static_layer else 'off':>6} {render_ms:>10.3f} "
+                  f"{stats['bakes']:>6} {stats['scrolls']:>8} {stats['repaints']:>9} "
+                  f"{stats['max_bake_ms']:>12.2f} {stats['max_scroll_ms']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
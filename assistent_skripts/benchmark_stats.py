@@ -0,0 +1,66 @@
+"""benchmark for the cached player stats
+
+mounts boost items on every weapon slot of a long snake, adds a few timed
+buffs and reads the player's stats once per tick, the way movement and
+weapons do. reports the time per tick of working the stats out from every
+modifier each tick and of reading the cached attributes, and how often the
+cache was refreshed.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_stats
+"""
+
+import contextlib
+import io
+import time
+
+from headless import HeadlessGame
+from player_attachments import WeaponRegister
+from stat_modifiers import StatRegister
+
+TICKS = 10_000
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame()
+
+    print(f"{'items':>6} {'buffs':>6} {'recompute us/tick':>18} {'cached us/tick':>15} {'refreshes':>10}")
+    for length in (10, 100, 300):
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.reset_world()
+            player = game.player
+            for _ in range(length - len(player.snake_pos)):
+                player.add_snake_part()
+            for i, idx in enumerate(game.free_slots(player)):
+                game.equip(player, WeaponRegister.SPEED if i % 2 else WeaponRegister.ARMOR, idx)
+        items = sum(1 for weapon in player.weapon_slots.values() if weapon)
+
+        buffs = 4
+        for i in range(buffs):
+            player.add_buff(((StatRegister.DAMAGE, 0, 1.5),), 2_000 * (i + 1))
+        start_refreshes = player.stat_modifiers.recomputes
+
+        # Every modifier applied again each tick
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            modifiers = (modifier for weapon in player.weapon_slots.values() if weapon
+                         for modifier in weapon.kind.modifiers)
+            stats = player.stat_modifiers.compute(modifiers)
+            stats[StatRegister.MOVE_SPEED], stats[StatRegister.ARMOR], stats[StatRegister.DAMAGE]
+        recompute_us = (time.perf_counter() - start) / TICKS * 1e6
+        start_refreshes = player.stat_modifiers.recomputes
+
+        # Cached attributes, refreshed when a buff runs out
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            player.update_buffs()
+            player.move_speed, player.armor, player.damage_multiplier
+        cached_us = (time.perf_counter() - start) / TICKS * 1e6
+        refreshes = player.stat_modifiers.recomputes - start_refreshes
+
+        print(f"{items:>6} {buffs:>6} {recompute_us:>18.2f} {cached_us:>15.3f} {refreshes:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""benchmark for line of sight and aggro checks
+
+builds a town of walled rooms with doors, spreads enemies over it and lets
+the snake walk through while the enemies walk toward its head. runs the
+aggro detector with its budget, and as the baseline a raycast from every
+enemy to every body cell of the snake each tick. reports the time per
+tick, the checks it made, the cache hit rate and how many enemies aggroed.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_visibility
+"""
+
+import contextlib
+import io
+import math
+import random
+import time
+
+from game_config import GameConfig
+from headless import HeadlessGame
+from npc_character import NPCRegister
+from visibility import AggroDetector, VisibilityGrid
+
+TICKS = 300
+LENGTH = 30
+ROOM = 600
+TOWN = 8  # rooms on each side
+
+
+def build(game: HeadlessGame, count: int) -> tuple[VisibilityGrid, list]:
+    rng = random.Random(0)
+    game.reset_world()
+    player = game.player
+    for _ in range(LENGTH - len(player.snake_pos)):
+        player.add_snake_part()
+    player.target_pos = (TOWN * ROOM * 0.5, TOWN * ROOM * 0.3)
+
+    grid = VisibilityGrid()
+    half = TOWN * ROOM * 0.5
+    for row in range(TOWN):
+        for column in range(TOWN):
+            grid.add_room(column * ROOM - half, row * ROOM - half, ROOM, ROOM)
+
+    npcs = []
+    for i in range(count):
+        angle = rng.uniform(0, math.tau)
+        distance = rng.uniform(200, half)
+        npcs.append(game.spawn_npc(f"npc_{i}", NPCRegister.VAMPIRE,
+                                   (math.cos(angle) * distance, math.sin(angle) * distance)))
+    return grid, npcs
+
+
+def chase(game: HeadlessGame, npcs: list) -> None:
+    head = game.player.snake_pos[0]
+    for npc in npcs:
+        npc.set_target_pos((head[0] - npc.pos.x, head[1] - npc.pos.y))
+    game.step()
+
+
+def run_detector(game: HeadlessGame, count: int) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid, npcs = build(game, count)
+    detector = AggroDetector(grid)
+    for npc in npcs:
+        detector.register(npc)
+
+    checks = 0
+    for _ in range(TICKS):
+        chase(game, npcs)
+        detector.update(game.player.snake_pos)
+        checks += detector.last_checks
+    stats = detector.stats()
+    stats["checks_per_tick"] = checks / TICKS
+    return stats
+
+
+def run_raycasts(game: HeadlessGame, count: int) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid, npcs = build(game, count)
+    range_sq = AggroDetector(grid).aggro_range ** 2
+    aggro = set()
+
+    total_ms = max_ms = 0.0
+    for _ in range(TICKS):
+        chase(game, npcs)
+        start = time.perf_counter()
+        body = game.player.snake_pos
+        head = body[0]
+        targets = [grid.cell(pos) for pos in body]
+        for npc in npcs:
+            if npc in aggro:
+                continue
+            dx = npc.pos.x - head[0]
+            dy = npc.pos.y - head[1]
+            if dx * dx + dy * dy <= range_sq:
+                viewer = grid.cell(npc.pos)
+                if any(grid.trace(viewer, target) for target in targets):
+                    aggro.add(npc)
+        elapsed = (time.perf_counter() - start) * 1000
+        total_ms += elapsed
+        max_ms = max(max_ms, elapsed)
+    return {"average_ms": total_ms / TICKS, "max_ms": max_ms, "aggro": len(aggro),
+            "checks_per_tick": float(count), "hit_rate": 0.0}
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame(GameConfig(sound=False, static_layer=False, crowd_steering=False))
+
+    print(f"{TICKS} ticks, {TOWN * TOWN} rooms, snake of {LENGTH}")
+    print(f"{'enemies':>8} {'mode':>16} {'avg ms':>7} {'max ms':>7} {'checks/tick':>12} {'hit rate':>9} {'aggro':>6}")
+    for count in (1_000, 5_000):
+        for label, run in (("raycast all", run_raycasts), ("cached, budget", run_detector)):
+            stats = run(game, count)
+            print(f"{count:>8} {label:>16} {stats['average_ms']:>7.2f} {stats['max_ms']:>7.2f} "
+                  f"{stats['checks_per_tick']:>12.0f} {stats['hit_rate']:>9.0%} {stats['aggro']:>6}")
+
+
+if __name__ == "__main__":
+    main()
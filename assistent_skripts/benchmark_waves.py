@@ -0,0 +1,66 @@
+"""benchmark for the wave spawner
+
+runs a level of two 500 enemy waves that are both due in a single tick on
+SDL's dummy drivers. the first wave is killed off so the second one can come
+from the pools. reports the worst frame that spawned something, the most
+spawns and the longest spawn time in one frame and the pool hit rate, once
+with every due enemy spawned at once into empty pools and once spread over
+frames with prewarmed pools.
+
+run from the repository root:
+    python -m assistent_skripts.benchmark_waves
+"""
+
+import contextlib
+import io
+import random
+import time
+
+from headless import HeadlessGame
+from npc_character import NPCRegister
+from wave_spawner import WaveSpawner
+
+FRAMES = 1200
+LEVEL = ("benchmark", FRAMES // 60, [
+    (0, NPCRegister.VAMPIRE, 500, 0, 1000),
+    (12, NPCRegister.VAMPIRE, 500, 0, 1000),
+])
+
+
+def run(game: HeadlessGame, spawns_per_frame: int, prewarm: bool) -> tuple[float, dict]:
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.reset_world()
+        game.waves = WaveSpawner(game, LEVEL, spawns_per_frame=spawns_per_frame,
+                                 spawn_budget_ms=1e9 if spawns_per_frame >= 500 else 1.0, prewarm=prewarm)
+        worst_ms = 0.0
+        for frame in range(FRAMES):
+            # Kill a few enemies of the first wave every frame
+            if frame < 600:
+                alive = [npc for _, npc in game.waves.live if npc.HP > 0]
+                for npc in rng.sample(alive, min(len(alive), 2)):
+                    game._damage_npc(npc, npc.HP, npc.pos)
+
+            start = time.perf_counter()
+            game.step()
+            if game.waves.last_spawns:
+                worst_ms = max(worst_ms, (time.perf_counter() - start) * 1000)
+    return worst_ms, game.waves.stats()
+
+
+def main() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame()
+
+    print(f"{'spawning':>22} {'worst spawn frame':>18} {'max spawns':>11} {'max spawn ms':>13} "
+          f"{'avg spawn ms':>13} {'pool hit rate':>14} {'recycled':>9}")
+    for label, spawns_per_frame, prewarm in (("all at once, cold pool", 500, False),
+                                             ("8 per frame, prewarmed", 8, True)):
+        worst_ms, stats = run(game, spawns_per_frame, prewarm)
+        pool = stats["pools"][NPCRegister.VAMPIRE[NPCRegister.NAME]]
+        print(f"{label:>22} {worst_ms:>18.2f} {stats['max_spawns_per_frame']:>11} {stats['max_spawn_ms']:>13.3f} "
+              f"{stats['spawn_ms_avg']:>13.3f} {pool['hit_rate']:>14.2f} {stats['recycled']:>9}")
+
+
+if __name__ == "__main__":
+    main()
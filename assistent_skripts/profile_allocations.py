@@ -0,0 +1,53 @@
+"""allocation profile of the full game loop
+
+runs the normal game (input, update and render) on SDL's dummy drivers with
+a snake carrying weapons and steering in circles, then prints the allocation
+report and writes it as JSON.
+
+run from the repository root:
+    python -m assistent_skripts.profile_allocations [frames] [snapshot interval]
+"""
+
+import contextlib
+import io
+import math
+import sys
+
+from game_config import GameConfig
+from headless import init_headless
+from main import Game
+from player_attachments import Attachment, WeaponRegister
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    init_headless()
+    config = GameConfig(sound=False, alloc_profile_frames=interval, alloc_report="alloc_report.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(config)
+
+        player = game.player
+        for _ in range(40):
+            player.add_snake_part()
+        loadout = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.HEALING]
+        for i, idx in enumerate(range(player.weapon_start_index, len(player.snake_pos) - 1, player.weapon_interval)):
+            weapon = Attachment(game.world_screen, player, player.snake_pos[idx], loadout[i % len(loadout)])
+            weapon.attached = True
+            weapon.attached_to = idx
+            player.weapon_slots[idx] = weapon
+            game.add_ground_weapon(weapon)
+
+    game.alloc_profiler.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(frames):
+            angle = frame * 0.03
+            head = player.snake_pos[0]
+            player.target_pos = (head[0] + math.cos(angle) * 300, head[1] + math.sin(angle) * 300)
+            game.run_frame()
+    game.alloc_profiler.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Headless combat simulator for tuning weapon and NPC stats."""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Optional
+
+import pygame
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+from headless import HeadlessGame
+from player_attachments import WeaponRegister
+from npc_character import NPCRegister
+
+WEAPONS = {
+    "gun": WeaponRegister.GUN,
+    "sword": WeaponRegister.SWORD,
+    "healing": WeaponRegister.HEALING,
+    "magic": WeaponRegister.MAGIC,
+    "speed": WeaponRegister.SPEED,
+    "armor": WeaponRegister.ARMOR,
+}
+ENEMIES = {
+    "wizard": NPCRegister.WIZARD,
+    "vampire": NPCRegister.VAMPIRE,
+}
+
+
+class FightSetup:
+    def __init__(self, loadout: list[tuple], snake_length: int = 20, enemy: tuple = NPCRegister.VAMPIRE,
+                 enemy_count: int = 10, spawn_radius: float = 700, player_hp: int = 10,
+                 contact_cooldown: int = 30, max_ticks: int = 60 * 60, seed: int = 0) -> None:
+        """
+        One fight of a snake against a wave of NPCs.
+
+        Args:
+            loadout: Weapon types from WeaponRegister, mounted on the weapon slots in order.
+            snake_length: Body segments of the snake.
+            enemy: The NPCRegister entry of the wave.
+            enemy_count: How many NPCs the wave has.
+            spawn_radius: Distance from the head the wave spawns at.
+            player_hp: Hit points the snake starts with.
+            contact_cooldown: Ticks between two hits of the same NPC.
+            max_ticks: The fight is called off after this many ticks.
+            seed: Seed for spawn positions and steering.
+        """
+        self.loadout = loadout
+        self.snake_length = snake_length
+        self.enemy = enemy
+        self.enemy_count = enemy_count
+        self.spawn_radius = spawn_radius
+        self.player_hp = player_hp
+        self.contact_cooldown = contact_cooldown
+        self.max_ticks = max_ticks
+        self.seed = seed
+
+
+# ─────────────────────────────────────────────────────────────
+# Single Fight
+# ─────────────────────────────────────────────────────────────
+
+_game: Optional[HeadlessGame] = None
+
+
+def _get_game() -> HeadlessGame:
+    """The headless world of this process, opened on first use."""
+    global _game
+    if _game is None:
+        _game = HeadlessGame()
+    return _game
+
+
+def _init_worker() -> None:
+    """Silences the game's prints in a pool process and opens its world."""
+    sys.stdout = open(os.devnull, "w")
+    _get_game()
+
+
+def run_fight(setup: FightSetup) -> dict:
+    """
+    Simulates one fight tick by tick and returns its results.
+    The same setup (including the seed) always gives the same result.
+    """
+    game = _get_game()
+    rng = random.Random(setup.seed)
+    random.seed(setup.seed)
+
+    game.reset_world()
+    player = game.player
+    for _ in range(setup.snake_length - len(player.snake_pos)):
+        player.add_snake_part()
+    player.max_HP = player.HP = setup.player_hp
+
+    for i, weapon_type in enumerate(setup.loadout):
+        idx = player.weapon_start_index + i * player.weapon_interval
+        if idx >= len(player.snake_pos) - 1:
+            break
+        game.equip(player, weapon_type, idx)
+
+    head = player.snake_pos[0]
+    npcs = []
+    for i in range(setup.enemy_count):
+        angle = rng.uniform(0, math.tau)
+        distance = setup.spawn_radius * rng.uniform(0.8, 1.2)
+        spawn = (head[0] + math.cos(angle) * distance, head[1] + math.sin(angle) * distance)
+        npcs.append(game.spawn_npc(f"enemy_{i}", setup.enemy, spawn))
+
+    total_hp = sum(npc.max_HP for npc in npcs)
+    contact_damage = setup.enemy[NPCRegister.DAMAGE]
+    next_hit = [0] * len(npcs)
+    damage_taken = 0
+    steer_phase = rng.uniform(0, math.tau)
+
+    tick = 0
+    while tick < setup.max_ticks:
+        # Circle around so the mounted weapons sweep the area
+        angle = steer_phase + tick * 0.02
+        player.target_pos = (head[0] + math.cos(angle) * 300, head[1] + math.sin(angle) * 300)
+
+        alive = 0
+        for i, npc in enumerate(npcs):
+            if npc.HP <= 0:
+                continue
+            alive += 1
+            npc.target_pos = pygame.Vector2(player.snake_pos[0])
+
+            # Contact damage when touching any body segment
+            if tick >= next_hit[i]:
+                reach = (npc.size * 0.5) ** 2
+                x, y = npc.pos
+                if any((sx - x) ** 2 + (sy - y) ** 2 < reach for sx, sy in player.snake_pos):
+                    damage_taken += player.change_health(contact_damage)
+                    next_hit[i] = tick + setup.contact_cooldown
+
+        if alive == 0 or player.HP <= 0:
+            break
+
+        game.step()
+        tick += 1
+
+    remaining_hp = sum(max(0, npc.HP) for npc in npcs)
+    damage_dealt = total_hp - remaining_hp
+    seconds = tick / 60
+    return {
+        "seed": setup.seed,
+        "won": remaining_hp == 0,
+        "survived": player.HP > 0,
+        "ticks": tick,
+        "time_to_kill": seconds if remaining_hp == 0 else None,
+        "damage_dealt": damage_dealt,
+        "dps": damage_dealt / seconds if seconds else 0.0,
+        "damage_taken": damage_taken,
+        "kills": sum(1 for npc in npcs if npc.HP <= 0),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Batches
+# ─────────────────────────────────────────────────────────────
+
+def make_setups(base: FightSetup, fights: int) -> list[FightSetup]:
+    """Copies a setup ``fights`` times with consecutive seeds."""
+    return [
+        FightSetup(base.loadout, base.snake_length, base.enemy, base.enemy_count, base.spawn_radius,
+                   base.player_hp, base.contact_cooldown, base.max_ticks, base.seed + i)
+        for i in range(fights)
+    ]
+
+
+def run_batch(setups: list[FightSetup], workers: int) -> tuple[list[dict], float]:
+    """
+    Runs all fights in a pool of ``workers`` processes.
+    Results come back in setup order, so a batch is reproducible for any worker count.
+
+    Returns:
+        The results and the wall clock seconds the batch took.
+    """
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(workers, initializer=_init_worker)
+    chunk = max(1, len(setups) // (workers * 8))
+    results = pool.map(run_fight, setups, chunksize=chunk)
+    pool.close()
+    pool.join()
+    return results, time.perf_counter() - start
+
+
+def summarize(results: list[dict]) -> dict:
+    wins = [r for r in results if r["won"]]
+    ttk = sorted(r["time_to_kill"] for r in wins)
+    return {
+        "fights": len(results),
+        "win_rate": len(wins) / len(results) if results else 0.0,
+        "survival_rate": sum(r["survived"] for r in results) / len(results) if results else 0.0,
+        "ttk_avg": sum(ttk) / len(ttk) if ttk else None,
+        "ttk_median": ttk[len(ttk) // 2] if ttk else None,
+        "dps_avg": sum(r["dps"] for r in results) / len(results) if results else 0.0,
+        "damage_taken_avg": sum(r["damage_taken"] for r in results) / len(results) if results else 0.0,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Entry Point
+# ─────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless combat balance simulator")
+    parser.add_argument("--fights", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--loadout", default="gun,sword,gun,healing", help="comma separated: " + ",".join(WEAPONS))
+    parser.add_argument("--length", type=int, default=20, help="snake body segments")
+    parser.add_argument("--enemy", choices=list(ENEMIES), default="vampire")
+    parser.add_argument("--enemies", type=int, default=10, help="NPCs per wave")
+    parser.add_argument("--hp", type=int, default=10, help="snake hit points")
+    parser.add_argument("--max-seconds", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scaling", action="store_true", help="repeat the batch with 1..workers processes")
+    args = parser.parse_args()
+
+    base = FightSetup(
+        loadout=[WEAPONS[name] for name in args.loadout.split(",") if name],
+        snake_length=args.length,
+        enemy=ENEMIES[args.enemy],
+        enemy_count=args.enemies,
+        player_hp=args.hp,
+        max_ticks=int(args.max_seconds * 60),
+        seed=args.seed,
+    )
+    setups = make_setups(base, args.fights)
+
+    worker_counts = range(1, args.workers + 1) if args.scaling else [args.workers]
+    single_rate = None
+    for workers in worker_counts:
+        results, seconds = run_batch(setups, workers)
+        rate = len(results) / seconds
+        cores = min(workers, os.cpu_count() or 1)
+        single_rate = single_rate or rate
+        cprint(f"{workers} workers on {cores} cores: {rate:.1f} sims/s, {rate / cores:.1f} sims/s/core, "
+               f"speedup {rate / single_rate:.2f}x ({rate / single_rate / workers:.0%} efficiency)", VC.MAGENTA)
+
+    summary = summarize(results)
+    ttk = f"{summary['ttk_avg']:.2f}s (median {summary['ttk_median']:.2f}s)" if summary["ttk_avg"] else "-"
+    cprint(f"fights {summary['fights']} | wins {summary['win_rate']:.0%} | survived {summary['survival_rate']:.0%} | "
+           f"time to kill {ttk} | dps {summary['dps_avg']:.2f} | damage taken {summary['damage_taken_avg']:.2f}",
+           VC.GREEN)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Separation, alignment and cohesion steering for crowds of NPCs."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from itertools import chain
+from typing import Iterable, TYPE_CHECKING
+
+import numpy as np
+
+from npc_character import NPCRegister
+
+if TYPE_CHECKING:
+    from npc_character import NPCCharacter
+
+
+class CrowdRegister:
+    # NPCs closer than this are neighbours, it is also the size of a grid cell
+    RADIUS = 120
+    # Weights of the three rules
+    SEPARATION = 1.0
+    ALIGNMENT = 0.15
+    COHESION = 0.05
+    # Share of its step an NPC gives up for a neighbour right in front of it,
+    # less the farther away it is. Crowds queue up instead of squeezing together
+    BRAKING = 1.0
+    # Most an NPC is pushed per tick, as a share of its move speed. Above 1 a
+    # crowded NPC is pushed back harder than it walks, so crowds hold a spacing
+    MAX_PUSH = 1.5
+
+    # Cell coordinates are shifted by this to make one non negative key per cell
+    CELL_OFFSET = 1 << 20
+
+
+def neighbour_pairs(positions: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Every ordered pair (i, j), i != j, of rows of ``positions`` that are in
+    the same or touching cells of a grid with ``radius`` sized cells. Pairs
+    farther apart than ``radius`` are left in, the caller filters them.
+
+    The agents are sorted by cell key, a column of cells has consecutive
+    keys. So the three cells of a neighbouring column are one run of sorted
+    agents, found with a binary search, and the runs are expanded to pairs
+    without a Python loop over agents.
+    """
+    cells = np.floor(positions / radius).astype(np.int64) + CrowdRegister.CELL_OFFSET
+    column = 2 * CrowdRegister.CELL_OFFSET
+    keys = cells[:, 0] * column + cells[:, 1]
+    order = np.argsort(keys, kind="stable").astype(np.int32)
+    sorted_keys = keys[order]
+
+    firsts, seconds = [], []
+    for dx in (-1, 0, 1):
+        # Searching in key order keeps the lookups sorted as well
+        start = np.searchsorted(sorted_keys, sorted_keys + (dx * column - 1), "left")
+        counts = np.searchsorted(sorted_keys, sorted_keys + (dx * column + 1), "right") - start
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        # Index of every pair inside its run, added to the start of the run
+        run_start = np.repeat(np.cumsum(counts) - counts, counts)
+        firsts.append(np.repeat(order, counts))
+        seconds.append(order[np.repeat(start, counts) + np.arange(total) - run_start])
+
+    first = np.concatenate(firsts)
+    second = np.concatenate(seconds)
+    different = first != second
+    return first[different], second[different]
+
+
+class CrowdSteering:
+    def __init__(self, radius: float = CrowdRegister.RADIUS) -> None:
+        """
+        Spreads out NPCs, so a group chasing the same target does not end up
+        as one stack of sprites. Each tick every living NPC that is awake is
+        pushed by the boids rules over its neighbours within ``radius``:
+        away from them (separation), toward their heading (alignment) and
+        toward their center (cohesion).
+
+        The whole crowd is one set of arrays. Neighbours come from a uniform
+        grid, so an NPC only looks at the NPCs in the nine cells around it.
+        """
+        self.radius = radius
+
+        # Counters
+        self.last_agents = 0
+        self.last_pairs = 0
+        self.last_ms = 0.0
+        self.step_ms: deque[float] = deque(maxlen=600)
+
+    def step(self, npcs: Iterable[NPCCharacter]) -> None:
+        """Pushes every living NPC of ``npcs`` for this tick, an NPC pushed off its target walks back."""
+        start = time.perf_counter()
+        crowd = [npc for npc in npcs
+                 if npc.active and npc.HP > 0 and npc.animation_state != NPCRegister.DEAD]
+        self.last_agents = len(crowd)
+        self.last_pairs = 0
+        if len(crowd) > 1:
+            pushes = self.forces(
+                np.fromiter(chain.from_iterable([npc.pos for npc in crowd]), np.float64,
+                            2 * len(crowd)).reshape(-1, 2),
+                np.fromiter(chain.from_iterable([npc.target_pos for npc in crowd]), np.float64,
+                            2 * len(crowd)).reshape(-1, 2),
+                np.fromiter((npc.move_speed for npc in crowd), np.float64, len(crowd)),
+            )
+            for npc, (x, y) in zip(crowd, pushes.tolist()):
+                if x or y:
+                    # A new vector, an NPC that arrived shares its position with its target
+                    npc.pos = npc.pos + (x, y)
+
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.step_ms.append(self.last_ms)
+
+    def forces(self, positions: np.ndarray, targets: np.ndarray, speeds: np.ndarray) -> np.ndarray:
+        """
+        The push of every agent for one tick.
+
+        Args:
+            positions: (n, 2) agent positions.
+            targets: (n, 2) positions the agents walk to, their heading is toward it, none if they are on it.
+            speeds: (n,) distance an agent walks per tick.
+        """
+        n = len(positions)
+        heading = targets - positions
+        length = np.hypot(heading[:, 0], heading[:, 1])
+        velocities = heading * (speeds / np.maximum(length, 1e-9))[:, None]
+
+        first, second = neighbour_pairs(positions, self.radius)
+        xs, ys = np.ascontiguousarray(positions[:, 0]), np.ascontiguousarray(positions[:, 1])
+        dx = xs[second] - xs[first]
+        dy = ys[second] - ys[first]
+        near = np.flatnonzero(dx * dx + dy * dy < self.radius * self.radius)
+        first, second, dx, dy = first[near], second[near], dx[near], dy[near]
+        distance = np.hypot(dx, dy)
+        self.last_pairs = len(first)
+        if len(first) == 0:
+            return np.zeros((n, 2))
+
+        # Agents on the same spot are split along a direction picked by their indices
+        same = distance < 1e-6
+        if same.any():
+            angle = (first[same] - second[same]) * 2.399963
+            dx[same] = np.cos(angle)
+            dy[same] = np.sin(angle)
+            distance[same] = 1.0
+
+        def per_agent(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+            return np.column_stack((np.bincount(first, x, n), np.bincount(first, y, n)))
+
+        neighbours = np.bincount(first, minlength=n)[:, None]
+        has_neighbours = np.maximum(neighbours, 1)
+
+        # Away from each neighbour, stronger the closer it is
+        nearness = 1.0 - distance / self.radius
+        closeness = nearness / distance
+        separation = -per_agent(dx * closeness, dy * closeness)
+        # Toward the average heading and center of the neighbours
+        alignment = per_agent(velocities[:, 0][second], velocities[:, 1][second]) / has_neighbours \
+            - velocities * (neighbours > 0)
+        cohesion = per_agent(dx, dy) / has_neighbours / self.radius
+        # Neighbours ahead take back part of the step toward the target
+        ahead = dx * velocities[:, 0][first] + dy * velocities[:, 1][first] > 0
+        blocked = np.minimum(1.0, CrowdRegister.BRAKING * np.bincount(first[ahead], nearness[ahead], n))
+
+        # Separation and cohesion are shares of the speed, alignment and braking are velocities already
+        push = CrowdRegister.SEPARATION * separation * speeds[:, None] \
+            + CrowdRegister.ALIGNMENT * alignment \
+            + CrowdRegister.COHESION * cohesion * speeds[:, None] \
+            - velocities * blocked[:, None]
+
+        limit = CrowdRegister.MAX_PUSH * speeds
+        magnitude = np.hypot(push[:, 0], push[:, 1])
+        scale = np.minimum(1.0, limit / np.maximum(magnitude, 1e-9))
+        return push * scale[:, None]
+
+    def stats(self) -> dict:
+        return {
+            "agents": self.last_agents,
+            "pairs": self.last_pairs,
+            "last_ms": self.last_ms,
+            "average_ms": sum(self.step_ms) / len(self.step_ms) if self.step_ms else 0.0,
+        }
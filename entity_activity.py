@@ -0,0 +1,183 @@
+"""Active and dormant entity sets, dormant entities cost nothing per tick."""
+
+import math
+from typing import Iterator
+
+
+class SpatialGrid:
+    def __init__(self, cell_size: float = 256) -> None:
+        """
+        Buckets entities by the grid cell of their position.
+
+        Args:
+            cell_size: Edge length of a cell in world units.
+        """
+        self.cell_size = cell_size
+        # Dicts keep insertion order, so queries return entities in a stable order
+        self.cells: dict[tuple[int, int], dict] = {}
+        self.cell_of: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.cell_of)
+
+    def __contains__(self, entity) -> bool:
+        return entity in self.cell_of
+
+    def cell(self, pos) -> tuple[int, int]:
+        return int(math.floor(pos[0] / self.cell_size)), int(math.floor(pos[1] / self.cell_size))
+
+    def insert(self, entity, pos) -> None:
+        key = self.cell(pos)
+        self.cells.setdefault(key, {})[entity] = None
+        self.cell_of[entity] = key
+
+    def remove(self, entity) -> None:
+        key = self.cell_of.pop(entity)
+        cell = self.cells[key]
+        del cell[entity]
+        if not cell:
+            del self.cells[key]
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> Iterator:
+        """Entities in every cell the rectangle touches."""
+        x0, y0 = self.cell((left, top))
+        x1, y1 = self.cell((right, bottom))
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                cell = self.cells.get((x, y))
+                if cell:
+                    yield from cell
+
+    def query_radius(self, pos, radius: float) -> Iterator:
+        """Entities within ``radius`` of ``pos``."""
+        radius_sq = radius * radius
+        for entity in self.query_rect(pos[0] - radius, pos[1] - radius, pos[0] + radius, pos[1] + radius):
+            dx = entity.pos[0] - pos[0]
+            dy = entity.pos[1] - pos[1]
+            if dx * dx + dy * dy <= radius_sq:
+                yield entity
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.cell_of.clear()
+
+
+class ActivityManager:
+    def __init__(self, idle_ticks: int = 30, cell_size: float = 256) -> None:
+        """
+        Splits entities into an active set that is updated every tick and a
+        dormant set that is only looked at through a spatial grid.
+
+        Entities need a ``pos`` and an ``is_idle()`` method. An active entity
+        that has been idle for ``idle_ticks`` ticks in a row goes to sleep, a
+        dormant one wakes up when wake() is called for it, e.g. on a drag,
+        damage or the player coming close.
+
+        Args:
+            idle_ticks: Idle ticks before an entity goes to sleep.
+            cell_size: Cell size of the grid of dormant entities.
+        """
+        self.idle_ticks = idle_ticks
+        # Active entity -> ticks it has been idle
+        self.active: dict = {}
+        self.dormant = SpatialGrid(cell_size)
+        # Every entity in a list for strided samples, e.g. minimap markers, and its index in it
+        self.members: list = []
+        self._member_index: dict = {}
+
+        # Wake and sleep counts since the last update, and the counts of the last tick
+        self.woken = 0
+        self.slept = 0
+        self.last_counts = {"active": 0, "dormant": 0, "woken": 0, "slept": 0}
+
+    def __len__(self) -> int:
+        return len(self.active) + len(self.dormant)
+
+    def __contains__(self, entity) -> bool:
+        return entity in self.active or entity in self.dormant
+
+    def add(self, entity, active: bool = False) -> None:
+        if entity not in self._member_index:
+            self._member_index[entity] = len(self.members)
+            self.members.append(entity)
+        if active:
+            self.active[entity] = 0
+        else:
+            self.dormant.insert(entity, entity.pos)
+
+    def remove(self, entity) -> None:
+        if entity in self.active:
+            del self.active[entity]
+        elif entity in self.dormant:
+            self.dormant.remove(entity)
+        index = self._member_index.pop(entity, None)
+        if index is not None:
+            # The last member takes the free place, so removing does not shift the list
+            last = self.members.pop()
+            if last is not entity:
+                self.members[index] = last
+                self._member_index[last] = index
+
+    def wake(self, entity) -> None:
+        """Makes an entity active, or restarts its idle count if it already is."""
+        if entity in self.dormant:
+            self.dormant.remove(entity)
+            self.woken += 1
+        self.active[entity] = 0
+
+    def sleep(self, entity) -> None:
+        if entity in self.active:
+            del self.active[entity]
+            self.dormant.insert(entity, entity.pos)
+            self.slept += 1
+
+    def wake_near(self, pos, radius: float) -> None:
+        """Wakes every dormant entity within ``radius`` of ``pos``."""
+        for entity in list(self.dormant.query_radius(pos, radius)):
+            self.wake(entity)
+        for entity, idle in self.active.items():
+            if idle:
+                dx = entity.pos[0] - pos[0]
+                dy = entity.pos[1] - pos[1]
+                if dx * dx + dy * dy <= radius * radius:
+                    self.active[entity] = 0
+
+    def update(self) -> None:
+        """
+        Counts idle ticks of the active entities and puts the ones idle for
+        long enough to sleep. Call once per tick, after the entities were updated.
+        """
+        for entity in list(self.active):
+            if entity.is_idle():
+                idle = self.active[entity] + 1
+                if idle >= self.idle_ticks:
+                    self.sleep(entity)
+                else:
+                    self.active[entity] = idle
+            else:
+                self.active[entity] = 0
+
+        self.last_counts = {
+            "active": len(self.active), "dormant": len(self.dormant), "woken": self.woken, "slept": self.slept
+        }
+        self.woken = self.slept = 0
+
+    def in_rect(self, left: float, top: float, right: float, bottom: float) -> list:
+        """Active entities and dormant ones in the cells the rectangle touches."""
+        return [*self.active, *self.dormant.query_rect(left, top, right, bottom)]
+
+    def near(self, pos, radius: float) -> list:
+        """Active entities and dormant ones within ``radius`` of ``pos``."""
+        return [*self.active, *self.dormant.query_radius(pos, radius)]
+
+    def clear(self) -> None:
+        self.active.clear()
+        self.dormant.clear()
+        self.members.clear()
+        self._member_index.clear()
+        self.woken = self.slept = 0
+        self.last_counts = {"active": 0, "dormant": 0, "woken": 0, "slept": 0}
+
+    def counts(self) -> dict:
+        """Active and dormant entities and how many woke up or fell asleep in the last tick."""
+        return self.last_counts
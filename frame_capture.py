@@ -0,0 +1,226 @@
+"""Recording of the shown frames to disk without holding up the game loop."""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+import pygame
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+
+class CaptureRegister:
+    RAW = "raw"  # Plain RGB bytes per frame
+    PNG = "png"  # Lossless compressed
+    FORMATS = [RAW, PNG]
+
+    # Fields of the control array both processes share
+    PUSHED = 0   # Frames the game has put into the ring
+    WRITTEN = 1  # Frames the writer has taken out of it
+    STOP = 2     # Set by the game, the writer finishes the ring and ends
+    ERRORS = 3   # Frames the writer failed to write
+    CONTROL_SIZE = 4
+
+
+def _channel_bytes(surface: pygame.Surface) -> tuple[int, int, int]:
+    """Byte offsets of red, green and blue in a 32 bit pixel of ``surface``."""
+    offsets = []
+    for mask in surface.get_masks()[:3]:
+        byte = (mask.bit_length() - 8) // 8
+        offsets.append(byte if sys.byteorder == "little" else 3 - byte)
+    return offsets[0], offsets[1], offsets[2]
+
+
+def _writer(names: dict[str, str], slots: int, size: tuple[int, int], channels: tuple[int, int, int],
+            ready, directory: str, image_format: str) -> None:
+    """Writes the frames of the ring to ``directory`` until the game sets STOP and the ring is empty."""
+    buffers = {name: shared_memory.SharedMemory(name=shm_name) for name, shm_name in names.items()}
+    arrays = _shared_arrays(buffers, slots, size)
+    frames, numbers, control = arrays["frames"], arrays["numbers"], arrays["control"]
+    channels = list(channels)
+    try:
+        while True:
+            ready.acquire(timeout=0.1)
+            while control[CaptureRegister.WRITTEN] < control[CaptureRegister.PUSHED]:
+                slot = control[CaptureRegister.WRITTEN] % slots
+                rgb = np.ascontiguousarray(frames[slot].view(np.uint8).reshape(size[1], size[0], 4)[..., channels])
+                path = os.path.join(directory, f"frame_{numbers[slot]:07d}.{image_format}")
+                try:
+                    if image_format == CaptureRegister.PNG:
+                        pygame.image.save(pygame.image.frombuffer(rgb.tobytes(), size, "RGB"), path)
+                    else:
+                        with open(path, "wb") as file:
+                            file.write(rgb.tobytes())
+                except (OSError, pygame.error):
+                    control[CaptureRegister.ERRORS] += 1
+                # Only now the game may use the slot again
+                control[CaptureRegister.WRITTEN] += 1
+            if control[CaptureRegister.STOP]:
+                break
+    finally:
+        del frames, numbers, control, arrays
+        for buffer in buffers.values():
+            buffer.close()
+
+
+def _shared_arrays(buffers: dict, slots: int, size: tuple[int, int]) -> dict[str, np.ndarray]:
+    shapes = _buffer_shapes(slots, size)
+    return {name: np.ndarray(shape, dtype, buffer=buffers[name].buf) for name, (shape, dtype) in shapes.items()}
+
+
+def _buffer_shapes(slots: int, size: tuple[int, int]) -> dict[str, tuple[tuple[int, ...], type]]:
+    return {
+        "frames": ((slots, size[1], size[0]), np.uint32),
+        "numbers": ((slots,), np.int64),
+        "control": ((CaptureRegister.CONTROL_SIZE,), np.int64),
+    }
+
+
+class FrameCapture:
+    def __init__(self, screen: pygame.Surface, directory: str, every: int = 1, scale: float = 1.0,
+                 image_format: str = CaptureRegister.PNG, slots: int = 32) -> None:
+        """
+        Copies shown frames into a ring of ``slots`` frames in shared memory, a
+        writer process saves them to ``directory`` as frame_<number>.<format>,
+        numbered by the frames shown since the capture started.
+        Grabbing is one copy of the pixels, or a scale and a copy. When the
+        ring is full the frame is dropped, the game never waits for the disk.
+
+        A capture.json next to the frames holds their size and format, raw
+        frames are width * height RGB bytes.
+
+        Args:
+            screen: The window surface, it has to be 32 bits per pixel.
+            directory: Folder the frames are written to, created if missing.
+            every: Capture every n-th frame.
+            scale: Size of the saved frames relative to the window.
+            image_format: CaptureRegister.RAW or CaptureRegister.PNG.
+            slots: Frames the ring holds.
+        """
+        if screen.get_bitsize() != 32:
+            raise ValueError(f"Capture needs a 32 bit screen, got {screen.get_bitsize()} bits")
+        if image_format not in CaptureRegister.FORMATS:
+            raise ValueError(f"Unknown capture format '{image_format}'")
+
+        self.every = max(1, every)
+        self.scale = scale
+        width, height = screen.get_size()
+        self.size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        # Downscaled frames are drawn into this surface first, it has the screen's pixel format
+        self.scaled: Optional[pygame.Surface] = None
+        if self.size != (width, height):
+            self.scaled = pygame.Surface(self.size, 0, screen)
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "capture.json"), "w") as file:
+            json.dump({"width": self.size[0], "height": self.size[1], "format": image_format,
+                       "every": self.every}, file, indent=2)
+
+        self.slots = slots
+        self.buffers: dict[str, shared_memory.SharedMemory] = {}
+        for name, (shape, dtype) in _buffer_shapes(slots, self.size).items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self.buffers[name] = shared_memory.SharedMemory(create=True, size=size)
+        self.arrays = _shared_arrays(self.buffers, slots, self.size)
+        self.arrays["control"][:] = 0
+
+        self.ready = multiprocessing.Semaphore(0)
+        names = {name: buffer.name for name, buffer in self.buffers.items()}
+        self.process = multiprocessing.Process(
+            target=_writer,
+            args=(names, slots, self.size, _channel_bytes(screen), self.ready, directory, image_format),
+            daemon=True,
+        )
+        self.process.start()
+        self.closed = False
+        self.final_stats: Optional[dict] = None
+
+        # Counters
+        self.frame = 0
+        self.captured = 0
+        self.dropped = 0
+        self.grab_ms: deque[float] = deque(maxlen=600)
+        self.max_grab_ms = 0.0
+        cprint(f"Capturing every {self.every}. frame at {self.size[0]}x{self.size[1]} "
+               f"as {image_format} to {directory}", VC.MAGENTA)
+
+    @property
+    def backlog(self) -> int:
+        """Frames in the ring the writer has not saved yet."""
+        control = self.arrays["control"]
+        return int(control[CaptureRegister.PUSHED] - control[CaptureRegister.WRITTEN])
+
+    def grab(self, screen: pygame.Surface) -> bool:
+        """
+        Copies the frame on ``screen`` into the ring if it is due and a slot is free.
+        Call after the frame is complete. Returns True if the frame was captured.
+        """
+        self.frame += 1
+        if (self.frame - 1) % self.every or self.closed:
+            return False
+        if self.backlog >= self.slots:
+            self.dropped += 1
+            return False
+
+        start = time.perf_counter()
+        control = self.arrays["control"]
+        pushed = int(control[CaptureRegister.PUSHED])
+        slot = pushed % self.slots
+        source = screen
+        if self.scaled:
+            pygame.transform.scale(screen, self.size, self.scaled)
+            source = self.scaled
+        # pixels2d is indexed [x, y], its transpose are the rows in memory order
+        np.copyto(self.arrays["frames"][slot], pygame.surfarray.pixels2d(source).T)
+        self.arrays["numbers"][slot] = self.frame - 1
+        # The slot is complete before the writer can see it
+        control[CaptureRegister.PUSHED] = pushed + 1
+        self.ready.release()
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.grab_ms.append(elapsed)
+        self.max_grab_ms = max(self.max_grab_ms, elapsed)
+        self.captured += 1
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Lets the writer save what is left in the ring, for at most ``timeout`` seconds."""
+        if self.closed:
+            return
+        self.closed = True
+        self.arrays["control"][CaptureRegister.STOP] = 1
+        self.ready.release()
+        self.process.join(timeout=timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            cprint(f"Capture writer stopped with {self.backlog} frames unsaved", VC.RED)
+        self.final_stats = stats = self.stats()
+        cprint(f"Captured {stats['captured']} frames, {stats['written']} written, {stats['dropped']} dropped, "
+               f"{stats['errors']} failed", VC.MAGENTA)
+
+        del self.arrays
+        for buffer in self.buffers.values():
+            buffer.close()
+            buffer.unlink()
+
+    def stats(self) -> dict:
+        """Captured, dropped and written frames, the writer's backlog and the time a grab takes."""
+        if self.final_stats is not None:
+            return dict(self.final_stats)
+        control = self.arrays["control"]
+        return {
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "written": int(control[CaptureRegister.WRITTEN]),
+            "errors": int(control[CaptureRegister.ERRORS]),
+            "backlog": self.backlog,
+            "average_grab_ms": sum(self.grab_ms) / len(self.grab_ms) if self.grab_ms else 0.0,
+            "max_grab_ms": self.max_grab_ms,
+        }
@@ -0,0 +1,210 @@
+"""Simulation of the next tick on a worker thread while the main thread draws the last one."""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+if TYPE_CHECKING:
+    from main import Game
+    from npc_character import NPCCharacter
+    from player_attachments import Attachment
+    from player_character import Player
+
+
+# ─────────────────────────────────────────────────────────────
+# Snapshots
+# ─────────────────────────────────────────────────────────────
+
+def detach(entity):
+    """Copy of an NPC, weapon or projectile whose position the simulation can no longer move."""
+    clone = copy.copy(entity)
+    clone.pos = pygame.Vector2(entity.pos)
+    return clone
+
+
+def detach_player(player: Player) -> Player:
+    """Copy of a player with its own body positions and copies of the mounted weapons."""
+    clone = copy.copy(player)
+    clone.snake_pos = player.snake_pos.copy()
+    clone.weapon_slots = {idx: detach(weapon) if weapon else None for idx, weapon in player.weapon_slots.items()}
+    for weapon in clone.weapon_slots.values():
+        if weapon:
+            weapon.player = clone
+    return clone
+
+
+class FrameSnapshot:
+    """
+    Everything render draws for one tick, the entities already culled to the view.
+    A detached snapshot holds copies and is never changed by the simulation.
+    """
+    __slots__ = ("tick", "origin", "player", "dragging_weapon", "weapons", "npcs", "projectiles",
+                 "particles", "map_markers")
+
+    def __init__(
+        self,
+        tick: int,
+        origin: tuple[float, float],
+        player: Player,
+        dragging_weapon: Optional[Attachment],
+        weapons: list[tuple[Attachment, float]],
+        npcs: list[NPCCharacter],
+        projectiles: list,
+        particles: Optional[tuple[np.ndarray, ...]],
+        map_markers: Optional[tuple[list, list, float]],
+    ) -> None:
+        """
+        Args:
+            tick: Tick counter of the game when the snapshot was taken.
+            origin: Camera origin of the tick.
+            player: The player to draw.
+            dragging_weapon: Weapon held by the mouse, its attachment nodes are shown.
+            weapons: Loose weapons to draw and their angles.
+            npcs: NPCs in or near the view.
+            projectiles: Projectiles to draw.
+            particles: Arrays from ParticleSystem.capture(), None to draw the live particles.
+            map_markers: NPCs and loose weapons the minimap marks, from Minimap.markers().
+        """
+        self.tick = tick
+        self.origin = origin
+        self.player = player
+        self.dragging_weapon = dragging_weapon
+        self.weapons = weapons
+        self.npcs = npcs
+        self.projectiles = projectiles
+        self.particles = particles
+        self.map_markers = map_markers
+
+
+class SnapshotBuffer:
+    """
+    Two snapshot slots. The simulation publishes into the back slot while
+    the front one is drawn, swap() hands the new one over. Publishing and
+    swapping never overlap: swap is only called once the tick that
+    published is done.
+    """
+
+    def __init__(self) -> None:
+        self.front: Optional[FrameSnapshot] = None
+        self.back: Optional[FrameSnapshot] = None
+        self.swaps = 0
+
+    def publish(self, snapshot: FrameSnapshot) -> None:
+        self.back = snapshot
+
+    def swap(self) -> FrameSnapshot:
+        """Makes the last published snapshot the front one and returns it."""
+        self.front, self.back = self.back, self.front
+        self.swaps += 1
+        return self.front
+
+
+# ─────────────────────────────────────────────────────────────
+# Pipeline
+# ─────────────────────────────────────────────────────────────
+
+class FramePipeline:
+    def __init__(self, game: Game) -> None:
+        """
+        Runs the game loop in two stages. Each frame the main thread collects
+        the input and draws the snapshot of tick N, while a worker thread
+        applies that input, simulates tick N + 1 and publishes its snapshot.
+        The picture is one tick behind the simulation.
+
+        Pygame events are only polled on the main thread and handed to the
+        worker as a list. The static layer is drawn before the worker starts,
+        because its bakes read the live weapons.
+
+        Args:
+            game: The game to run, its first snapshot is taken right away.
+        """
+        self.game = game
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="simulation")
+        self.buffer = SnapshotBuffer()
+        self.buffer.publish(game.capture_frame(detached=True))
+        self.buffer.swap()
+
+        # Milliseconds of the worker's ticks and of the main thread waiting for them
+        self.simulate_ms: deque[float] = deque(maxlen=600)
+        self.wait_ms: deque[float] = deque(maxlen=600)
+        cprint("Simulation runs on a worker thread", VC.MAGENTA)
+
+    def _simulate(self, events: list) -> None:
+        """One tick on the worker thread, ends with the snapshot of it in the back slot."""
+        start = time.perf_counter()
+        game = self.game
+        game.handle_input(events)
+        game.update()
+        game._update_camera()
+        self.buffer.publish(game.capture_frame(detached=True))
+        game.tick_counter += 1
+        game._npc_test_movement()
+        self.simulate_ms.append((time.perf_counter() - start) * 1000)
+
+    def run_frame(self) -> float:
+        """Draws the front snapshot while the next tick is simulated, returns the milliseconds of work."""
+        game = self.game
+        game.frame_stats.start_frame()
+        if game.alloc_profiler:
+            game.alloc_profiler.start_frame()
+
+        events = pygame.event.get()
+        closing = any(event.type == pygame.QUIT for event in events)
+        game._mark("input")
+
+        snapshot = self.buffer.front
+        game.render_background(snapshot)
+        game._mark("static")
+
+        future = self.executor.submit(self._simulate, [event for event in events if event.type != pygame.QUIT])
+        game.render_snapshot(snapshot)
+        game._mark("render")
+
+        wait_start = time.perf_counter()
+        future.result()
+        self.wait_ms.append((time.perf_counter() - wait_start) * 1000)
+        game._mark("wait")
+        self.buffer.swap()
+        frame_ms = game.frame_stats.end_frame()
+        game.profiler.end_frame(frame_ms)
+
+        if game.alloc_profiler:
+            game.alloc_profiler.end_frame()
+        if game.scaler:
+            game.scaler.adapt(frame_ms)
+        if closing:
+            self.close()
+            game.quit()
+        return frame_ms
+
+    def run(self) -> None:
+        """Runs frames until the game stops."""
+        try:
+            while self.game.running:
+                frame_ms = self.run_frame()
+                # The worker is done with the tick, the idle time until the next frame is free
+                self.game.gc_scheduler.idle(1000 / 60 - frame_ms)
+                self.game.clock.tick(60)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        """Average milliseconds of a simulated tick and of waiting for it, and the snapshots handed over."""
+        return {
+            "simulate_ms": sum(self.simulate_ms) / len(self.simulate_ms) if self.simulate_ms else 0.0,
+            "wait_ms": sum(self.wait_ms) / len(self.wait_ms) if self.wait_ms else 0.0,
+            "snapshots": self.buffer.swaps,
+        }
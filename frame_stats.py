@@ -0,0 +1,87 @@
+"""Timing of the phases that make up one frame of the game loop."""
+
+import time
+from collections import deque
+
+
+class FrameStats:
+    def __init__(self, history: int = 120) -> None:
+        """
+        Keeps the durations of the last frames and of their phases, and
+        the garbage collector pauses in them.
+
+        Args:
+            history: How many frames are kept for averages.
+        """
+        self.history = history
+        self.frames: deque[float] = deque(maxlen=history)
+        self.phases: dict[str, deque[float]] = {}
+        self.current: dict[str, float] = {}
+        self.last_frame_ms = 0.0
+        self.frame_count = 0
+
+        # Milliseconds the garbage collector paused each frame, and between frames while the loop idled
+        self.gc_pauses: deque[float] = deque(maxlen=history)
+        self.idle_gc_pauses: deque[float] = deque(maxlen=history)
+        self.current_gc_ms = 0.0
+        self.current_idle_gc_ms = 0.0
+        self.max_gc_ms = 0.0
+        self.gc_collections = 0
+
+        self._frame_start = 0.0
+        self._phase_start = 0.0
+
+    def start_frame(self) -> None:
+        """Starts timing a new frame."""
+        self._frame_start = self._phase_start = time.perf_counter()
+        self.current = {}
+        self.current_gc_ms = 0.0
+
+    def mark(self, phase: str) -> float:
+        """Ends the running phase under the given name and returns its milliseconds."""
+        now = time.perf_counter()
+        duration = (now - self._phase_start) * 1000
+        self.current[phase] = self.current.get(phase, 0.0) + duration
+        self._phase_start = now
+        return duration
+
+    def end_frame(self) -> float:
+        """Stores the finished frame and returns the milliseconds of work it took."""
+        self.last_frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        self.frames.append(self.last_frame_ms)
+        for phase, duration in self.current.items():
+            if phase not in self.phases:
+                self.phases[phase] = deque(maxlen=self.history)
+            self.phases[phase].append(duration)
+        self.gc_pauses.append(self.current_gc_ms)
+        self.max_gc_ms = max(self.max_gc_ms, self.current_gc_ms)
+        self.frame_count += 1
+        return self.last_frame_ms
+
+    def add_gc_pause(self, ms: float, idle: bool = False) -> None:
+        """Counts a garbage collection, ``idle`` if it ran between frames instead of during one."""
+        self.gc_collections += 1
+        if idle:
+            self.current_idle_gc_ms += ms
+        else:
+            self.current_gc_ms += ms
+
+    def end_idle(self) -> None:
+        """Stores the collections that ran between the last frame and the next one."""
+        self.idle_gc_pauses.append(self.current_idle_gc_ms)
+        self.current_idle_gc_ms = 0.0
+
+    def average(self, phase: str = "") -> float:
+        """Average milliseconds of a phase, or of whole frames if no phase is given."""
+        values = self.phases.get(phase, ()) if phase else self.frames
+        return sum(values) / len(values) if values else 0.0
+
+    def summary(self) -> str:
+        """One line with the average frame time, its phases and the garbage collector pauses."""
+        parts = [f"frame {self.average():.2f}ms"]
+        parts.extend(f"{phase} {self.average(phase):.2f}ms" for phase in self.phases)
+        if self.gc_collections:
+            parts.append(f"gc {sum(self.gc_pauses) / max(1, len(self.gc_pauses)):.2f}ms (max {self.max_gc_ms:.2f})")
+        if any(self.idle_gc_pauses):
+            parts.append(f"idle gc {sum(self.idle_gc_pauses) / len(self.idle_gc_pauses):.2f}ms")
+        return " | ".join(parts)
@@ -0,0 +1,175 @@
+"""Network client that sends input to the game server and interpolates its snapshots."""
+
+import socket
+import time
+from collections import deque
+from typing import Optional
+
+import net_protocol as net
+from net_protocol import MessageRegister
+
+
+class GameClient:
+    def __init__(self, server_address: tuple, tick_rate: int = 60, interpolation_ticks: int = 4,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, loss: float = 0.0, seed: Optional[int] = None) -> None:
+        """
+        Talks to a GameServer over UDP.
+
+        Args:
+            server_address: (host, port) of the server.
+            tick_rate: Simulation ticks per second of the server.
+            interpolation_ticks: How far behind the newest snapshot the client renders.
+            latency_ms, jitter_ms, loss: Simulated network conditions for outgoing datagrams.
+            seed: Seed for the simulated packet loss.
+        """
+        self.server_address = server_address
+        self.tick_rate = tick_rate
+        self.interpolation_ticks = interpolation_ticks
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.setblocking(False)
+        self.link = net.LossyLink(self.sock, latency_ms, jitter_ms, loss, seed)
+
+        self.player_id: Optional[int] = None
+
+        # Decoded snapshots by tick, the baselines for the next deltas
+        self.states: dict[int, dict] = {}
+        self.latest_tick = 0
+        self.latest_time = 0.0
+
+        # Snapshots in tick order for interpolation
+        self.timeline: deque[tuple[int, dict]] = deque(maxlen=32)
+
+        self.input_seq = 0
+        self.input_times: dict[int, float] = {}
+
+        # Stats
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.snapshots_undecodable = 0
+        self.latencies_ms: deque[float] = deque(maxlen=6000)
+
+    # ─────────────────────────────────────────────────────────────
+    # Sending
+    # ─────────────────────────────────────────────────────────────
+
+    def connect(self) -> None:
+        """Asks the server for a snake, repeat until player_id is set."""
+        self.link.send(net.MESSAGE_TYPE.pack(MessageRegister.HELLO), self.server_address)
+
+    def disconnect(self) -> None:
+        self.link.send(net.MESSAGE_TYPE.pack(MessageRegister.BYE), self.server_address)
+        self.link.latency_ms = self.link.jitter_ms = 0
+        self.link.flush()
+
+    def send_input(self, target: tuple[float, float], move: bool = True) -> None:
+        """Sends the steering target and acknowledges the newest snapshot."""
+        self.input_seq += 1
+        self.input_times[self.input_seq] = time.perf_counter()
+        flags = MessageRegister.MOVE if move else 0
+        packet = net.INPUT.pack(MessageRegister.INPUT, self.input_seq, self.latest_tick, target[0], target[1], flags)
+        self.link.send(packet, self.server_address)
+
+    # ─────────────────────────────────────────────────────────────
+    # Receiving
+    # ─────────────────────────────────────────────────────────────
+
+    def poll(self) -> None:
+        """Handles every datagram that arrived and sends due delayed ones."""
+        self.link.flush()
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(net.MAX_DATAGRAM)
+            except (BlockingIOError, ConnectionError):
+                return
+            self.bytes_received += len(data)
+
+            if data[0] == MessageRegister.WELCOME:
+                _, self.player_id = net.WELCOME.unpack_from(data)
+            elif data[0] == MessageRegister.SNAPSHOT:
+                self._handle_snapshot(data)
+
+    def _handle_snapshot(self, data: bytes) -> None:
+        tick, baseline_tick, last_input_seq, payload = net.unpack_snapshot(data)
+        if tick <= self.latest_tick:
+            return  # older than what we have
+
+        baseline = None
+        if baseline_tick:
+            baseline = self.states.get(baseline_tick)
+            if baseline is None:
+                self.snapshots_undecodable += 1
+                return
+
+        state = net.decode_snapshot(payload, baseline)
+        now = time.perf_counter()
+        self.snapshots_received += 1
+
+        self.states[tick] = state
+        for old_tick in [t for t in self.states if t < baseline_tick]:
+            del self.states[old_tick]
+        self.latest_tick = tick
+        self.latest_time = now
+        self.timeline.append((tick, state))
+
+        # Input to acknowledgement time
+        sent = self.input_times.get(last_input_seq)
+        if sent is not None:
+            self.latencies_ms.append((now - sent) * 1000)
+        for seq in [s for s in self.input_times if s <= last_input_seq]:
+            del self.input_times[seq]
+
+    # ─────────────────────────────────────────────────────────────
+    # Interpolation
+    # ─────────────────────────────────────────────────────────────
+
+    def render_tick(self) -> float:
+        """Server tick the client should display now, a bit behind the newest snapshot."""
+        estimated = self.latest_tick + (time.perf_counter() - self.latest_time) * self.tick_rate
+        return estimated - self.interpolation_ticks
+
+    def interpolated_state(self, render_tick: Optional[float] = None) -> Optional[dict]:
+        """
+        World state at ``render_tick`` blended from the two snapshots around it,
+        with positions in world units. Entities that only exist in one of the
+        two snapshots are taken as they are in the older one.
+        """
+        if not self.timeline:
+            return None
+        if render_tick is None:
+            render_tick = self.render_tick()
+
+        older_tick, older = self.timeline[0]
+        newer_tick, newer = older_tick, older
+        for tick, state in self.timeline:
+            if tick <= render_tick:
+                older_tick, older = tick, state
+            else:
+                newer_tick, newer = tick, state
+                break
+        else:
+            newer_tick, newer = older_tick, older
+
+        t = 0.0
+        if newer_tick > older_tick:
+            t = min(1.0, max(0.0, (render_tick - older_tick) / (newer_tick - older_tick)))
+
+        result: dict = {}
+        for section in MessageRegister.SECTIONS:
+            blended = {}
+            newer_entities = newer.get(section, {})
+            for entity_id, values in older.get(section, {}).items():
+                target = newer_entities.get(entity_id)
+                if target is None or len(target) != len(values):
+                    target = values
+                # NPC hit points are the third value and are not positions
+                blended[entity_id] = [
+                    net.dequantize(a + (b - a) * t) if not (section == MessageRegister.NPCS and i == 2) else a
+                    for i, (a, b) in enumerate(zip(values, target))
+                ]
+            result[section] = blended
+        return result
+
+    def close(self) -> None:
+        self.sock.close()
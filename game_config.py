@@ -0,0 +1,205 @@
+"""Settings that select optional game modes."""
+
+import argparse
+from typing import Optional
+
+from player_character import BodyMode
+from wave_spawner import LevelRegister
+from frame_capture import CaptureRegister
+from gc_scheduler import GCRegister
+
+
+class GameConfig:
+    def __init__(
+        self,
+        body_mode: str = BodyMode.CHAIN,
+        dynamic_resolution: bool = False,
+        min_render_scale: float = 0.5,
+        max_render_scale: float = 1.0,
+        target_frame_ms: float = 14.0,
+        minimap_refresh: int = 3,
+        max_particles: int = 100_000,
+        particle_budget_ms: float = 2.0,
+        sound: bool = True,
+        sound_channels: int = 8,
+        alloc_profile_frames: int = 0,
+        alloc_report: str = "alloc_report.json",
+        level: Optional[str] = None,
+        spawns_per_frame: int = 8,
+        ai_budget_ms: float = 1.0,
+        aggro_budget_ms: float = 0.5,
+        crowd_steering: bool = True,
+        static_layer: bool = True,
+        lighting: bool = False,
+        fog_of_war: bool = True,
+        pipelined: bool = False,
+        gc_mode: str = GCRegister.AUTO,
+        capture_dir: Optional[str] = None,
+        capture_every: int = 1,
+        capture_scale: float = 1.0,
+        capture_format: str = CaptureRegister.PNG,
+        profile: bool = False,
+        profile_frames: int = 300,
+        profile_hitch_ms: float = 0.0,
+        profile_dir: str = "profiles",
+        profile_tag: Optional[str] = None,
+    ) -> None:
+        """
+        Collects the switches for optional game modes.
+
+        Args:
+            body_mode: How the snake body follows the head (BodyMode.CHAIN or BodyMode.PATH).
+            dynamic_resolution: Render the world at a resolution that follows the frame time.
+            min_render_scale: Lowest world resolution factor for dynamic resolution.
+            max_render_scale: Highest world resolution factor for dynamic resolution.
+            target_frame_ms: Work time per frame dynamic resolution tries to stay under.
+            minimap_refresh: Frames between two redraws of the minimap markers.
+            max_particles: Most effect particles alive at once, the oldest are replaced beyond that.
+            particle_budget_ms: Time per frame particle drawing may take before it thins out.
+            sound: Play sound effects.
+            sound_channels: Mixer channels sound effects share.
+            alloc_profile_frames: Frames between allocation snapshots, 0 turns the profiler off.
+            alloc_report: JSON file the allocation report is written to when the game closes.
+            level: Name of the timed level to play (LevelRegister), None for the free hub world.
+            spawns_per_frame: Most wave NPCs spawned in one frame.
+            ai_budget_ms: Time per frame NPC decisions may take, the rest are deferred to the next frame.
+            aggro_budget_ms: Time per frame line of sight checks of not yet aggroed NPCs may take.
+            crowd_steering: Walking NPCs keep apart from each other instead of stacking up.
+            static_layer: Draw the hub and resting weapons from a cached layer instead of every frame.
+            lighting: Darken the world outside the light of the snake and its shots.
+            fog_of_war: With lighting, keep the world black until the snake came near.
+            pipelined: Simulate the next tick on a worker thread while the last one is drawn.
+            gc_mode: When garbage is collected (GCRegister.AUTO or GCRegister.FRAME, between frames).
+            capture_dir: Folder shown frames are recorded to, None turns capturing off.
+            capture_every: Record every n-th frame.
+            capture_scale: Size of the recorded frames relative to the window.
+            capture_format: Image format of the recorded frames (CaptureRegister.RAW or CaptureRegister.PNG).
+            profile: Profile the first ``profile_frames`` frames, F9 starts and stops profiling at any time.
+            profile_frames: Frames one profile covers.
+            profile_hitch_ms: Frame time that saves a profile of the frames around it, 0 turns it off.
+            profile_dir: Folder profiles are saved to as collapsed stacks.
+            profile_tag: Scenario name in the profile file names, the level or "hub" if None.
+        """
+        self.body_mode = body_mode
+
+        self.dynamic_resolution = dynamic_resolution
+        self.min_render_scale = min_render_scale
+        self.max_render_scale = max_render_scale
+        self.target_frame_ms = target_frame_ms
+
+        self.minimap_refresh = minimap_refresh
+
+        self.max_particles = max_particles
+        self.particle_budget_ms = particle_budget_ms
+
+        self.sound = sound
+        self.sound_channels = sound_channels
+
+        self.alloc_profile_frames = alloc_profile_frames
+        self.alloc_report = alloc_report
+
+        self.level = level
+        self.spawns_per_frame = spawns_per_frame
+        self.ai_budget_ms = ai_budget_ms
+        self.aggro_budget_ms = aggro_budget_ms
+        self.crowd_steering = crowd_steering
+
+        self.static_layer = static_layer
+        self.lighting = lighting
+        self.fog_of_war = fog_of_war
+
+        self.pipelined = pipelined
+        self.gc_mode = gc_mode
+
+        self.capture_dir = capture_dir
+        self.capture_every = capture_every
+        self.capture_scale = capture_scale
+        self.capture_format = capture_format
+
+        self.profile = profile
+        self.profile_frames = profile_frames
+        self.profile_hitch_ms = profile_hitch_ms
+        self.profile_dir = profile_dir
+        self.profile_tag = profile_tag
+
+    @classmethod
+    def from_args(cls, argv: Optional[list[str]] = None) -> "GameConfig":
+        """Builds a config from command line arguments."""
+        parser = argparse.ArgumentParser(description="Snakes and Guns.dinemum")
+        parser.add_argument("--body-mode", choices=[BodyMode.CHAIN, BodyMode.PATH], default=BodyMode.CHAIN,
+                            help="how the snake body follows the head")
+        parser.add_argument("--dynamic-resolution", action="store_true",
+                            help="scale the world resolution to hold the frame time")
+        parser.add_argument("--min-scale", type=float, default=0.5, help="lowest world resolution factor")
+        parser.add_argument("--max-scale", type=float, default=1.0, help="highest world resolution factor")
+        parser.add_argument("--target-frame-ms", type=float, default=14.0, help="frame time to stay under")
+        parser.add_argument("--minimap-refresh", type=int, default=3, help="frames between minimap redraws")
+        parser.add_argument("--max-particles", type=int, default=100_000, help="most effect particles alive at once")
+        parser.add_argument("--particle-budget-ms", type=float, default=2.0, help="draw time per frame for particles")
+        parser.add_argument("--no-sound", action="store_true", help="turn sound effects off")
+        parser.add_argument("--sound-channels", type=int, default=8, help="mixer channels for sound effects")
+        parser.add_argument("--alloc-profile", type=int, default=0, metavar="FRAMES",
+                            help="profile allocations with a snapshot every FRAMES frames")
+        parser.add_argument("--alloc-report", default="alloc_report.json", help="JSON file of the allocation report")
+        parser.add_argument("--level", choices=sorted(LevelRegister.LEVELS), default=None,
+                            help="play a timed level with waves of enemies")
+        parser.add_argument("--spawns-per-frame", type=int, default=8, help="most wave enemies spawned in one frame")
+        parser.add_argument("--ai-budget-ms", type=float, default=1.0, help="time per frame for enemy decisions")
+        parser.add_argument("--aggro-budget-ms", type=float, default=0.5,
+                            help="time per frame for enemy line of sight checks")
+        parser.add_argument("--no-crowd-steering", action="store_true", help="let walking enemies stack up")
+        parser.add_argument("--no-static-layer", action="store_true",
+                            help="draw the hub and resting weapons every frame instead of caching them")
+        parser.add_argument("--lighting", action="store_true",
+                            help="light only the surroundings of the snake and its shots")
+        parser.add_argument("--no-fog", action="store_true", help="show unexplored parts of the world when lit")
+        parser.add_argument("--pipelined", action="store_true",
+                            help="simulate the next tick on a worker thread while drawing the last one")
+        parser.add_argument("--gc-mode", choices=GCRegister.MODES, default=GCRegister.AUTO,
+                            help="collect garbage whenever python wants (auto) or in the idle time between frames")
+        parser.add_argument("--capture", default=None, metavar="DIR", help="record the shown frames to DIR")
+        parser.add_argument("--capture-every", type=int, default=1, metavar="N", help="record every N-th frame")
+        parser.add_argument("--capture-scale", type=float, default=1.0, help="size of recorded frames to the window")
+        parser.add_argument("--capture-format", choices=CaptureRegister.FORMATS, default=CaptureRegister.PNG,
+                            help="image format of recorded frames")
+        parser.add_argument("--profile", action="store_true", help="profile the first frames, F9 toggles it")
+        parser.add_argument("--profile-frames", type=int, default=300, metavar="N", help="frames one profile covers")
+        parser.add_argument("--profile-hitch-ms", type=float, default=0.0, metavar="MS",
+                            help="profile the frames around any frame slower than MS")
+        parser.add_argument("--profile-dir", default="profiles", help="folder profiles are saved to")
+        parser.add_argument("--profile-tag", default=None, help="scenario name in the profile file names")
+        args = parser.parse_args(argv)
+
+        return cls(
+            body_mode=args.body_mode,
+            dynamic_resolution=args.dynamic_resolution,
+            min_render_scale=args.min_scale,
+            max_render_scale=args.max_scale,
+            target_frame_ms=args.target_frame_ms,
+            minimap_refresh=args.minimap_refresh,
+            max_particles=args.max_particles,
+            particle_budget_ms=args.particle_budget_ms,
+            sound=not args.no_sound,
+            sound_channels=args.sound_channels,
+            alloc_profile_frames=args.alloc_profile,
+            alloc_report=args.alloc_report,
+            level=args.level,
+            spawns_per_frame=args.spawns_per_frame,
+            ai_budget_ms=args.ai_budget_ms,
+            aggro_budget_ms=args.aggro_budget_ms,
+            crowd_steering=not args.no_crowd_steering,
+            static_layer=not args.no_static_layer,
+            lighting=args.lighting,
+            fog_of_war=not args.no_fog,
+            pipelined=args.pipelined,
+            gc_mode=args.gc_mode,
+            capture_dir=args.capture,
+            capture_every=args.capture_every,
+            capture_scale=args.capture_scale,
+            capture_format=args.capture_format,
+            profile=args.profile,
+            profile_frames=args.profile_frames,
+            profile_hitch_ms=args.profile_hitch_ms,
+            profile_dir=args.profile_dir,
+            profile_tag=args.profile_tag,
+        )
@@ -0,0 +1,266 @@
+"""Authoritative game server that simulates the world and streams snapshots to clients."""
+
+import argparse
+import socket
+import time
+from collections import deque
+from typing import Optional
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+import net_protocol as net
+from net_protocol import MessageRegister
+from headless import HeadlessGame
+from player_character import Player
+from player_attachments import WeaponRegister
+from npc_character import NPCRegister, NamedNPCs
+
+
+class ClientSession:
+    def __init__(self, player_id: int, address: tuple, player: Player) -> None:
+        """State the server keeps about one connected client."""
+        self.player_id = player_id
+        self.address = address
+        self.player = player
+
+        self.last_input_seq = 0
+        self.acked_tick = 0
+
+        # Snapshots sent but maybe not received yet, by tick
+        self.sent_states: dict[int, dict] = {}
+
+
+class GameServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, tick_rate: int = 60, snapshot_interval: int = 2,
+                 snake_length: int = 20, latency_ms: float = 0.0, jitter_ms: float = 0.0, loss: float = 0.0,
+                 seed: Optional[int] = None) -> None:
+        """
+        Runs the simulation for all clients and sends each of them a delta
+        compressed snapshot every ``snapshot_interval`` ticks.
+
+        Args:
+            host: Address to listen on.
+            port: UDP port to listen on, 0 picks a free one.
+            tick_rate: Simulation ticks per second.
+            snapshot_interval: Ticks between two snapshots.
+            snake_length: Body segments of a newly joined snake.
+            latency_ms, jitter_ms, loss: Simulated network conditions for outgoing datagrams.
+            seed: Seed for the simulated packet loss.
+        """
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.snake_length = snake_length
+        self.loadout = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.GUN, WeaponRegister.HEALING]
+
+        self.game = HeadlessGame()
+        # The game's own snake is parked: no client steers it, it is not sent and
+        # stays unarmed, every client gets a snake of its own that leaves with it
+        self.game.players.remove(self.game.player)
+        self.game.spawn_npc(NamedNPCs.NIBBIN, NPCRegister.WIZARD, (-600, -200))
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.link = net.LossyLink(self.sock, latency_ms, jitter_ms, loss, seed)
+
+        self.sessions: dict[tuple, ClientSession] = {}
+        self.next_player_id = 1
+        self.tick = 0
+
+        # Stable ids for entities that are sent in snapshots
+        self.projectile_ids: dict[object, int] = {}
+        self.next_projectile_id = 1
+        self.npc_ids = {name: i + 1 for i, name in enumerate(self.game.npc_characters)}
+
+        self.tick_times: deque[float] = deque(maxlen=6000)
+        self.bytes_received = 0
+        self.snapshots_sent = 0
+        self.full_snapshots_sent = 0
+
+    # ─────────────────────────────────────────────────────────────
+    # Networking
+    # ─────────────────────────────────────────────────────────────
+
+    def receive(self) -> None:
+        """Handles every datagram that arrived since the last tick."""
+        while True:
+            try:
+                data, address = self.sock.recvfrom(net.MAX_DATAGRAM)
+            except (BlockingIOError, ConnectionError):
+                return
+            self.bytes_received += len(data)
+
+            message_type = data[0]
+            if message_type == MessageRegister.HELLO:
+                self._handle_hello(address)
+            elif message_type == MessageRegister.INPUT and address in self.sessions:
+                self._handle_input(self.sessions[address], data)
+            elif message_type == MessageRegister.BYE and address in self.sessions:
+                self._handle_bye(address)
+
+    def _handle_hello(self, address: tuple) -> None:
+        if address not in self.sessions:
+            spawn = (300 * len(self.sessions), 0)
+            player = self.game.add_player(spawn, self.snake_length)
+
+            for i, weapon_type in enumerate(self.loadout):
+                idx = player.weapon_start_index + i * player.weapon_interval
+                if idx < len(player.snake_pos) - 1:
+                    self.game.equip(player, weapon_type, idx)
+
+            self.sessions[address] = ClientSession(self.next_player_id, address, player)
+            self.next_player_id += 1
+            cprint(f"Client {address} joined", VC.GREEN)
+
+        session = self.sessions[address]
+        self.link.send(net.WELCOME.pack(MessageRegister.WELCOME, session.player_id), address)
+
+    def _handle_input(self, session: ClientSession, data: bytes) -> None:
+        _, seq, acked_tick, target_x, target_y, flags = net.INPUT.unpack_from(data)
+        if seq <= session.last_input_seq:
+            return  # reordered or duplicated
+
+        session.last_input_seq = seq
+        session.acked_tick = max(session.acked_tick, acked_tick)
+        if flags & MessageRegister.MOVE:
+            session.player.target_pos = (target_x, target_y)
+
+    def _handle_bye(self, address: tuple) -> None:
+        session = self.sessions.pop(address)
+        cprint(f"Client {address} left", VC.YELLOW)
+        self.game.players.remove(session.player)
+        for weapon in session.player.weapon_slots.values():
+            if weapon:
+                self.game.remove_ground_weapon(weapon)
+
+    # ─────────────────────────────────────────────────────────────
+    # Snapshots
+    # ─────────────────────────────────────────────────────────────
+
+    def world_state(self) -> dict:
+        """Quantized state of everything clients have to draw."""
+        q = net.quantize
+
+        players = {}
+        for session in self.sessions.values():
+            players[session.player_id] = [q(c) for pos in session.player.snake_pos for c in pos]
+
+        projectile_ids = {}
+        projectiles = {}
+        for projectile in self.game.projectiles:
+            projectile_id = self.projectile_ids.get(projectile)
+            if projectile_id is None:
+                projectile_id = self.next_projectile_id
+                self.next_projectile_id += 1
+            projectile_ids[projectile] = projectile_id
+            projectiles[projectile_id] = [q(projectile.pos.x), q(projectile.pos.y)]
+        self.projectile_ids = projectile_ids
+
+        npcs = {}
+        for name, npc in self.game.npc_characters.items():
+            npcs[self.npc_ids[name]] = [q(npc.pos.x), q(npc.pos.y), npc.HP]
+
+        return {
+            MessageRegister.PLAYERS: players,
+            MessageRegister.PROJECTILES: projectiles,
+            MessageRegister.NPCS: npcs,
+        }
+
+    def send_snapshots(self) -> None:
+        """Sends every client the world state as a delta against what it acknowledged."""
+        state = self.world_state()
+        oldest_kept = self.tick - 64 * self.snapshot_interval
+
+        for session in self.sessions.values():
+            baseline_tick = session.acked_tick
+            baseline = session.sent_states.get(baseline_tick)
+            if baseline is None:
+                baseline_tick = 0
+                self.full_snapshots_sent += 1
+
+            payload = net.encode_snapshot(state, baseline)
+            packet = net.pack_snapshot(self.tick, baseline_tick, session.last_input_seq, payload)
+            self.link.send(packet, session.address)
+            self.snapshots_sent += 1
+
+            session.sent_states[self.tick] = state
+            for tick in [t for t in session.sent_states if t < oldest_kept or t < session.acked_tick]:
+                del session.sent_states[tick]
+
+    # ─────────────────────────────────────────────────────────────
+    # Main Loop
+    # ─────────────────────────────────────────────────────────────
+
+    def step(self) -> None:
+        """Runs one server tick: input, simulation and snapshots."""
+        start = time.perf_counter()
+        self.receive()
+        self.game.step()
+        self.tick += 1
+        if self.tick % self.snapshot_interval == 0:
+            self.send_snapshots()
+        self.link.flush()
+        self.tick_times.append((time.perf_counter() - start) * 1000)
+
+    def serve_forever(self, duration: Optional[float] = None) -> None:
+        """Ticks at the fixed rate until ``duration`` seconds have passed (or forever)."""
+        tick_length = 1 / self.tick_rate
+        start = time.perf_counter()
+        next_tick = start
+        while duration is None or time.perf_counter() - start < duration:
+            self.step()
+            next_tick += tick_length
+            # Keep delivering delayed datagrams while waiting for the next tick
+            remaining = next_tick - time.perf_counter()
+            while remaining > 0:
+                self.link.flush()
+                time.sleep(min(remaining, 0.001))
+                remaining = next_tick - time.perf_counter()
+
+    def stats(self) -> dict:
+        """Tick time and traffic numbers."""
+        times = sorted(self.tick_times)
+        return {
+            "ticks": self.tick,
+            "tick_ms_avg": sum(times) / len(times) if times else 0.0,
+            "tick_ms_p95": times[int(len(times) * 0.95)] if times else 0.0,
+            "tick_ms_max": times[-1] if times else 0.0,
+            "bytes_sent": self.link.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "packets_dropped": self.link.packets_dropped,
+            "full_snapshots": self.full_snapshots_sent,
+            "snapshots": self.snapshots_sent,
+        }
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+# ─────────────────────────────────────────────────────────────
+# Entry Point
+# ─────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snakes and Guns.dinemum server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=47800)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated one way latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="simulated latency jitter")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated share of lost datagrams")
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, loss=args.loss)
+    cprint(f"Server listening on {server.address}", VC.MAGENTA)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cprint(str(server.stats()), VC.MAGENTA)
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Garbage collection moved out of the frames into the idle time before the next frame is due."""
+
+import gc
+import time
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+from frame_stats import FrameStats
+
+
+class GCRegister:
+    AUTO = "auto"    # Python collects whenever its thresholds are reached
+    FRAME = "frame"  # Collections run between frames, full ones only when they fit
+    MODES = [AUTO, FRAME]
+
+    # Young objects worth an idle collection of generation 0
+    MIN_YOUNG = 100
+    # Milliseconds kept free before the next frame is due
+    MARGIN_MS = 1.0
+    # Generation 2 threshold while playing, automatic full collections never come
+    NO_FULL = 1_000_000
+    # Frames a due full collection may wait for enough idle time, then it runs anyway
+    MAX_FULL_DELAY = 600
+    # Weight of the newest pause in the pause estimate of a generation
+    SMOOTHING = 0.2
+
+
+class GCScheduler:
+    def __init__(self, frame_stats: FrameStats, mode: str = GCRegister.AUTO) -> None:
+        """
+        Times every garbage collection and adds its pause to ``frame_stats``.
+
+        In GCRegister.FRAME mode it also keeps collections out of the frames:
+
+        - freeze() moves everything loaded so far (textures, registries,
+          HUB, PlayerHUD, pooled NPCs) into the permanent generation, no
+          collection looks at it again
+        - automatic generation 2 collections are turned off
+        - idle() runs the collections that fit into the time left before the
+          next frame is due, young generations first. A full collection runs
+          once Python would have done one and its last pause fits, or after
+          MAX_FULL_DELAY frames without enough idle time.
+
+        Generations 0 and 1 still collect on their own when a frame makes a
+        lot of garbage, idle collections keep their counts low so this is rare.
+
+        Args:
+            frame_stats: Frame statistics the pauses are recorded in.
+            mode: GCRegister.AUTO or GCRegister.FRAME.
+        """
+        if mode not in GCRegister.MODES:
+            raise ValueError(f"Unknown GC mode '{mode}'")
+        self.frame_stats = frame_stats
+        self.mode = mode
+        self.thresholds = gc.get_threshold()
+
+        # Estimated milliseconds of a collection of each generation
+        self.estimate_ms = [0.2, 0.5, 2.0]
+        self.gen1_since_full = 0
+        self.frames_waiting = 0
+        self.in_idle = False
+        self._start = 0.0
+
+        # Counters
+        self.collections = [0, 0, 0]
+        self.idle_collections = [0, 0, 0]
+        self.forced_full = 0
+        self.frozen = 0
+
+        gc.callbacks.append(self._on_gc)
+        if mode == GCRegister.FRAME:
+            gc.set_threshold(self.thresholds[0], self.thresholds[1], GCRegister.NO_FULL)
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+        pause_ms = (time.perf_counter() - self._start) * 1000
+        generation = info["generation"]
+        self.collections[generation] += 1
+        if generation == 1:
+            self.gen1_since_full += 1
+        elif generation == 2:
+            self.gen1_since_full = 0
+        self.estimate_ms[generation] += (pause_ms - self.estimate_ms[generation]) * GCRegister.SMOOTHING
+        self.frame_stats.add_gc_pause(pause_ms, idle=self.in_idle)
+
+    def freeze(self) -> None:
+        """Collects once and freezes every object that survived, call when loading is done."""
+        if self.mode != GCRegister.FRAME:
+            return
+        start = time.perf_counter()
+        gc.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        cprint(f"Froze {self.frozen} startup objects in {(time.perf_counter() - start) * 1000:.1f} ms", VC.MAGENTA)
+
+    def idle(self, budget_ms: float) -> None:
+        """
+        Runs the collections that fit into ``budget_ms``, the time until the
+        next frame is due. Call between frames, after the frame stats ended the frame.
+        """
+        if self.mode != GCRegister.FRAME:
+            return
+        left = budget_ms - GCRegister.MARGIN_MS
+        start = time.perf_counter()
+        self.in_idle = True
+        try:
+            # Python would have collected generation 2 by now
+            if self.gen1_since_full >= self.thresholds[2]:
+                self.frames_waiting += 1
+                forced = self.frames_waiting >= GCRegister.MAX_FULL_DELAY
+                if self.estimate_ms[2] <= left or forced:
+                    self._collect(2)
+                    self.frames_waiting = 0
+                    self.forced_full += forced
+                    left -= (time.perf_counter() - start) * 1000
+
+            young, middle, _ = gc.get_count()
+            if middle >= self.thresholds[1] // 2 and self.estimate_ms[1] <= left:
+                self._collect(1)
+            elif young >= GCRegister.MIN_YOUNG and self.estimate_ms[0] <= left:
+                self._collect(0)
+        finally:
+            self.in_idle = False
+            self.frame_stats.end_idle()
+
+    def _collect(self, generation: int) -> None:
+        gc.collect(generation)
+        self.idle_collections[generation] += 1
+
+    def close(self) -> None:
+        """Stops timing collections and gives Python its own thresholds back."""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.mode == GCRegister.FRAME:
+            gc.set_threshold(*self.thresholds)
+            gc.unfreeze()
+
+    def stats(self) -> dict:
+        """Collections per generation, how many ran idle, forced full collections and frozen objects."""
+        return {
+            "mode": self.mode,
+            "collections": list(self.collections),
+            "idle_collections": list(self.idle_collections),
+            "estimate_ms": list(self.estimate_ms),
+            "forced_full": self.forced_full,
+            "frozen": self.frozen,
+        }
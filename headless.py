@@ -0,0 +1,150 @@
+"""Helpers to run the game simulation without a visible window."""
+
+import os
+import pygame
+from typing import Optional
+
+from main import Game, WAKE_RADIUS
+from game_config import GameConfig
+from player_character import Player
+from player_attachments import Attachment
+from npc_character import NPCCharacter
+
+
+def init_headless(size: tuple[int, int] = (1280, 720)) -> pygame.Surface:
+    """
+    Starts pygame on SDL's dummy drivers and returns an off-screen display surface.
+    Textures can still be loaded and converted, nothing is shown on screen.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # Leave SIGINT/SIGTERM to Python, so worker processes can be stopped normally
+    os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+    pygame.init()
+    return pygame.display.set_mode(size)
+
+
+class HeadlessGame(Game):
+    """
+    The game world without window, input or rendering, and without sound
+    unless a config turns it on. Starts with just the player, NPCs and weapons are added by the caller.
+    """
+
+    def __init__(self, config: Optional[GameConfig] = None, size: tuple[int, int] = (1280, 720)) -> None:
+        self.config = config or GameConfig(sound=False)
+        self.screen = init_headless(size)
+        self._init_world()
+
+        # Snakes controlled by other players, self.player is in here too unless a caller parked it
+        self.players: list[Player] = [self.player]
+
+    def reset_world(self) -> None:
+        """Starts over with a fresh player and an empty world, keeping the loaded screen and HUD."""
+        self.origin = self.get_screen_center()
+        self.player = self._init_player()
+        self.players = [self.player]
+        self.npc_characters = {}
+        self.ground_weapons = []
+        self.npc_activity.clear()
+        self.weapon_activity.clear()
+        self.projectiles = []
+        self.particles.clear()
+        self.static_changed()
+        if self.waves:
+            self.waves.reset()
+        self.ai.clear()
+        self.aggro.clear()
+        if self.lighting:
+            self.lighting.clear()
+        self.dragging_weapon = None
+        self.tick_counter = 0
+
+    def _init_npcs(self) -> dict[str, NPCCharacter]:
+        return {}
+
+    def _init_ground_weapons(self) -> list[Attachment]:
+        return []
+
+    # ─────────────────────────────────────────────────────────────
+    # World Setup
+    # ─────────────────────────────────────────────────────────────
+
+    def add_player(self, spawn: tuple[float, float], length: int = 5) -> Player:
+        """Adds another snake to the world."""
+        player = Player(self.world_screen, self.origin, spawn, 10, body_mode=self.config.body_mode)
+        for _ in range(length - len(player.snake_pos)):
+            player.add_snake_part()
+        self.players.append(player)
+        return player
+
+    def equip(self, player: Player, weapon_type: tuple, idx: int) -> Attachment:
+        """Attaches a new weapon of the given type to segment ``idx`` of a player."""
+        weapon = Attachment(
+            screen=self.world_screen,
+            player=player,
+            pos=player.snake_pos[idx],
+            weapon_type=weapon_type
+        )
+        self.add_ground_weapon(weapon)
+        self.attach(player, weapon, idx)
+        return weapon
+
+    def attach(self, player: Player, weapon: Attachment, idx: int) -> None:
+        """Snaps a weapon that lies in the world onto segment ``idx`` of a player."""
+        resting_pos = weapon.pos
+        weapon.player = player
+        weapon.attached = True
+        weapon.attached_to = idx
+        weapon.pos = player.snake_pos[idx]
+        player.weapon_slots[idx] = weapon
+        player.refresh_stats()
+        self.weapon_activity.wake(weapon)
+        # Repainted once the weapon no longer counts as resting
+        self.static_changed(resting_pos)
+
+    def detach(self, player: Player, idx: int) -> Optional[Attachment]:
+        """Drops the weapon on segment ``idx`` of a player where it is, returns it if there was one."""
+        weapon = player.weapon_slots.pop(idx, None)
+        if weapon is None:
+            return None
+        weapon.attached = False
+        weapon.attached_to = None
+        weapon.pos = pygame.Vector2(weapon.pos)
+        player.refresh_stats()
+        self.static_changed(weapon.pos)
+        return weapon
+
+    def free_slots(self, player: Player) -> list[int]:
+        """Segments of a player a weapon can be attached to."""
+        return [idx for idx in range(player.weapon_start_index, len(player.snake_pos) - 1, player.weapon_interval)
+                if not player.weapon_slots.get(idx)]
+
+    def spawn_npc(self, name: str, character: tuple, spawn: tuple[float, float]) -> NPCCharacter:
+        """Adds an active NPC to the world."""
+        npc = NPCCharacter(self.world_screen, character, spawn=spawn, active=True)
+        self.add_npc(name, npc)
+        return npc
+
+    # ─────────────────────────────────────────────────────────────
+    # Simulation
+    # ─────────────────────────────────────────────────────────────
+
+    def step(self) -> None:
+        """Advances the simulation by one tick."""
+        for player in self.players:
+            if player is not self.player:
+                player.update_buffs()
+                player.update_body_positions()
+                # update() wakes what is near self.player, the other snakes wake their surroundings too
+                head = player.snake_pos[0]
+                self.npc_activity.wake_near(head, WAKE_RADIUS)
+                self.weapon_activity.wake_near(head, WAKE_RADIUS)
+
+        self.update()
+        self._update_camera()
+
+        # Rendering would set the camera origin, do it here instead
+        for player in self.players:
+            player.origin = self.origin
+
+        self.tick_counter += 1
@@ -1,6 +1,7 @@
 """the structure of the tarain"""
 
 import pygame
+from typing import Optional
 
 from assistent_skripts.color_print import custom_print as cprint
 from assistent_skripts.color_print import ValidColors as VC
@@ -13,6 +14,7 @@ class HUB():
         self.origin = origin
 
         self.hub_image = self.hub_background()
+        self.scaled_images: dict[float, pygame.Surface] = {1.0: self.hub_image}
         image_width, image_height = self.hub_image.get_size()
         self.pos = (self.pos[0] - (image_width * 0.5), self.pos[1] - (image_height * 0.5))
 
@@ -25,8 +27,14 @@ class HUB():
         new_width = int(original_width * scale_factor)
         return pygame.transform.scale(image, (new_width, sice))
 
-    def render(self, origin: tuple[float, float]) -> None:
-        """render the HUB"""
-        self.origin = origin
-        origin_pos = (self.origin[0] + self.pos[0], self.origin[1] + self.pos[1])
-        self.screen.blit(self.hub_image, origin_pos)
+    def scaled_image(self, scale: float) -> pygame.Surface:
+        """the hub image at the given resolution factor, scaled once per factor"""
+        if scale not in self.scaled_images:
+            width, height = self.hub_image.get_size()
+            self.scaled_images[scale] = pygame.transform.scale(self.hub_image, (round(width * scale), round(height * scale)))
+        return self.scaled_images[scale]
+
+    def render(self, origin: tuple[float, float], scale: float = 1.0, surface: Optional[pygame.Surface] = None) -> None:
+        """render the HUB, on ``surface`` instead of the screen if given"""
+        origin_pos = ((origin[0] + self.pos[0]) * scale, (origin[1] + self.pos[1]) * scale)
+        (surface or self.screen).blit(self.scaled_image(scale), origin_pos)
@@ -0,0 +1,280 @@
+"""Dungeon lighting and fog of war, computed on a coarse grid and blended over the world in one blit."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from player_attachments import Projectile, MagicBlast
+
+if TYPE_CHECKING:
+    from player_character import Player
+
+
+class LightRegister:
+    """
+    Light kinds: reach in world units, where the light has faded to a few
+    percent, and color as 0 to 1 per channel at the center of the light.
+    """
+    REACH = 0
+    COLOR = 1
+
+    HEAD = (420, (1.0, 0.93, 0.78))
+    BODY = (170, (0.5, 0.45, 0.36))
+    PROJECTILE = (110, (1.0, 0.75, 0.45))
+    MAGIC = (280, (0.45, 0.7, 1.0))
+    KINDS = [HEAD, BODY, PROJECTILE, MAGIC]
+
+    # Edge length of a light cell in world units
+    CELL = 32
+    # Brightness of explored cells no light reaches
+    AMBIENT = 0.12
+    # Cells this close to the head count as explored
+    REVEAL = 450
+    # Explored cells are kept in square chunks of this many cells per side
+    CHUNK = 64
+
+
+def _falloff(reach: float, cell_size: float, outputs: int, inputs: int, pad: int) -> np.ndarray:
+    """
+    Light of one axis: row i is the brightness of output cell i from a light
+    in each input cell, the input grid starts ``pad`` cells earlier. Gaussian
+    falloff is separable, so a whole grid of lights is lit by two of these.
+    """
+    sigma = reach / 2.5 / cell_size
+    distance = np.arange(outputs)[:, None] + pad - np.arange(inputs)[None, :]
+    return np.exp(-0.5 * (distance / sigma) ** 2).astype(np.float32)
+
+
+class LightMap:
+    def __init__(self, surface: pygame.Surface, cell_size: int = LightRegister.CELL, fog: bool = True) -> None:
+        """
+        Darkens the world outside the light of the snake and its shots, and
+        hides the parts the snake has not explored yet.
+
+        Lights are counted into the cells of a grid around the view, one
+        count grid per light kind, and lit with the separable falloff of the
+        kind as two matrix products. A kind whose counts did not change since
+        the last frame keeps its lit grid. So the cost follows the grid size,
+        not the number of lights. The grid is blown up to the view with one
+        smoothscale and multiplied onto the world with one blit.
+
+        Args:
+            surface: The world surface, its size is the view in world units.
+            cell_size: Edge length of a light cell in world units.
+            fog: Keep cells black until the head came near them.
+        """
+        self.surface = surface
+        self.cell_size = cell_size
+        self.fog = fog
+        # Lights this many cells outside the view still reach into it
+        self.pad = math.ceil(max(kind[LightRegister.REACH] for kind in LightRegister.KINDS) / cell_size)
+
+        # Explored cells by chunk, indexed [x, y] inside a chunk
+        self.explored: dict[tuple[int, int], np.ndarray] = {}
+        self._revealed_from: Optional[tuple[int, int]] = None
+        reach = math.ceil(LightRegister.REVEAL / cell_size)
+        offsets = np.mgrid[-reach:reach + 1, -reach:reach + 1].reshape(2, -1).T
+        self._reveal_offsets = offsets[np.hypot(offsets[:, 0], offsets[:, 1]) * cell_size <= LightRegister.REVEAL]
+
+        # Per kind: the grid key and counts the lit grid was made from, and the lit grid
+        self.layers: dict[tuple, tuple[tuple, np.ndarray, np.ndarray]] = {}
+        self.falloffs: dict[tuple, np.ndarray] = {}
+        self.grid: Optional[pygame.Surface] = None
+        self.scaled: Optional[pygame.Surface] = None
+        # Light bytes the scaled surface was made from
+        self.pixels: Optional[np.ndarray] = None
+
+        # Counters
+        self.lit_layers = 0
+        self.kept_layers = 0
+        self.scales = 0
+        self.last_lights = 0
+        self.last_grid_ms = 0.0
+        self.last_ms = 0.0
+        self.draw_ms: deque[float] = deque(maxlen=600)
+
+    def cell(self, pos) -> tuple[int, int]:
+        return int(math.floor(pos[0] / self.cell_size)), int(math.floor(pos[1] / self.cell_size))
+
+    # ──────────────────────────────────────────────────────────────
+    # Fog of war
+    # ──────────────────────────────────────────────────────────────
+
+    def reveal(self, head) -> None:
+        """Marks the cells around the head as explored, only when the head entered another cell."""
+        center = self.cell(head)
+        if center == self._revealed_from:
+            return
+        self._revealed_from = center
+        cells = self._reveal_offsets + np.array(center)
+        chunks = cells // LightRegister.CHUNK
+        local = cells % LightRegister.CHUNK
+        for chunk in np.unique(chunks, axis=0):
+            inside = (chunks[:, 0] == chunk[0]) & (chunks[:, 1] == chunk[1])
+            key = (int(chunk[0]), int(chunk[1]))
+            explored = self.explored.get(key)
+            if explored is None:
+                explored = self.explored[key] = np.zeros((LightRegister.CHUNK, LightRegister.CHUNK), bool)
+            explored[local[inside, 0], local[inside, 1]] = True
+
+    def explored_window(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Explored cells of the ``width`` x ``height`` cells from cell (x, y), indexed [x, y]."""
+        window = np.zeros((width, height), bool)
+        size = LightRegister.CHUNK
+        for chunk_x in range(x // size, (x + width - 1) // size + 1):
+            for chunk_y in range(y // size, (y + height - 1) // size + 1):
+                explored = self.explored.get((chunk_x, chunk_y))
+                if explored is None:
+                    continue
+                left = max(x, chunk_x * size)
+                top = max(y, chunk_y * size)
+                right = min(x + width, (chunk_x + 1) * size)
+                bottom = min(y + height, (chunk_y + 1) * size)
+                window[left - x:right - x, top - y:bottom - y] = \
+                    explored[left - chunk_x * size:right - chunk_x * size, top - chunk_y * size:bottom - chunk_y * size]
+        return window
+
+    def clear(self) -> None:
+        """Forgets what was explored."""
+        self.explored.clear()
+        self._revealed_from = None
+
+    # ──────────────────────────────────────────────────────────────
+    # Lights
+    # ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def sources(player: Player, projectiles: list) -> dict[tuple, tuple[list, list]]:
+        """Positions and strengths of the lights of a player and projectiles, by LightRegister kind."""
+        body = player.snake_pos
+        head = body[0]
+        lights: dict[tuple, tuple[list, list]] = {
+            LightRegister.HEAD: ([(head[0], head[1])], [1.0]),
+            LightRegister.BODY: ([(pos[0], pos[1]) for pos in list(body)[1:]], [1.0] * (len(body) - 1)),
+            LightRegister.PROJECTILE: ([], []),
+            LightRegister.MAGIC: ([], []),
+        }
+        for projectile in projectiles:
+            if isinstance(projectile, MagicBlast):
+                positions, strengths = lights[LightRegister.MAGIC]
+                # The blast fades with its shock wave
+                strengths.append(1.0 - projectile.age / projectile.lifespan)
+            elif isinstance(projectile, Projectile):
+                positions, strengths = lights[LightRegister.PROJECTILE]
+                strengths.append(1.0)
+            else:
+                continue
+            positions.append((projectile.pos.x, projectile.pos.y))
+        return lights
+
+    def _falloff(self, kind: tuple, outputs: int, inputs: int) -> np.ndarray:
+        key = (kind, outputs, inputs)
+        falloff = self.falloffs.get(key)
+        if falloff is None:
+            if len(self.falloffs) > 64:
+                self.falloffs.clear()
+            falloff = self.falloffs[key] = _falloff(kind[LightRegister.REACH], self.cell_size, outputs, inputs,
+                                                    self.pad)
+        return falloff
+
+    def compute(self, x: int, y: int, width: int, height: int, lights: dict[tuple, tuple[list, list]]) -> np.ndarray:
+        """
+        Brightness of the ``width`` x ``height`` cells from cell (x, y) as
+        (width, height, 3) bytes, ready for a surface.
+        """
+        pad = self.pad
+        padded_w = width + 2 * pad
+        padded_h = height + 2 * pad
+        grid_key = (x, y, width, height)
+
+        light = np.full((width, height, 3), LightRegister.AMBIENT, np.float32)
+        for kind, (positions, strengths) in lights.items():
+            counts = np.zeros(padded_w * padded_h, np.float32)
+            if positions:
+                cells = np.floor(np.array(positions, np.float64) / self.cell_size).astype(np.int64)
+                cells[:, 0] -= x - pad
+                cells[:, 1] -= y - pad
+                inside = (cells[:, 0] >= 0) & (cells[:, 0] < padded_w) & (cells[:, 1] >= 0) & (cells[:, 1] < padded_h)
+                if inside.any():
+                    counts = np.bincount(cells[inside, 0] * padded_h + cells[inside, 1],
+                                         np.array(strengths, np.float32)[inside], padded_w * padded_h)
+            counts = counts.astype(np.float32).reshape(padded_w, padded_h)
+
+            previous = self.layers.get(kind)
+            if previous is not None and previous[0] == grid_key and np.array_equal(previous[1], counts):
+                lit = previous[2]
+                self.kept_layers += 1
+            elif not counts.any():
+                lit = None
+                self.layers.pop(kind, None)
+            else:
+                lit = self._falloff(kind, width, padded_w) @ counts @ self._falloff(kind, height, padded_h).T
+                self.layers[kind] = (grid_key, counts, lit)
+                self.lit_layers += 1
+            if lit is not None:
+                light += lit[:, :, None] * np.array(kind[LightRegister.COLOR], np.float32)
+
+        if self.fog:
+            light *= self.explored_window(x, y, width, height)[:, :, None]
+        np.clip(light, 0.0, 1.0, out=light)
+        return (light * 255).astype(np.uint8)
+
+    def draw(self, origin: tuple[float, float], scale: float, player: Player, projectiles: list) -> None:
+        """
+        Multiplies the light onto the world surface, after the world and
+        before the HUD is drawn.
+
+        Args:
+            origin: Camera origin of the frame.
+            scale: Resolution factor of the surface.
+            player: Player whose head and body give light.
+            projectiles: Projectiles of the frame, shots and magic blasts give light.
+        """
+        start = time.perf_counter()
+        view_w, view_h = self.surface.get_size()
+        x, y = self.cell((-origin[0], -origin[1]))
+        # The same size at every camera position, so the full size surface is never made again
+        width = view_w // self.cell_size + 2
+        height = view_h // self.cell_size + 2
+
+        lights = self.sources(player, projectiles)
+        self.last_lights = sum(len(positions) for positions, _ in lights.values())
+        pixels = self.compute(x, y, width, height, lights)
+        self.last_grid_ms = (time.perf_counter() - start) * 1000
+
+        # An unchanged grid, e.g. while the snake stands still, keeps the scaled light
+        size = (round(width * self.cell_size * scale), round(height * self.cell_size * scale))
+        if self.scaled is None or self.scaled.get_size() != size or not np.array_equal(pixels, self.pixels):
+            if self.grid is None or self.grid.get_size() != (width, height):
+                self.grid = pygame.Surface((width, height), 0, 32)
+            pygame.surfarray.blit_array(self.grid, pixels)
+            if self.scaled is None or self.scaled.get_size() != size:
+                self.scaled = pygame.Surface(size, 0, 32)
+            pygame.transform.smoothscale(self.grid, size, self.scaled)
+            self.pixels = pixels
+            self.scales += 1
+        self.surface.blit(self.scaled, ((x * self.cell_size + origin[0]) * scale,
+                                        (y * self.cell_size + origin[1]) * scale),
+                          special_flags=pygame.BLEND_MULT)
+
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.draw_ms.append(self.last_ms)
+
+    def stats(self) -> dict:
+        """Lights and time of the last frame, the grid's share of it, lit and kept layers, explored chunks."""
+        return {
+            "lights": self.last_lights,
+            "last_ms": self.last_ms,
+            "last_grid_ms": self.last_grid_ms,
+            "average_ms": sum(self.draw_ms) / len(self.draw_ms) if self.draw_ms else 0.0,
+            "lit_layers": self.lit_layers,
+            "kept_layers": self.kept_layers,
+            "scales": self.scales,
+            "explored_chunks": len(self.explored),
+        }
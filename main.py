@@ -11,18 +11,80 @@ from assistent_skripts.color_print import ValidColors as VC
 from player_character import Player
 from npc_character import NPCCharacter, NPCRegister, NamedNPCs
 from hub import HUB
-from player_attachments import Attachment, WeaponRegister, Projectile, SwordSwingProjectile
+from player_attachments import Attachment, WeaponRegister, Projectile, SwordSwingProjectile, MagicBlast
 from player_hud import PlayerHUD, HUDRegister
+from game_config import GameConfig
+from frame_stats import FrameStats
+from resolution_scaler import ResolutionScaler
+from particles import ParticleSystem, ParticleRegister
+from sound_bank import SoundBank, SoundRegister
+from alloc_profiler import AllocationProfiler
+from entity_activity import ActivityManager
+from wave_spawner import WaveSpawner, LevelRegister
+from static_layer import StaticLayer
+from area_damage import AreaDamageResolver
+from ai_scheduler import AIScheduler
+from frame_pipeline import FramePipeline, FrameSnapshot, detach, detach_player
+from frame_capture import FrameCapture
+from crowd_steering import CrowdSteering
+from visibility import VisibilityGrid, AggroDetector
+from lighting import LightMap
+from sampling_profiler import SamplingProfiler
+from gc_scheduler import GCScheduler
+from render_queue import RenderQueue
+
+# Dormant entities this close to the player's head wake up
+WAKE_RADIUS = 400
+# Farthest an NPC center can be from a projectile that hits it
+HIT_REACH = 250
+# Milliseconds between two frames at 60 fps
+FRAME_MS = 1000 / 60
 
 
 class Game:
-    def __init__(self) -> None:
+    def __init__(self, config: Optional[GameConfig] = None) -> None:
         """Initialize the game window, characters, HUD, and game state."""
+        self.config = config or GameConfig()
+
         pygame.init()
         pygame.display.set_caption("Snakes and Guns.dinemum")
         self.screen = pygame.display.set_mode()
         cprint("Game setup successful", VC.MAGENTA)
 
+        self._init_world()
+
+    def _init_world(self) -> None:
+        """Create the game systems on the already opened screen."""
+        # The world is drawn on world_screen, the HUD always on the window
+        self.frame_stats = FrameStats()
+        # Times collections, and in frame mode moves them between frames
+        self.gc_scheduler = GCScheduler(self.frame_stats, self.config.gc_mode)
+        # F9 profiles a window of frames, slow frames do when a hitch threshold is set
+        self.profiler = SamplingProfiler(
+            self.config.profile_dir,
+            self.config.profile_tag or (f"level{self.config.level}" if self.config.level else "hub"),
+            self.config.profile_frames,
+            self.config.profile_hitch_ms,
+        )
+        if self.config.profile:
+            self.profiler.start()
+        self.alloc_profiler: Optional[AllocationProfiler] = None
+        if self.config.alloc_profile_frames:
+            self.alloc_profiler = AllocationProfiler(self.config.alloc_profile_frames, self.config.alloc_report)
+        self.scaler: Optional[ResolutionScaler] = None
+        if self.config.dynamic_resolution:
+            self.scaler = ResolutionScaler(
+                self.screen,
+                min_scale=self.config.min_render_scale,
+                max_scale=self.config.max_render_scale,
+                target_frame_ms=self.config.target_frame_ms
+            )
+        self.world_screen = self.scaler.surface if self.scaler else self.screen
+        self.capture: Optional[FrameCapture] = None
+        if self.config.capture_dir:
+            self.capture = FrameCapture(self.screen, self.config.capture_dir, self.config.capture_every,
+                                        self.config.capture_scale, self.config.capture_format)
+
         self.origin = self.get_screen_center()
 
         self.clock = pygame.time.Clock()
@@ -30,22 +92,55 @@ class Game:
         self.move_enabled = False
 
         # Game Systems
-        self.hub = HUB(self.screen, self.origin, (0, 0))
+        self.hub = HUB(self.world_screen, self.origin, (0, 0))
         self.player = self._init_player()
-        self.npc_characters = self._init_npcs()
-        self.ground_weapons = self._init_ground_weapons()
-        self.player_hud = PlayerHUD(self.screen, self.player)
+        # Hub and resting weapons, drawn from a cache
+        self.static_layer: Optional[StaticLayer] = None
+        if self.config.static_layer:
+            self.static_layer = StaticLayer(self.world_screen, self._bake_static)
+
+        # Every NPC and ground weapon is in one of the activity sets, only active ones are updated
+        self.npc_activity = ActivityManager()
+        self.weapon_activity = ActivityManager()
+        self.npc_characters: dict[str, NPCCharacter] = {}
+        self.area_damage = AreaDamageResolver()
+        for name, npc in self._init_npcs().items():
+            self.add_npc(name, npc)
+        self.ground_weapons: list[Attachment] = []
+        for weapon in self._init_ground_weapons():
+            self.add_ground_weapon(weapon)
+        self.player_hud = PlayerHUD(self.screen, self.player, self.hub, self.config.minimap_refresh)
 
         # Interaction and state
         self.dragging_weapon: Optional[Attachment] = None
         self.projectiles: list[Projectile] = []
+        self.render_queue = RenderQueue(self.world_screen)
+        self.particles = ParticleSystem(self.world_screen, self.config.max_particles, self.config.particle_budget_ms)
+        self.sounds = SoundBank(self.config.sound_channels, enabled=self.config.sound)
+        self.lighting: Optional[LightMap] = None
+        if self.config.lighting:
+            self.lighting = LightMap(self.world_screen, fog=self.config.fog_of_war)
+
+        # Wave NPCs think on staggered ticks, the rest keep their own targets
+        self.ai = AIScheduler(self.config.ai_budget_ms)
+        # Walking NPCs keep apart instead of stacking up
+        self.crowd: Optional[CrowdSteering] = CrowdSteering() if self.config.crowd_steering else None
+        # Walls that block the view, wave NPCs aggro once they see the player through them
+        self.visibility = VisibilityGrid()
+        self.aggro = AggroDetector(self.visibility, self.config.aggro_budget_ms)
+        self.waves: Optional[WaveSpawner] = None
+        if self.config.level:
+            self.waves = WaveSpawner(self, LevelRegister.LEVELS[self.config.level],
+                                     spawns_per_frame=self.config.spawns_per_frame)
 
         self.tick_counter = 0
         cprint("Character setup successful", VC.MAGENTA)
+        # Everything loaded so far lives as long as the game
+        self.gc_scheduler.freeze()
 
     def _init_player(self) -> Player:
         """Create the player and their initial body segments."""
-        player = Player(self.screen, self.origin, (0, 0), 10)
+        player = Player(self.world_screen, self.origin, (0, 0), 10, body_mode=self.config.body_mode)
         for _ in range(3):
             player.add_snake_part()
         return player
@@ -54,8 +149,7 @@ class Game:
         """Spawn initial NPC characters."""
         return {
             NamedNPCs.NIBBIN: NPCCharacter(
-                self.screen,
-                self.origin,
+                self.world_screen,
                 NPCRegister.WIZARD,
                 spawn=(-600, -200),
                 active=True
@@ -64,7 +158,8 @@ class Game:
 
     def _init_ground_weapons(self) -> list[Attachment]:
         """Create a list of weapons lying on the ground."""
-        weapon_types = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.HEALING]
+        weapon_types = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.HEALING, WeaponRegister.MAGIC,
+                        WeaponRegister.SPEED, WeaponRegister.ARMOR]
 
         # Random number of attachments to spawn
         num_to_spawn = random.randint(3, 20)
@@ -77,16 +172,65 @@ class Game:
             weapon_type = random.choice(weapon_types)
             
             new_attachment = Attachment(
-                screen=self.screen,
+                screen=self.world_screen,
                 player=self.player,
-                origin=self.origin,
                 pos=random_pos,
                 weapon_type=weapon_type
             )
             attachments.append(new_attachment)
         return attachments
 
+    # ─────────────────────────────────────────────────────────────
+    # Entities
+    # ─────────────────────────────────────────────────────────────
+
+    def add_npc(self, name: str, npc: NPCCharacter) -> None:
+        """Adds an NPC to the world, dormant until it has something to do."""
+        self.npc_characters[name] = npc
+        npc.activity = self.npc_activity
+        self.npc_activity.add(npc, active=not npc.is_idle())
+
+    def remove_npc(self, name: str) -> Optional[NPCCharacter]:
+        npc = self.npc_characters.pop(name, None)
+        if npc is not None:
+            self.npc_activity.remove(npc)
+            npc.activity = None
+        return npc
+
+    def add_ground_weapon(self, weapon: Attachment) -> None:
+        """Adds a weapon to the world, attached ones are active from the start."""
+        self.ground_weapons.append(weapon)
+        self.weapon_activity.add(weapon, active=not weapon.is_idle())
+        self.static_changed(weapon.pos)
+
+    def remove_ground_weapon(self, weapon: Attachment) -> None:
+        if weapon in self.weapon_activity:
+            self.weapon_activity.remove(weapon)
+            self.ground_weapons.remove(weapon)
+            self.static_changed(weapon.pos)
+
+    def static_changed(self, pos: Optional[tuple[float, float]] = None) -> None:
+        """Tells the static layer that a resting weapon appeared or left at ``pos``, None for anywhere."""
+        if self.static_layer:
+            self.static_layer.invalidate(pos, Attachment.pickup_range)
+
+    def activity_counts(self) -> dict[str, dict]:
+        """Active and dormant NPCs and weapons of the last tick."""
+        return {"npcs": self.npc_activity.counts(), "weapons": self.weapon_activity.counts()}
+
+    def view_rect(self, margin: float = 0) -> tuple[float, float, float, float]:
+        """Left, top, right and bottom of the visible world, grown by ``margin``."""
+        width, height = self.screen.get_size()
+        left = -self.origin[0] - margin
+        top = -self.origin[1] - margin
+        return left, top, left + width + 2 * margin, top + height + 2 * margin
+
     def get_screen_center(self) -> tuple[float, float]:
+        """
+        Center of the window in window units. World positions are converted
+        with this origin before any render scale is applied, so it does not
+        depend on the current resolution factor.
+        """
         width, height = self.screen.get_size()
         return width * 0.5, height * 0.5
 
@@ -96,22 +240,71 @@ class Game:
 
     def run(self) -> None:
         """Start and run the main game loop."""
+        if self.alloc_profiler:
+            self.alloc_profiler.start()
+
+        if self.config.pipelined:
+            FramePipeline(self).run()
+            return
+
         while self.running:
-            self.handle_input()
-            self.update()
-            self.render()
+            frame_ms = self.run_frame()
+            self.gc_scheduler.idle(FRAME_MS - frame_ms)
             self.clock.tick(60)
-            self.tick_counter += 1
-            self._npc_test_movement()
+
+    def run_frame(self) -> float:
+        """Runs input, update and render once and returns the milliseconds of work."""
+        self.frame_stats.start_frame()
+        if self.alloc_profiler:
+            self.alloc_profiler.start_frame()
+
+        self.handle_input()
+        self._mark("input")
+        self.update()
+        self._mark("update")
+        self.render()
+        self._mark("render")
+        frame_ms = self.frame_stats.end_frame()
+        self.profiler.end_frame(frame_ms)
+
+        if self.alloc_profiler:
+            self.alloc_profiler.end_frame()
+        if self.scaler:
+            self.scaler.adapt(frame_ms)
+
+        self.tick_counter += 1
+        self._npc_test_movement()
+        return frame_ms
+
+    def _mark(self, phase: str) -> None:
+        """Ends a frame phase for the frame stats and the allocation profiler."""
+        self.frame_stats.mark(phase)
+        if self.alloc_profiler:
+            self.alloc_profiler.mark(phase)
 
     def update(self) -> None:
         """Update game logic and world state."""
         if self.move_enabled:
             self.player.set_target_pos()
 
+        self.player.update_buffs()
         self.player.update_body_positions()
 
-        for weapon in self.ground_weapons:
+        head = self.player.snake_pos[0]
+        self.npc_activity.wake_near(head, WAKE_RADIUS)
+        self.weapon_activity.wake_near(head, WAKE_RADIUS)
+
+        if self.waves:
+            self.waves.update()
+        self.ai.update(head, self.view_rect())
+        self.aggro.update(self.player.snake_pos)
+
+        for npc in self.npc_activity.active:
+            npc.update()
+        if self.crowd:
+            self.crowd.step(self.npc_activity.active)
+
+        for weapon in self.weapon_activity.active:
             weapon.update(self.origin)
 
         for projectile in self.projectiles:
@@ -120,41 +313,156 @@ class Game:
         self.attack()
 
         self._handle_collition()
+        self.particles.step()
+
+        self.npc_activity.update()
+        self.weapon_activity.update()
 
         # Remove projectiles that are no longer alive
         self.projectiles = [p for p in self.projectiles if p.alive]
 
+    @property
+    def render_scale(self) -> float:
+        """Resolution factor the world is currently drawn at."""
+        return self.scaler.scale if self.scaler else 1.0
+
     def render(self) -> None:
         """Draw everything to the screen."""
-        self.screen.fill((0, 0, 0))
-
-        # Update camera origin based on player's head
-        head = self.player.snake_pos[0]
-        screen_w, screen_h = self.screen.get_size()
-        self.origin = (screen_w * 0.5 - head[0], screen_h * 0.5 - head[1])
-
-        self.hub.render(self.origin)
-        self.player.render(self.origin)
-
-        if self.dragging_weapon:
-            self.player.draw_attachment_nodes(self.dragging_weapon)
-
-        self._render_weapons()
-        self._render_npcs()
+        self._update_camera()
+        snapshot = self.capture_frame()
+        self.render_background(snapshot)
+        self.render_snapshot(snapshot)
+
+    def capture_frame(self, detached: bool = False) -> FrameSnapshot:
+        """
+        Picks what render draws this tick. A detached snapshot holds copies
+        that can be drawn while the next tick is simulated. Drawing the live
+        objects also sets the player's origin, weapon angles and NPC animation
+        frames, for a detached snapshot that is done here instead.
+        """
+        origin = self.origin
+        # Resting weapons are part of the static layer, only dragged ones are left to draw
+        candidates = self.weapon_activity.active if self.static_layer else \
+            reversed(self.weapon_activity.in_rect(*self.view_rect(Attachment.pickup_range)))
+        weapons = []
+        for weapon in candidates:
+            if weapon.attached or (self.static_layer and weapon.is_idle()):
+                continue
 
+            angle = 0
+            if weapon.dragging:
+                # Mouse and origin are both in window units, whatever the render scale
+                mouse_world = pygame.Vector2(pygame.mouse.get_pos()) - pygame.Vector2(origin)
+                direction = mouse_world - weapon.pos
+                if direction.length_squared() > 0:
+                    angle = direction.angle_to(pygame.Vector2(1, 0))
+            weapons.append((weapon, angle))
+        npcs = self.npc_activity.in_rect(*self.view_rect(HIT_REACH))
+        map_markers = self.player_hud.map_markers(self.npc_activity.members, self.ground_weapons)
+
+        if not detached:
+            return FrameSnapshot(self.tick_counter, origin, self.player, self.dragging_weapon, weapons, npcs,
+                                 self.projectiles, None, map_markers)
+
+        self.player.origin = origin
+        for weapon, angle in weapons:
+            weapon.last_angle = angle
+        # Copies are the expensive part, only NPCs that can show up are copied
+        left, top, right, bottom = self.view_rect(HIT_REACH)
+        visible = [npc for npc in npcs if npc.active and left <= npc.pos.x <= right and top <= npc.pos.y <= bottom]
+        if map_markers:
+            npc_markers, weapon_markers, pick_ms = map_markers
+            map_markers = [detach(npc) for npc in npc_markers], [detach(weapon) for weapon in weapon_markers], pick_ms
+        snapshot = FrameSnapshot(
+            self.tick_counter,
+            origin,
+            detach_player(self.player),
+            detach(self.dragging_weapon) if self.dragging_weapon else None,
+            [(detach(weapon), angle) for weapon, angle in weapons],
+            [detach(npc) for npc in visible],
+            [detach(projectile) for projectile in self.projectiles],
+            self.particles.capture(),
+            map_markers,
+        )
+        for npc in npcs:
+            npc.advance_animation()
+        return snapshot
+
+    def render_background(self, snapshot: FrameSnapshot) -> None:
+        """Draws the hub and resting weapons, from the static layer if it is on."""
+        scale = self.render_scale
+        if self.static_layer:
+            # Covers the whole view, so there is nothing to clear
+            self.static_layer.draw(snapshot.origin, scale)
+        else:
+            if self.scaler:
+                self.scaler.clear()
+            else:
+                self.screen.fill((0, 0, 0))
+            self.hub.render(snapshot.origin, scale)
+
+    def render_snapshot(self, snapshot: FrameSnapshot) -> None:
+        """Draws the entities of a snapshot and the HUD over the background and shows the frame."""
+        origin = snapshot.origin
+        scale = self.render_scale
+        queue = self.render_queue
+        snapshot.player.render(queue, origin, scale)
+
+        if snapshot.dragging_weapon:
+            snapshot.player.draw_attachment_nodes(queue, snapshot.dragging_weapon)
+
+        for weapon, angle in snapshot.weapons:
+            weapon.submit(queue, angle, scale)
+        # Shots are the bulk of the projectiles and share a stamp, they are submitted together
+        shots = []
+        for projectile in snapshot.projectiles:
+            if isinstance(projectile, Projectile):
+                shots.append(projectile)
+            else:
+                projectile.submit(queue, scale)
+        Projectile.submit_all(queue, shots, scale)
+        for npc in snapshot.npcs:
+            npc.render(queue, scale)
+        queue.flush(origin, scale)
+        self.particles.draw(origin, scale, snapshot.particles)
+        if self.lighting:
+            # Revealed here rather than in update, the explored cells are only touched by the thread that draws
+            self.lighting.reveal(snapshot.player.snake_pos[0])
+            self.lighting.draw(origin, scale, snapshot.player, snapshot.projectiles)
+
+        if self.scaler:
+            self.scaler.present()
+
+        self.player_hud.player_snake = snapshot.player
         self.player_hud.update()
+        self.player_hud.update_map(snapshot.map_markers)
         self.player_hud.render()
 
         pygame.display.flip()
+        if self.capture:
+            self.capture.grab(self.screen)
 
-    def _handle_collition(self) -> None:
-        """Handle collisions between projectiles (including melee) and NPCs."""
+    def _update_camera(self) -> None:
+        """Update camera origin based on player's head."""
+        head = self.player.snake_pos[0]
+        screen_w, screen_h = self.screen.get_size()
+        self.origin = (screen_w * 0.5 - head[0], screen_h * 0.5 - head[1])
 
+    def _handle_collition(self) -> None:
+        """Handle collisions between projectiles (including melee and blasts) and NPCs."""
+        blasts = []
         for projectile in self.projectiles:
             if not projectile.alive:
                 continue
 
-            for npc_name, npc in self.npc_characters.items():
+            # Blasts hit every NPC in their radius, they are resolved together below
+            if isinstance(projectile, MagicBlast):
+                if not projectile.detonated:
+                    blasts.append(projectile)
+                continue
+
+            # Active NPCs and the dormant ones close enough to be hit
+            for npc in self.npc_activity.near(projectile.pos, HIT_REACH):
                 if not npc.active:
                     continue
 
@@ -163,17 +471,17 @@ class Game:
                 # Projectile logic
                 if isinstance(projectile, Projectile):
                     if (projectile.pos - npc_center).length() < npc.size * 0.5:
-                        npc.change_health(projectile.damage)
+                        self._damage_npc(npc, projectile.damage, projectile.pos)
                         projectile.alive = False
 
                 # Melee swing logic
                 elif isinstance(projectile, SwordSwingProjectile):
-                    if npc_name in projectile.hit_npcs:
+                    if projectile.has_hit(npc):
                         continue  # Prevent multiple hits
 
                     if (projectile.pos - npc_center).length() < projectile.range_radius:
-                        npc.change_health(projectile.damage)
-                        projectile.hit_npcs.add(npc_name)
+                        self._damage_npc(npc, projectile.damage, npc_center)
+                        projectile.mark_hit(npc)
 
             # Update projectile lifespan
             if isinstance(projectile, SwordSwingProjectile):
@@ -181,34 +489,35 @@ class Game:
                 if projectile.lifespan <= 0:
                     projectile.alive = False
 
-    def _render_weapons(self) -> None:
-        """Update and render unattached weapons and projectiles."""
-        for weapon in reversed(self.ground_weapons):
-            if weapon.attached:
-                continue
-
-            angle = 0
-            if weapon.dragging:
-                mouse_world = pygame.Vector2(pygame.mouse.get_pos()) - pygame.Vector2(self.origin)
-                direction = mouse_world - weapon.pos
-                if direction.length_squared() > 0:
-                    angle = direction.angle_to(pygame.Vector2(1, 0))
-
-            weapon.draw(self.origin, angle)
-
-        for projectile in self.projectiles:
-            projectile.draw(self.origin)
-
-    def _render_npcs(self) -> None:
-        """Render all active NPC characters."""
-        for npc in self.npc_characters.values():
-            npc.render(self.origin)
+        for npc, damage in self.area_damage.resolve(blasts, self.npc_activity):
+            self._damage_npc(npc, damage, npc.pos)
+
+    def _damage_npc(self, npc: NPCCharacter, damage: int, hit_pos: pygame.Vector2) -> None:
+        """Applies damage to an NPC with hit sparks, and a burst if it dies from it."""
+        was_alive = npc.HP > 0
+        npc.change_health(damage)
+        self.particles.emit(ParticleRegister.HIT, hit_pos, 10)
+        self.sounds.play(SoundRegister.HIT)
+        if was_alive and npc.HP <= 0:
+            self.particles.emit(ParticleRegister.DEATH, npc.pos, 80)
+            self.sounds.play(SoundRegister.DEATH)
+
+    def _bake_static(self, surface: pygame.Surface, origin: tuple[float, float], scale: float,
+                     world_rect: pygame.Rect) -> None:
+        """Draws the hub and the weapons resting in ``world_rect`` for the static layer."""
+        self.hub.render(origin, scale, surface)
+        area = world_rect.inflate(2 * Attachment.pickup_range, 2 * Attachment.pickup_range)
+        for weapon in reversed(self.weapon_activity.in_rect(area.left, area.top, area.right, area.bottom)):
+            if weapon.is_idle() and area.collidepoint(weapon.pos):
+                weapon.draw(origin, 0, scale, surface)
 
     def attack(self) -> None:
         """Trigger all attached weapons to attack."""
-        for weapon in self.ground_weapons:
+        # Attached weapons are never idle, so they are all in the active set
+        for weapon in self.weapon_activity.active:
             if weapon.attached:
-                weapon.attack(self.projectiles)
+                if weapon.attack(self.projectiles, self.particles):
+                    self.sounds.play_weapon(weapon.kind.name)
 
     def _npc_test_movement(self) -> None:
         """Temporary movement logic to demonstrate NPC animation."""
@@ -222,9 +531,9 @@ class Game:
     # Input Handling
     # ─────────────────────────────────────────────────────────────
 
-    def handle_input(self) -> None:
-        """Handle all input from keyboard and mouse."""
-        for event in pygame.event.get():
+    def handle_input(self, events: Optional[list] = None) -> None:
+        """Handle all input from keyboard and mouse, ``events`` instead of polling pygame if given."""
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 self.quit()
 
@@ -239,6 +548,9 @@ class Game:
 
     def _handle_key(self, event) -> None:
         """Process key presses."""
+        if event.key == pygame.K_F9:
+            self.profiler.toggle()
+            return
         key = pygame.key.name(event.key)
         if key == "s":
             cprint("s", VC.YELLOW)
@@ -249,10 +561,14 @@ class Game:
             click = self.player_hud.get_clicked()
             if click == "":
                 self.dragging_weapon = None
-                for weapon in self.ground_weapons:
-                    weapon.handle_mouse_down(pygame.mouse.get_pos(), self.origin, self.player)
+                mouse_pos = pygame.mouse.get_pos()
+                mouse_world = (mouse_pos[0] - self.origin[0], mouse_pos[1] - self.origin[1])
+                for weapon in self.weapon_activity.near(mouse_world, Attachment.size):
+                    weapon.handle_mouse_down(mouse_pos, self.origin, self.player)
                     if weapon.dragging:
                         self.dragging_weapon = weapon
+                        self.weapon_activity.wake(weapon)
+                        self.static_changed(weapon.pos)
                         break
             elif click == HUDRegister.OPTIONS:
                 cprint("options", VC.MAGENTA)
@@ -262,8 +578,9 @@ class Game:
 
     def _handle_mouse_up(self, event) -> None:
         if event.button == 1:
-            for weapon in self.ground_weapons:
-                weapon.handle_mouse_up(self.player, self.origin)
+            if self.dragging_weapon:
+                self.dragging_weapon.handle_mouse_up(self.player, self.origin)
+                self.static_changed(self.dragging_weapon.pos)
             self.dragging_weapon = None
 
         elif event.button == 3:
@@ -273,6 +590,12 @@ class Game:
     def quit(self) -> None:
         """End the game gracefully."""
         self.running = False
+        if self.alloc_profiler:
+            self.alloc_profiler.finish()
+        if self.capture:
+            self.capture.close()
+        self.profiler.close()
+        self.gc_scheduler.close()
         pygame.quit()
         sys.exit()
         cprint("Game closed", VC.MAGENTA)
@@ -283,7 +606,7 @@ class Game:
 # ─────────────────────────────────────────────────────────────
 
 def main() -> None:
-    game = Game()
+    game = Game(GameConfig.from_args())
     game.run()
 
 
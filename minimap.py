@@ -0,0 +1,125 @@
+"""Low resolution map of the world for the HUD."""
+
+import time
+from collections import deque
+from typing import Iterable, Optional, Sequence
+
+import pygame
+
+from hub import HUB
+from player_character import Player
+
+BACKGROUND = (15, 15, 20)
+BODY_COLOR = (0, 255, 0)
+HEAD_COLOR = (200, 255, 200)
+NPC_COLOR = (255, 60, 60)
+ITEM_COLOR = (255, 220, 0)
+
+
+class Minimap:
+    def __init__(self, hub: HUB, size: tuple[int, int], world_rect: pygame.Rect, refresh_frames: int = 3,
+                 max_markers: int = 64) -> None:
+        """
+        Draws the terrain once into a cached layer and only the markers on top.
+
+        Markers are sampled with a stride so that at most ``max_markers`` of each
+        kind are drawn, which keeps the cost the same for any number of entities.
+
+        Args:
+            hub: The hub whose image is the static terrain.
+            size: Pixel size of the map.
+            world_rect: Part of the world the map shows.
+            refresh_frames: Markers are redrawn every this many frames.
+            max_markers: Upper bound of markers per kind (body, NPCs, items).
+        """
+        self.size = size
+        self.world_rect = pygame.Rect(world_rect)
+        self.refresh_frames = max(1, refresh_frames)
+        self.max_markers = max_markers
+
+        self.scale_x = size[0] / self.world_rect.width
+        self.scale_y = size[1] / self.world_rect.height
+
+        self.static_layer = self._render_static(hub)
+        self.surface = self.static_layer.copy()
+
+        self.frame = 0
+        self.cost_ms: deque[float] = deque(maxlen=120)
+
+    def _render_static(self, hub: HUB) -> pygame.Surface:
+        """Scales the terrain down once."""
+        layer = pygame.Surface(self.size).convert()
+        layer.fill(BACKGROUND)
+
+        width, height = hub.hub_image.get_size()
+        map_width = max(1, round(width * self.scale_x))
+        map_height = max(1, round(height * self.scale_y))
+        terrain = pygame.transform.smoothscale(hub.hub_image, (map_width, map_height))
+        layer.blit(terrain, self.to_map(hub.pos))
+        return layer
+
+    def to_map(self, world_pos) -> tuple[int, int]:
+        """World position to pixel on the map, clamped to its border."""
+        x = int((world_pos[0] - self.world_rect.x) * self.scale_x)
+        y = int((world_pos[1] - self.world_rect.y) * self.scale_y)
+        return min(max(x, 0), self.size[0] - 1), min(max(y, 0), self.size[1] - 1)
+
+    # ──────────────────────────────────────────────────────────────
+    # Markers
+    # ──────────────────────────────────────────────────────────────
+
+    def _sampled(self, items: Sequence) -> Iterable:
+        """At most max_markers evenly spread items."""
+        stride = len(items) // self.max_markers + 1
+        return (items[i] for i in range(0, len(items), stride))
+
+    def _marker(self, world_pos, color: tuple[int, int, int], size: int) -> None:
+        x, y = self.to_map(world_pos)
+        self.surface.fill(color, (x - size // 2, y - size // 2, size, size))
+
+    def markers(self, npcs: Sequence, weapons: Sequence) -> Optional[tuple[list, list, float]]:
+        """
+        The NPCs and loose weapons that get a marker, at most max_markers of
+        each, and the milliseconds picking them took. None on the frames
+        update() does not redraw. Call once per frame, the picked ones can be
+        copied and drawn by update() while the world moves on.
+
+        Args:
+            npcs: Every NPC, e.g. ActivityManager.members, only sampled ones are looked at.
+            weapons: Every weapon in the world.
+        """
+        self.frame += 1
+        if self.frame % self.refresh_frames:
+            return None
+
+        start = time.perf_counter()
+        npc_markers = [npc for npc in self._sampled(npcs) if npc.active]
+        weapon_markers = [weapon for weapon in self._sampled(weapons) if not weapon.attached]
+        return npc_markers, weapon_markers, (time.perf_counter() - start) * 1000
+
+    def update(self, player: Player, markers: Optional[tuple[list, list, float]]) -> None:
+        """Redraws the markers picked by markers(), nothing if it picked none this frame."""
+        if markers is None:
+            return
+        npcs, weapons, pick_ms = markers
+
+        start = time.perf_counter()
+        self.surface.blit(self.static_layer, (0, 0))
+
+        for weapon in weapons:
+            self._marker(weapon.pos, ITEM_COLOR, 3)
+        for npc in npcs:
+            self._marker(npc.pos, NPC_COLOR, 4)
+
+        for pos in self._sampled(player.snake_pos):
+            self._marker(pos, BODY_COLOR, 3)
+        self._marker(player.snake_pos[0], HEAD_COLOR, 5)
+
+        self.cost_ms.append(pick_ms + (time.perf_counter() - start) * 1000)
+
+    def render(self, screen: pygame.Surface, pos: tuple[float, float]) -> None:
+        screen.blit(self.surface, pos)
+
+    def average_cost_ms(self) -> float:
+        """Average milliseconds of a marker refresh."""
+        return sum(self.cost_ms) / len(self.cost_ms) if self.cost_ms else 0.0
@@ -0,0 +1,232 @@
+"""Binary messages between the game server and its clients."""
+
+import heapq
+import random
+import socket
+import struct
+import time
+import zlib
+from typing import Optional
+
+
+class MessageRegister:
+    HELLO = 1     # client -> server, asks for a snake
+    WELCOME = 2   # server -> client, tells the player id
+    INPUT = 3     # client -> server, steering input
+    SNAPSHOT = 4  # server -> client, world state
+    BYE = 5       # client -> server, leaves the game
+
+    # Input flags
+    MOVE = 1
+
+    # Snapshot flags
+    COMPRESSED = 1
+
+    # Snapshot sections, in the order they are written
+    PLAYERS = "players"          # id -> [x0, y0, x1, y1, ...] body segments
+    PROJECTILES = "projectiles"  # id -> [x, y]
+    NPCS = "npcs"                # id -> [x, y, hp]
+    SECTIONS = (PLAYERS, PROJECTILES, NPCS)
+
+
+# Positions are sent as integers in quarter world units
+POSITION_SCALE = 4
+
+MESSAGE_TYPE = struct.Struct("!B")
+WELCOME = struct.Struct("!BI")             # type, player id
+INPUT = struct.Struct("!BIIffB")           # type, input seq, acked snapshot tick, target x, target y, flags
+SNAPSHOT_HEADER = struct.Struct("!BIIIB")  # type, tick, baseline tick (0 = full), last input seq, flags
+
+MAX_DATAGRAM = 65507
+
+
+def quantize(value: float) -> int:
+    return round(value * POSITION_SCALE)
+
+
+def dequantize(value: int) -> float:
+    return value / POSITION_SCALE
+
+
+# ─────────────────────────────────────────────────────────────
+# Varints
+# ─────────────────────────────────────────────────────────────
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    """Appends an unsigned integer using 7 bits per byte."""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """Reads an unsigned varint, returns the value and the new offset."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    """Maps signed to unsigned integers so small deltas stay small."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+# ─────────────────────────────────────────────────────────────
+# Snapshots
+# ─────────────────────────────────────────────────────────────
+
+def _predict(values: list[int], base: Optional[list[int]], index: int, stride: int) -> int:
+    """
+    Value the decoder already expects at ``index``: the same value in the
+    baseline, otherwise the previous element with the same stride (the
+    previous body segment), otherwise zero.
+    """
+    if base is not None and index < len(base):
+        return base[index]
+    if index >= stride:
+        return values[index - stride]
+    return 0
+
+
+def encode_snapshot(state: dict, baseline: Optional[dict] = None) -> bytes:
+    """
+    Encodes a quantized world state, as a delta against ``baseline`` if given.
+
+    Every section lists the ids of all entities that exist. An entity that
+    did not change since the baseline costs its id and one byte, changed
+    values are written as zigzag varints relative to their prediction.
+    """
+    buffer = bytearray()
+    for section in MessageRegister.SECTIONS:
+        entities = state.get(section, {})
+        base_entities = baseline.get(section, {}) if baseline else {}
+        write_varint(buffer, len(entities))
+
+        previous_id = 0
+        for entity_id in sorted(entities):
+            values = entities[entity_id]
+            base = base_entities.get(entity_id)
+            write_varint(buffer, entity_id - previous_id)
+            previous_id = entity_id
+
+            if base == values:
+                write_varint(buffer, 0)
+                continue
+
+            write_varint(buffer, len(values) << 1 | 1)
+            for index, value in enumerate(values):
+                write_varint(buffer, zigzag(value - _predict(values, base, index, 2)))
+    return bytes(buffer)
+
+
+def decode_snapshot(payload: bytes, baseline: Optional[dict] = None) -> dict:
+    """Rebuilds the world state written by encode_snapshot."""
+    state: dict = {}
+    offset = 0
+    for section in MessageRegister.SECTIONS:
+        base_entities = baseline.get(section, {}) if baseline else {}
+        count, offset = read_varint(payload, offset)
+
+        entities: dict[int, list[int]] = {}
+        entity_id = 0
+        for _ in range(count):
+            id_delta, offset = read_varint(payload, offset)
+            entity_id += id_delta
+            base = base_entities.get(entity_id)
+
+            header, offset = read_varint(payload, offset)
+            if header == 0:
+                entities[entity_id] = base
+                continue
+
+            values: list[int] = []
+            for index in range(header >> 1):
+                delta, offset = read_varint(payload, offset)
+                values.append(_predict(values, base, index, 2) + unzigzag(delta))
+            entities[entity_id] = values
+        state[section] = entities
+    return state
+
+
+def pack_snapshot(tick: int, baseline_tick: int, last_input_seq: int, payload: bytes) -> bytes:
+    """Adds the snapshot header, compressing the payload when that makes it smaller."""
+    flags = 0
+    compressed = zlib.compress(payload, 1)
+    if len(compressed) < len(payload):
+        payload = compressed
+        flags |= MessageRegister.COMPRESSED
+    return SNAPSHOT_HEADER.pack(MessageRegister.SNAPSHOT, tick, baseline_tick, last_input_seq, flags) + payload
+
+
+def unpack_snapshot(data: bytes) -> tuple[int, int, int, bytes]:
+    """Returns tick, baseline tick, last input seq and the raw payload of a snapshot."""
+    _, tick, baseline_tick, last_input_seq, flags = SNAPSHOT_HEADER.unpack_from(data)
+    payload = data[SNAPSHOT_HEADER.size:]
+    if flags & MessageRegister.COMPRESSED:
+        payload = zlib.decompress(payload)
+    return tick, baseline_tick, last_input_seq, payload
+
+
+# ─────────────────────────────────────────────────────────────
+# Simulated network
+# ─────────────────────────────────────────────────────────────
+
+class LossyLink:
+    """
+    Sends datagrams over a real socket, but holds them back for a simulated
+    latency (with jitter) and drops a share of them first. Call flush()
+    regularly so delayed datagrams go out when they are due.
+    """
+
+    def __init__(self, sock: socket.socket, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 loss: float = 0.0, seed: Optional[int] = None) -> None:
+        self.sock = sock
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.random = random.Random(seed)
+
+        self.queue: list[tuple[float, int, bytes, tuple]] = []
+        self._order = 0
+
+        self.packets_sent = 0
+        self.packets_dropped = 0
+        self.bytes_sent = 0
+
+    def send(self, data: bytes, address: tuple) -> None:
+        if self.loss and self.random.random() < self.loss:
+            self.packets_dropped += 1
+            return
+
+        delay_ms = self.latency_ms
+        if self.jitter_ms:
+            delay_ms += self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        due = time.perf_counter() + max(0.0, delay_ms) / 1000
+
+        self._order += 1
+        heapq.heappush(self.queue, (due, self._order, data, address))
+        self.flush()
+
+    def flush(self) -> None:
+        """Sends every held back datagram whose delay has passed."""
+        now = time.perf_counter()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data, address = heapq.heappop(self.queue)
+            try:
+                self.sock.sendto(data, address)
+            except (BlockingIOError, ConnectionError):
+                self.packets_dropped += 1
+                continue
+            self.packets_sent += 1
+            self.bytes_sent += len(data)
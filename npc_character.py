@@ -1,11 +1,19 @@
 """Structure of NPC characters with movement and visual rendering."""
 
+from __future__ import annotations
+
 import os
 import pygame
+from typing import Optional, TYPE_CHECKING
 
 from assistent_skripts.color_print import custom_print as cprint
 from assistent_skripts.color_print import ValidColors as VC
 
+from render_queue import RenderLayer, RenderQueue
+
+if TYPE_CHECKING:
+    from entity_activity import ActivityManager
+
 
 class NamedNPCs:
     NIBBIN = "Nibbin"  # Wizard
@@ -14,13 +22,14 @@ class NamedNPCs:
 class NPCRegister:
     NAME = 0
     HP = 1
+    DAMAGE = 2
 
     # Friendly NPCs
-    WIZARD = ("wizard", 5)
+    WIZARD = ("wizard", 5, 0)
     VILLAGE_NPCS = [WIZARD]
 
     # Hostile NPCs
-    VAMPIRE = ("vampire", 10)
+    VAMPIRE = ("vampire", 10, 1)
     ENEMY_NPCS = [VAMPIRE]
 
     # Animation states
@@ -29,42 +38,163 @@ class NPCRegister:
     DEAD = "dead"
 
 
+class NPCType:
+    """
+    Everything NPCs of one NPCRegister entry have in common: stats and the
+    animation frames. Frames are loaded from disk once per state and reused
+    by every NPC of the type.
+    """
+    __slots__ = ("character", "name", "max_HP", "damage", "size", "move_speed", "screen",
+                 "frames", "scaled_frames")
+
+    _types: dict[tuple, NPCType] = {}
+
+    def __init__(self, character: tuple[str, int, int], screen: pygame.Surface) -> None:
+        self.character = character
+        self.name: str = character[NPCRegister.NAME]
+        self.max_HP: int = character[NPCRegister.HP]
+        self.damage: int = character[NPCRegister.DAMAGE]
+        self.size = 200
+        self.move_speed = 8
+        self.screen = screen
+
+        # Animation state -> loaded frames, and (state, frame, height) -> scaled frame
+        self.frames: dict[str, list[pygame.Surface]] = {}
+        self.scaled_frames: dict[tuple[str, int, int], pygame.Surface] = {}
+
+    @classmethod
+    def get(cls, character: tuple[str, int, int], screen: pygame.Surface) -> NPCType:
+        """The shared type of an NPCRegister entry, created on first use."""
+        key = (character, screen)
+        kind = cls._types.get(key)
+        if kind is None:
+            kind = cls._types[key] = cls(character, screen)
+        return kind
+
+    def _count_animation_frames(self, state: str, extensions={".png", ".jpg", ".jpeg"}) -> int:
+        """Counts the number of frames in an animation folder."""
+        folder_path = f"textures/npcs/{self.name}/{state}"
+        try:
+            return sum(
+                1 for file in os.listdir(folder_path)
+                if os.path.isfile(os.path.join(folder_path, file)) and os.path.splitext(file)[1].lower() in extensions
+            )
+        except FileNotFoundError:
+            cprint(f"Missing animation folder: {folder_path}", VC.RED)
+            return 0
+
+    def animation(self, state: str) -> list[pygame.Surface]:
+        """The frames of an animation state, loaded on first use."""
+        frames = self.frames.get(state)
+        if frames is None:
+            frames = []
+            for frame in range(self._count_animation_frames(state)):
+                image_path = f"textures/npcs/{self.name}/{state}/{frame}.png"
+                try:
+                    frames.append(pygame.image.load(image_path).convert_alpha())
+                except FileNotFoundError:
+                    cprint(f"Missing image: {image_path}", VC.RED)
+                    break
+            self.frames[state] = frames
+        return frames
+
+    def frame_image(self, state: str, frame: int, height: int) -> pygame.Surface:
+        """A frame scaled to ``height`` pixels, scaled once per height."""
+        key = (state, frame, height)
+        image = self.scaled_frames.get(key)
+        if image is None:
+            original = self.animation(state)[frame]
+            original_width, original_height = original.get_size()
+            new_width = int(original_width * height / original_height)
+            image = self.scaled_frames[key] = pygame.transform.scale(original, (new_width, height))
+        return image
+
+
 class NPCCharacter:
-    def __init__(self, screen: pygame.Surface, origin: tuple[float, float], character: tuple[str, int],
+    __slots__ = ("kind", "active", "pos", "_target_pos", "animation_state", "frame", "frame_timer",
+                 "frame_delay", "HP", "activity")
+
+    def __init__(self, screen: pygame.Surface, character: tuple[str, int, int],
                  spawn: tuple[float, float], active: bool = False) -> None:
         """
         Initializes an animated NPC character.
 
         Args:
             screen: The Pygame surface to draw on.
-            origin: The screen offset (e.g. camera offset).
             character: The NPC identifier (used for folder paths).
             spawn: The world position to spawn the character.
             active: Whether this NPC is currently active.
         """
-        self.screen = screen
+        self.kind = NPCType.get(character, screen)
+        # The ActivityManager that is told when this NPC gets something to do
+        self.activity: Optional[ActivityManager] = None
         self.active = active
-        self.origin = origin
         self.pos = pygame.Vector2(spawn)
         self.target_pos = pygame.Vector2(spawn)
 
-        # Movement
-        self.move_speed = 8
-        self.size = 200
-
         # Animation
-        self.character = character
         self.animation_state = NPCRegister.IDLE
         self.frame = 0
         self.frame_timer = 0
         self.frame_delay = 10
-        self.animation_count = self._count_animation_frames()
 
-        self.max_HP: int = self.character[NPCRegister.HP]
-        self.HP: int = self.max_HP
+        self.HP: int = self.kind.max_HP
+
+    @property
+    def screen(self) -> pygame.Surface:
+        return self.kind.screen
+
+    @property
+    def target_pos(self) -> pygame.Vector2:
+        return self._target_pos
+
+    @target_pos.setter
+    def target_pos(self, target_pos: pygame.Vector2) -> None:
+        self._target_pos = target_pos
+        self.wake()
+
+    @property
+    def character(self) -> tuple[str, int, int]:
+        return self.kind.character
+
+    @property
+    def max_HP(self) -> int:
+        return self.kind.max_HP
+
+    @property
+    def size(self) -> int:
+        return self.kind.size
+
+    @property
+    def move_speed(self) -> int:
+        return self.kind.move_speed
+
+    @property
+    def animation_count(self) -> int:
+        return len(self.kind.animation(self.animation_state))
+
+    def reset(self, spawn: tuple[float, float], active: bool = True) -> None:
+        """Brings a dead or pooled NPC back at full health at ``spawn``, the type's frames are kept."""
+        self.active = active
+        self.pos = pygame.Vector2(spawn)
+        self.target_pos = pygame.Vector2(spawn)
+        self.animation_state = NPCRegister.IDLE
+        self.frame = 0
+        self.frame_timer = 0
+        self.frame_delay = 10
+        self.HP = self.kind.max_HP
+
+    def wake(self) -> None:
+        if self.activity is not None:
+            self.activity.wake(self)
+
+    def is_idle(self) -> bool:
+        """Nothing to update: inactive, or standing at its target."""
+        return not self.active or self.pos == self._target_pos
 
     def change_health(self, amount: int, reduce: bool = True):
         """Reduces the NPC's HP and handles death."""
+        self.wake()
         if reduce:
             self.HP -= amount
             cprint(f"{self.character[NPCRegister.NAME]} took {amount} damage. Remaining HP: {self.HP}", VC.YELLOW)
@@ -86,18 +216,6 @@ class NPCCharacter:
     # Animation Handling
     # ──────────────────────────────────────────────────────────────
 
-    def _count_animation_frames(self, extensions={".png", ".jpg", ".jpeg"}) -> int:
-        """Counts the number of frames in the current animation folder."""
-        folder_path = f"textures/npcs/{self.character[NPCRegister.NAME]}/{self.animation_state}"
-        try:
-            return sum(
-                1 for file in os.listdir(folder_path)
-                if os.path.isfile(os.path.join(folder_path, file)) and os.path.splitext(file)[1].lower() in extensions
-            )
-        except FileNotFoundError:
-            cprint(f"Missing animation folder: {folder_path}", VC.RED)
-            return 0
-
     def change_animation(self, new_state: str) -> None:
         """
         Changes the animation state if different from current one.
@@ -109,7 +227,6 @@ class NPCCharacter:
             return
 
         self.animation_state = new_state
-        self.animation_count = self._count_animation_frames()
         self.frame = 0
         self.frame_timer = 0
 
@@ -119,39 +236,38 @@ class NPCCharacter:
         else:
             self.frame_delay = self.move_speed * 2
 
-    def health_bar(self, screen_pos: pygame.Vector2, bar_width: int):
+    def health_bar(self, queue: RenderQueue, sprite_offset: tuple[float, float], bar_width: int,
+                   scale: float = 1.0):
         """
-        Displays the NPC's health bar above its head.
+        Submits the NPC's health bar above its head. A bar is a stamp per
+        width and health, drawn once.
 
         Args:
-            screen_pos: The top-left position of the NPC sprite on screen.
+            queue: Render queue of the frame.
+            sprite_offset: Offset of the top-left of the NPC sprite from its position, in screen pixels.
             bar_width: The width of the health bar (usually matches sprite width).
+            scale: Resolution factor of the surface that is drawn on.
         """
-        bar_height = 10
-        bar_offset_y = 20  # Vertical offset above the sprite
-
-        # Calculate health bar position
-        bar_x = screen_pos.x
-        bar_y = screen_pos.y - bar_offset_y
-
-        # Draw red background bar
-        pygame.draw.rect(
-            self.screen,
-            (200, 50, 50),
-            (bar_x, bar_y, bar_width, bar_height),
-            border_radius=3
-        )
-
-        # Draw green foreground based on HP
+        bar_height = max(1, round(10 * scale))
+        bar_offset_y = 20 * scale  # Vertical offset above the sprite
+
+        # Green foreground based on HP
+        green_width = 0
         if self.max_HP > 0:
             hp_ratio = max(0, min(self.HP / self.max_HP, 1))  # Clamp between 0 and 1
             green_width = int(bar_width * hp_ratio)
-            pygame.draw.rect(
-                self.screen,
-                (50, 200, 50),
-                (bar_x, bar_y, green_width, bar_height),
-                border_radius=3
-            )
+
+        key = ("health_bar", bar_width, bar_height, green_width)
+        bar = queue.stamp(key)
+        if bar is None:
+            bar = queue.new_stamp((bar_width, bar_height))
+            # Red background bar
+            pygame.draw.rect(bar, (200, 50, 50), (0, 0, bar_width, bar_height), border_radius=3)
+            if green_width:
+                pygame.draw.rect(bar, (50, 200, 50), (0, 0, green_width, bar_height), border_radius=3)
+            bar = queue.store(key, bar)
+
+        queue.submit(RenderLayer.HEALTH_BARS, bar, self.pos, (sprite_offset[0], sprite_offset[1] - bar_offset_y))
 
     # ──────────────────────────────────────────────────────────────
     # Movement
@@ -166,6 +282,15 @@ class NPCCharacter:
         self.target_pos = self.pos + pygame.Vector2(offset)
         self.change_animation(NPCRegister.RUNNING)
 
+    def update(self) -> None:
+        """Advances the NPC's movement by one tick."""
+        if not self.active:
+            self.pos = self.target_pos
+            return
+
+        if self.pos != self.target_pos:
+            self._move_toward_target()
+
     def _move_toward_target(self) -> None:
         """
         Smoothly moves the character toward its target position.
@@ -186,47 +311,42 @@ class NPCCharacter:
     # Rendering
     # ──────────────────────────────────────────────────────────────
 
-    def render(self, origin: tuple[float, float]) -> None:
+    def render(self, queue: RenderQueue, scale: float = 1.0) -> None:
         """
-        Renders the NPC sprite to the screen at the correct position.
+        Submits the NPC sprite to the render queue at the correct position.
 
         Args:
-            origin: The current screen offset (e.g. camera position).
+            queue: Render queue of the frame, it adds the camera offset.
+            scale: Resolution factor of the surface that is drawn on.
         """
-        self.origin = origin
-
         if not self.active:
-            self.pos = self.target_pos
             return
 
-        if self.pos != self.target_pos:
-            self._move_toward_target()
-
-        # Load current frame
-        image_path = f"textures/npcs/{self.character[NPCRegister.NAME]}/{self.animation_state}/{self.frame}.png"
-        try:
-            image = pygame.image.load(image_path).convert_alpha()
-        except FileNotFoundError:
-            cprint(f"Missing image: {image_path}", VC.RED)
+        animation_count = self.animation_count
+        if animation_count == 0:
             return
 
-        # Scale image
-        original_width, original_height = image.get_size()
-        scale_factor = self.size / original_height
-        new_width = int(original_width * scale_factor)
-        scaled_image = pygame.transform.scale(image, (new_width, self.size))
+        # Current frame, scaled once per size
+        size = max(1, round(self.size * scale))
+        scaled_image = self.kind.frame_image(self.animation_state, self.frame, size)
+        new_width = scaled_image.get_width()
 
-        # Position image
-        centered_pos = pygame.Vector2(self.pos.x - new_width * 0.5, self.pos.y - self.size * 0.8)
-        screen_pos = pygame.Vector2(self.origin) + centered_pos
-
-        self.screen.blit(scaled_image, screen_pos)
+        # Position image, centered horizontally and lifted above the position
+        offset = (-new_width * 0.5, -self.size * 0.8 * scale)
+        queue.submit(RenderLayer.NPCS, scaled_image, self.pos, offset)
 
         if self.HP < self.max_HP:
-            self.health_bar(screen_pos, new_width)
+            self.health_bar(queue, offset, new_width, scale)
+
+        self.advance_animation()
+
+    def advance_animation(self) -> None:
+        """Counts one drawn frame and steps the animation when its delay is up."""
+        animation_count = self.animation_count
+        if not self.active or animation_count == 0:
+            return
 
-        # Advance frame if needed
         self.frame_timer += 1
         if self.frame_timer >= self.frame_delay:
             self.frame_timer = 0
-            self.frame = (self.frame + 1) % self.animation_count if self.animation_count > 0 else 0
+            self.frame = (self.frame + 1) % animation_count
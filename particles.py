@@ -0,0 +1,247 @@
+"""Array based particle system for weapon and hit effects."""
+
+import math
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pygame
+
+
+class ParticleRegister:
+    """Particle effects: color, speed, lifetime in ticks, radius and drag per tick."""
+    COLOR = 0
+    SPEED = 1
+    LIFETIME = 2
+    RADIUS = 3
+    DRAG = 4
+
+    MUZZLE = ((255, 220, 120), 7.0, 8, 4, 0.80)
+    SWORD = ((200, 230, 255), 4.0, 12, 3, 0.88)
+    HIT = ((255, 120, 60), 5.0, 16, 3, 0.88)
+    DEATH = ((70, 0, 10), 4.0, 40, 5, 0.93)
+    MAGIC = ((120, 220, 255), 14.0, 30, 4, 0.92)
+    EFFECTS = [MUZZLE, SWORD, HIT, DEATH, MAGIC]
+
+    # Sprites per effect, from fresh to faded out
+    FADE_STEPS = 8
+
+
+class ParticleSystem:
+    def __init__(self, screen: pygame.Surface, capacity: int = 100_000, budget_ms: float = 2.0,
+                 seed: Optional[int] = None) -> None:
+        """
+        Keeps every particle in preallocated arrays used as a ring buffer, so
+        spawning never creates objects per particle and a full ring overwrites
+        the oldest particles. One vectorized step moves all of them.
+
+        Drawing uses pre-tinted sprites handed to ``Surface.blits`` at once.
+        When drawing gets more expensive than ``budget_ms``, only every n-th
+        particle is drawn, so effects get thinner instead of the frame slower.
+
+        Args:
+            screen: The surface particles are drawn on.
+            capacity: Most particles alive at the same time.
+            budget_ms: Milliseconds per frame drawing may take.
+            seed: Seed for the spawn directions, random if None.
+        """
+        self.screen = screen
+        self.capacity = capacity
+        self.budget_ms = budget_ms
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.drag = np.zeros(capacity, np.float32)
+        self.age = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.effect = np.zeros(capacity, np.uint8)
+
+        # Next slot to write and how many slots from the start are in use
+        self.head = 0
+        self.used = 0
+        self.live = 0
+
+        effects = ParticleRegister.EFFECTS
+        self.effect_ids = {effect: i for i, effect in enumerate(effects)}
+        self.radii = np.array([effect[ParticleRegister.RADIUS] for effect in effects], np.float32)
+
+        # Render scale -> sprites indexed by effect * FADE_STEPS + fade step
+        self.sprites: dict[float, list[pygame.Surface]] = {}
+
+        # Adaptive number of particles that fit in the budget
+        self.draw_limit = capacity
+        self.cost_per_particle_ms = 0.0
+        self.drawn = 0
+        self.skipped = 0
+        self.draw_ms: deque[float] = deque(maxlen=120)
+
+    # ──────────────────────────────────────────────────────────────
+    # Spawning
+    # ──────────────────────────────────────────────────────────────
+
+    def emit(self, effect: tuple, pos, count: int, angle: float = 0.0, spread: float = math.tau,
+             velocity=(0.0, 0.0)) -> None:
+        """
+        Spawns ``count`` particles of an effect.
+
+        Args:
+            effect: An entry of ParticleRegister.
+            pos: World position they start at.
+            count: How many particles to spawn.
+            angle: Direction they fly in, in radians.
+            spread: Width of the cone around ``angle``, tau for all directions.
+            velocity: Velocity added to all of them, e.g. of the weapon.
+        """
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+
+        start = self.head
+        end = start + count
+        if end <= self.capacity:
+            self._spawn(slice(start, end), effect, pos, angle, spread, velocity)
+        else:
+            # Wrap around the end of the ring
+            self._spawn(slice(start, self.capacity), effect, pos, angle, spread, velocity)
+            end -= self.capacity
+            self._spawn(slice(0, end), effect, pos, angle, spread, velocity)
+            self.used = self.capacity
+
+        self.head = end % self.capacity
+        self.used = max(self.used, end)
+        self.live = min(self.capacity, self.live + count)
+
+    def _spawn(self, slots: slice, effect: tuple, pos, angle: float, spread: float, velocity) -> None:
+        count = slots.stop - slots.start
+        angles = angle + (self.rng.random(count, np.float32) - 0.5) * spread
+        speeds = effect[ParticleRegister.SPEED] * (0.3 + 0.7 * self.rng.random(count, np.float32))
+
+        self.pos[slots] = pos[0], pos[1]
+        self.vel[slots, 0] = np.cos(angles) * speeds + velocity[0]
+        self.vel[slots, 1] = np.sin(angles) * speeds + velocity[1]
+        self.drag[slots] = effect[ParticleRegister.DRAG]
+        self.age[slots] = 0
+        self.life[slots] = effect[ParticleRegister.LIFETIME] * (0.6 + 0.4 * self.rng.random(count, np.float32))
+        self.effect[slots] = self.effect_ids[effect]
+
+    def clear(self) -> None:
+        self.head = self.used = self.live = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Simulation
+    # ──────────────────────────────────────────────────────────────
+
+    def step(self) -> None:
+        """Moves all particles by one tick."""
+        n = self.used
+        if n == 0:
+            return
+
+        self.pos[:n] += self.vel[:n]
+        self.vel[:n] *= self.drag[:n, None]
+        self.age[:n] += 1
+
+        self.live = int(np.count_nonzero(self.age[:n] < self.life[:n]))
+        if self.live == 0:
+            self.clear()
+
+    # ──────────────────────────────────────────────────────────────
+    # Rendering
+    # ──────────────────────────────────────────────────────────────
+
+    def _sprites(self, scale: float) -> list[pygame.Surface]:
+        """Pre-tinted sprites for every effect and fade step, made once per scale."""
+        sprites = self.sprites.get(scale)
+        if sprites is None:
+            sprites = []
+            steps = ParticleRegister.FADE_STEPS
+            for color, _, _, radius, _ in ParticleRegister.EFFECTS:
+                size = max(1, round(radius * scale))
+                for step in range(steps):
+                    fade = 1 - step / steps
+                    sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(sprite, (*color, round(255 * fade)), (size, size), max(1, round(size * fade)))
+                    sprites.append(sprite)
+            self.sprites[scale] = sprites
+        return sprites
+
+    def capture(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Copies of the positions, ages, lifetimes and effects draw reads, to draw them while the particles move on."""
+        n = self.used
+        return self.pos[:n].copy(), self.age[:n].copy(), self.life[:n].copy(), self.effect[:n].copy()
+
+    def draw(self, origin: tuple[float, float], scale: float = 1.0, captured: Optional[tuple] = None) -> None:
+        """
+        Draws the live particles that are on screen.
+
+        Args:
+            origin: The current screen offset (e.g. camera position).
+            scale: Resolution factor of the surface that is drawn on.
+            captured: Arrays from capture() to draw instead of the current particles.
+        """
+        self.drawn = self.skipped = 0
+        if captured is None:
+            n = self.used
+            pos, age, life, effects = self.pos[:n], self.age[:n], self.life[:n], self.effect[:n]
+        else:
+            pos, age, life, effects = captured
+            n = len(age)
+        if n == 0:
+            return
+
+        start = time.perf_counter()
+        sprites = self._sprites(scale)
+
+        xs = (pos[:, 0] + origin[0]) * scale
+        ys = (pos[:, 1] + origin[1]) * scale
+        width, height = self.screen.get_size()
+        visible = np.flatnonzero((age < life) & (xs > -8) & (xs < width + 8) & (ys > -8) & (ys < height + 8))
+
+        # Over budget: draw an evenly spread subset
+        if len(visible) > self.draw_limit:
+            stride = math.ceil(len(visible) / self.draw_limit)
+            self.skipped = len(visible) - len(visible[::stride])
+            visible = visible[::stride]
+        self.drawn = len(visible)
+        if self.drawn == 0:
+            return
+
+        effect = effects[visible]
+        steps = ParticleRegister.FADE_STEPS
+        fade = np.minimum(age[visible] / life[visible] * steps, steps - 1).astype(np.intp)
+        half = np.maximum(1, np.round(self.radii[effect] * scale))
+        left = (xs[visible] - half).astype(np.intp).tolist()
+        top = (ys[visible] - half).astype(np.intp).tolist()
+        sprite_ids = (effect.astype(np.intp) * steps + fade).tolist()
+
+        self.screen.blits(zip(map(sprites.__getitem__, sprite_ids), zip(left, top)), doreturn=False)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.draw_ms.append(elapsed)
+        # A limited draw is always measured, else a limit under 1000 could never rise again
+        if self.drawn >= 1000 or self.skipped:
+            self._adapt(elapsed)
+
+    def _adapt(self, elapsed_ms: float) -> None:
+        """
+        Follows the cost per particle and sets how many fit in the budget.
+        Only large draws and the ones the limit thinned out are measured,
+        small ones are dominated by fixed costs.
+        """
+        cost = elapsed_ms / self.drawn
+        if self.cost_per_particle_ms:
+            self.cost_per_particle_ms += (cost - self.cost_per_particle_ms) * 0.1
+        else:
+            self.cost_per_particle_ms = cost
+        self.draw_limit = max(256, int(self.budget_ms / self.cost_per_particle_ms))
+
+    def stats(self) -> dict:
+        return {
+            "live": self.live,
+            "drawn": self.drawn,
+            "skipped": self.skipped,
+            "draw_ms_avg": sum(self.draw_ms) / len(self.draw_ms) if self.draw_ms else 0.0,
+            "draw_limit": self.draw_limit,
+        }
@@ -4,13 +4,19 @@ from __future__ import annotations
 
 import math
 import pygame
-from typing import Optional, TYPE_CHECKING
+from typing import Iterable, Optional, TYPE_CHECKING
 
 from assistent_skripts.color_print import custom_print as cprint
 from assistent_skripts.color_print import ValidColors as VC
 
+from particles import ParticleRegister
+from render_queue import RenderLayer, RenderQueue
+from stat_modifiers import StatRegister
+
 if TYPE_CHECKING:
     from player_character import Player
+    from particles import ParticleSystem
+    from npc_character import NPCCharacter
 
 
 # -------------------------------
@@ -18,32 +24,29 @@ if TYPE_CHECKING:
 # -------------------------------
 
 class WeaponBehavior:
-    """Base class for defining weapon-specific behaviors."""
-    def __init__(self, weapon: Attachment):
-        self.weapon = weapon
+    """
+    Base class for defining weapon-specific behaviors.
+    Behaviors hold no state, one instance is shared by every weapon of a type.
+    """
 
-    def attack(self, projectiles: list):
+    def attack(self, weapon: Attachment, projectiles: list, particles: Optional[ParticleSystem] = None):
         raise NotImplementedError("Weapon behavior must implement 'attack'")
 
 
 class GunBehavior(WeaponBehavior):
     """Gun weapon shoots two projectiles in opposite directions."""
 
-    def __init__(self, weapon: Attachment):
-        self.weapon = weapon
-
-    def attack(self, projectiles: list):
-        base_pos = pygame.Vector2(self.weapon.pos)
-        angle = self.weapon.last_angle
+    def attack(self, weapon: Attachment, projectiles: list, particles: Optional[ParticleSystem] = None):
+        base_pos = pygame.Vector2(weapon.pos)
+        angle = weapon.last_angle
 
         offset_distance = 80
-        damage = self.weapon.weapon_type[WeaponRegister.DAMAGE]
+        damage = weapon.damage
 
-        # Linear movement of the weapon
-        linear_velocity = self.weapon.pos - self.weapon.previous_pos
+        # Linear and angular movement of the weapon since the last tick
+        linear_velocity, d_angle = weapon.player.mounts.motion(weapon)
 
         # Angular velocity (converted to radians)
-        d_angle = self.weapon.last_angle - self.weapon.previous_angle
         d_angle_rad = -math.radians(d_angle)
 
         # Fire two projectiles at ±90° from the current angle
@@ -58,8 +61,7 @@ class GunBehavior(WeaponBehavior):
 
             # Create projectile
             projectile = Projectile(
-                screen=self.weapon.screen,
-                origin=self.weapon.origin,
+                kind=weapon.kind,
                 pos=spawn_pos,
                 direction=direction,
                 damage=damage,
@@ -68,17 +70,19 @@ class GunBehavior(WeaponBehavior):
 
             projectiles.append(projectile)
 
+            if particles:
+                particles.emit(ParticleRegister.MUZZLE, spawn_pos, 12, math.atan2(direction.y, direction.x),
+                               spread=0.7, velocity=total_velocity)
+
 class SwordBehavior(WeaponBehavior):
-    def __init__(self, weapon: Attachment):
-        self.weapon = weapon
 
-    def attack(self, projectiles: list):
-        base_pos = pygame.Vector2(self.weapon.pos)
-        base_angle = self.weapon.last_angle
+    def attack(self, weapon: Attachment, projectiles: list, particles: Optional[ParticleSystem] = None):
+        base_pos = pygame.Vector2(weapon.pos)
+        base_angle = weapon.last_angle
 
         offset_distance = 80
         range_radius = 60
-        damage = self.weapon.weapon_type[WeaponRegister.DAMAGE]
+        damage = weapon.damage
 
         for offset in [-90, 90]:  # Two swings on opposite sides
             angle = base_angle + offset
@@ -86,8 +90,7 @@ class SwordBehavior(WeaponBehavior):
             slash_pos = base_pos + direction * offset_distance
 
             swing = SwordSwingProjectile(
-                screen=self.weapon.screen,
-                origin=self.weapon.origin,
+                kind=weapon.kind,
                 pos=slash_pos,
                 direction=direction,
                 damage=damage,
@@ -97,14 +100,39 @@ class SwordBehavior(WeaponBehavior):
 
             projectiles.append(swing)
 
+            if particles:
+                # Half circle arc facing away from the weapon
+                particles.emit(ParticleRegister.SWORD, slash_pos, 16, math.atan2(direction.y, direction.x),
+                               spread=math.pi)
+
+class MagicBehavior(WeaponBehavior):
+    """Magic weapon sets off a blast that damages every NPC in a large radius, less towards its edge."""
+    radius = 450
+
+    def attack(self, weapon: Attachment, projectiles: list, particles: Optional[ParticleSystem] = None):
+        blast = MagicBlast(
+            kind=weapon.kind,
+            pos=weapon.pos,
+            damage=weapon.damage,
+            radius=self.radius
+        )
+        projectiles.append(blast)
+
+        if particles:
+            particles.emit(ParticleRegister.MAGIC, blast.pos, 60)
+
+class PassiveBehavior(WeaponBehavior):
+    """Boost items do nothing when they fire, they only change the player's stats while attached."""
+
+    def attack(self, weapon: Attachment, projectiles: list, particles: Optional[ParticleSystem] = None):
+        pass
+
 class HealingBehavior(WeaponBehavior):
     """Healing weapon restores player health."""
-    def __init__(self, weapon: Attachment):
-        self.weapon = weapon
 
-    def attack(self, projectiles: list):
-        healing = self.weapon.weapon_type[WeaponRegister.DAMAGE]
-        self.weapon.player.change_health(healing, reduce=False)
+    def attack(self, weapon: Attachment, projectiles: list, particles: Optional[ParticleSystem] = None):
+        healing = weapon.damage
+        weapon.player.change_health(healing, reduce=False)
 
 
 # -------------------------------
@@ -120,28 +148,102 @@ class WeaponRegister:
     GUN = ("Gun", 100, 1)
     SWORD = ("Sword", 10, 1)
     HEALING = ("Healing", 200, 1)
+    MAGIC = ("Magic", 240, 8)
+
+    # Boost items
+    SPEED = ("Speed", 600, 0)
+    ARMOR = ("Armor", 600, 0)
 
     ATTACHED = "atachment"
     DETACHED = "card"
 
+    BEHAVIORS = {
+        GUN: GunBehavior(),
+        SWORD: SwordBehavior(),
+        HEALING: HealingBehavior(),
+        MAGIC: MagicBehavior(),
+        SPEED: PassiveBehavior(),
+        ARMOR: PassiveBehavior(),
+    }
+
+    # StatRegister modifiers an item applies to the player while attached
+    MODIFIERS = {
+        SPEED: ((StatRegister.MOVE_SPEED, 5, 1.0),),
+        ARMOR: ((StatRegister.ARMOR, 1, 1.0), (StatRegister.MOVE_SPEED, 0, 0.9)),
+    }
+
+# -------------------------------
+# Weapon Type (shared per register entry)
+# -------------------------------
+
+class WeaponType:
+    """
+    Everything weapons of one WeaponRegister entry have in common: stats,
+    textures and behavior. Loaded once per entry and screen, every Attachment
+    and projectile only keeps a reference to it.
+    """
+    __slots__ = ("weapon_type", "name", "cooldown", "damage", "behavior", "modifiers", "screen",
+                 "texture_attached", "texture_detached")
+
+    SIZE = 50
+
+    _types: dict[tuple, WeaponType] = {}
+
+    def __init__(self, weapon_type: tuple[str, int, int], screen: pygame.Surface):
+        if weapon_type not in WeaponRegister.BEHAVIORS:
+            raise ValueError(f"Unknown weapon type: {weapon_type}")
+
+        self.weapon_type = weapon_type
+        self.name: str = weapon_type[WeaponRegister.NAME]
+        self.cooldown: int = weapon_type[WeaponRegister.COOLDOWN]
+        self.damage: int = weapon_type[WeaponRegister.DAMAGE]
+        self.behavior: WeaponBehavior = WeaponRegister.BEHAVIORS[weapon_type]
+        self.modifiers: tuple = WeaponRegister.MODIFIERS.get(weapon_type, ())
+        self.screen = screen
+
+        self.texture_detached = self.load_texture(WeaponRegister.DETACHED)
+        self.texture_attached = self.load_texture(WeaponRegister.ATTACHED)
+
+    @classmethod
+    def get(cls, weapon_type: tuple[str, int, int], screen: pygame.Surface) -> WeaponType:
+        """The shared type of a WeaponRegister entry, loaded on first use."""
+        key = (weapon_type, screen)
+        kind = cls._types.get(key)
+        if kind is None:
+            kind = cls._types[key] = cls(weapon_type, screen)
+        return kind
+
+    def load_texture(self, state: str) -> pygame.Surface:
+        """Load and scale weapon texture based on type."""
+        path = f"textures/player/atachments/{self.name}_{state}.png"
+        try:
+            image = pygame.image.load(path).convert_alpha()
+            target_height = self.SIZE * 2
+            aspect_ratio = image.get_width() / image.get_height()
+            target_width = int(target_height * aspect_ratio)
+            return pygame.transform.scale(image, (target_width, int(target_height)))
+        except Exception as e:
+            cprint(f"[ERROR] Failed to load texture: {path}", VC.RED)
+            raise e
+
 # -------------------------------
 # Attachment Class
 # -------------------------------
 
 class Attachment:
     """Attachable weapon component for the player character."""
+    __slots__ = ("kind", "player", "pos", "last_angle",
+                 "attached", "attached_to", "dragging", "drag_offset", "cooldown")
 
-    def __init__(self, screen: pygame.Surface, player: Player, origin: tuple[float, float], pos: tuple[float, float], weapon_type: tuple[str, int]):
-        self.screen = screen
+    size = WeaponType.SIZE
+    pickup_range = size * 2
+
+    def __init__(self, screen: pygame.Surface, player: Player, pos: tuple[float, float], weapon_type: tuple[str, int, int]):
+        self.kind = WeaponType.get(weapon_type, screen)
         self.player = player
-        self.origin = origin
         self.pos = pygame.Vector2(pos)
-        self.previous_pos = pygame.Vector2(pos)
 
-        self.size = 50
-        self.pickup_range = self.size * 2
         self.last_angle = 0
-        self.previous_angle = self.last_angle 
 
         self.attached = False
         self.attached_to: Optional[int] = None
@@ -149,54 +251,51 @@ class Attachment:
         self.dragging = False
         self.drag_offset = pygame.Vector2(0, 0)
 
-        self.weapon_type = weapon_type
         self.cooldown = 0
-        self.cooldown_time = weapon_type[WeaponRegister.COOLDOWN]
-
-        self.texture_detached = self.load_texture(self.weapon_type[WeaponRegister.NAME], WeaponRegister.DETACHED)
-        self.texture_attached = self.load_texture(self.weapon_type[WeaponRegister.NAME], WeaponRegister.ATTACHED)
-
-        # Assign behavior based on weapon type
-        if weapon_type == WeaponRegister.GUN:
-            self.behavior = GunBehavior(self)
-        elif weapon_type == WeaponRegister.SWORD:
-            self.behavior = SwordBehavior(self)
-        elif weapon_type == WeaponRegister.HEALING:
-            self.behavior = HealingBehavior(self)
-        else:
-            raise ValueError(f"Unknown weapon type: {weapon_type}")
 
-    def attack(self, projectiles: list):
-        """Trigger the weapon's attack behavior."""
+    @property
+    def screen(self) -> pygame.Surface:
+        return self.kind.screen
+
+    @property
+    def damage(self) -> int:
+        """Damage of the weapon type with the damage multiplier of the player."""
+        return round(self.kind.damage * self.player.damage_multiplier)
+
+    @property
+    def weapon_type(self) -> tuple[str, int, int]:
+        return self.kind.weapon_type
+
+    @property
+    def cooldown_time(self) -> int:
+        return self.kind.cooldown
+
+    def is_idle(self) -> bool:
+        """Lying on the ground without being dragged, nothing to update."""
+        return not self.attached and not self.dragging
+
+    def attack(self, projectiles: list, particles: Optional[ParticleSystem] = None) -> bool:
+        """
+        Trigger the weapon's attack behavior, effects are spawned into ``particles`` if given.
+
+        Returns:
+            True if the weapon fired this tick.
+        """
         if self.cooldown > 0:
             self.cooldown -= 1
-            return
+            return False
 
         try:
-            self.behavior.attack(projectiles)
+            self.kind.behavior.attack(self, projectiles, particles)
         except Exception as e:
             print(f"[ERROR] Failed to attack: {e}")
 
-        self.cooldown = self.cooldown_time
-
-    def load_texture(self, weapon_type: str, state: str) -> pygame.Surface:
-        """Load and scale weapon texture based on type."""
-        path = f"textures/player/atachments/{weapon_type}_{state}.png"
-        try:
-            image = pygame.image.load(path).convert_alpha()
-            target_height = self.size * 2
-            aspect_ratio = image.get_width() / image.get_height()
-            target_width = int(target_height * aspect_ratio)
-            return pygame.transform.scale(image, (target_width, int(target_height)))
-        except Exception as e:
-            cprint(f"[ERROR] Failed to load texture: {path}", VC.RED)
-            raise e
+        self.cooldown = self.kind.cooldown
+        return True
 
     def handle_mouse_down(self, mouse_pos: tuple[float, float], origin: tuple[float, float], player: Player):
         """Start dragging the weapon if clicked within hit circle."""
-        self.origin = origin
         mouse_world = pygame.Vector2(mouse_pos) - pygame.Vector2(origin)
-
         if (self.pos - mouse_world).length() <= self.size:
             self.dragging = True
             self.drag_offset = self.pos - mouse_world
@@ -206,10 +305,10 @@ class Attachment:
                 if self.attached_to is not None and player.weapon_slots.get(self.attached_to) == self:
                     del player.weapon_slots[self.attached_to]
                 self.attached_to = None
+                player.refresh_stats()
 
     def handle_mouse_up(self, player: Player, origin: tuple[float, float]):
         """Stop dragging and try to attach to a node if nearby."""
-        self.origin = origin
         if not self.dragging:
             return
         self.dragging = False
@@ -229,34 +328,44 @@ class Attachment:
                 self.attached_to = idx
                 player.weapon_slots[idx] = self
                 self.pos = node_pos
+                player.refresh_stats()
                 cprint(f"Weapon snapped to node {idx}", VC.GREEN)
                 return
 
         cprint("Dropped weapon without snapping to a node", VC.YELLOW)
 
-    def draw(self, origin: tuple[float, float], angle: float = 0):
-        """Draw the weapon at its current position."""
-        screen_pos = self.pos + pygame.Vector2(origin)
+    def _image(self, angle: float, scale: float) -> pygame.Surface:
+        """The texture turned to ``angle`` and scaled by the surface's resolution factor."""
         self.last_angle = angle
 
         corrected_angle = angle + 90 if self.attached else angle
-        if self.attached:
-            rotated_image = pygame.transform.rotate(self.texture_attached, corrected_angle)
-        else:
-            rotated_image = pygame.transform.rotate(self.texture_detached, corrected_angle)
+        texture = self.kind.texture_attached if self.attached else self.kind.texture_detached
+        if scale != 1.0:
+            return pygame.transform.rotozoom(texture, corrected_angle, scale)
+        elif corrected_angle == 0:
+            return texture
+        return pygame.transform.rotate(texture, corrected_angle)
+
+    def draw(self, origin: tuple[float, float], angle: float = 0, scale: float = 1.0,
+             surface: Optional[pygame.Surface] = None):
+        """
+        Draw the weapon at its current position, scaled by the surface's resolution factor.
+        Draws on ``surface`` instead of the screen if given.
+        """
+        screen_pos = (self.pos + pygame.Vector2(origin)) * scale
+        rotated_image = self._image(angle, scale)
         rect = rotated_image.get_rect(center=screen_pos)
-        self.screen.blit(rotated_image, rect)
+        (surface or self.kind.screen).blit(rotated_image, rect)
+
+    def submit(self, queue: RenderQueue, angle: float = 0, scale: float = 1.0, layer: int = RenderLayer.WEAPONS):
+        """Submit the weapon at its current position to the render queue, like draw."""
+        queue.submit(layer, self._image(angle, scale), self.pos)
 
     def update(self, origin: tuple[float, float]):
-        """Update weapon position either by drag or attachment."""
-        self.origin = origin
-        if self.attached:
-            self.previous_pos = self.pos
-            self.previous_angle = getattr(self, "last_angle", 0)
-            self.pos = self.player.snake_pos[self.attached_to]
-        elif self.dragging:
+        """Update weapon position while dragged, mounted weapons are moved by the player's body."""
+        if self.dragging:
             mouse_screen = pygame.Vector2(pygame.mouse.get_pos())
-            mouse_world = mouse_screen - pygame.Vector2(self.origin)
+            mouse_world = mouse_screen - pygame.Vector2(origin)
             self.pos = mouse_world + self.drag_offset
 
 
@@ -266,21 +375,22 @@ class Attachment:
 
 class Projectile:
     """Simple projectile shot by weapons."""
+    __slots__ = ("kind", "pos", "velocity", "damage", "alive")
+
+    radius = 6
+
     def __init__(
         self,
-        screen: pygame.Surface,
-        origin: tuple[float, float],
+        kind: WeaponType,
         pos: pygame.Vector2,
         direction: pygame.Vector2,
         damage: int,
         inherited_velocity: pygame.Vector2 = pygame.Vector2(0, 0),
         speed: float = 15,
     ):
-        self.screen = screen
-        self.origin = origin
+        self.kind = kind
         self.pos = pygame.Vector2(pos)
         self.velocity = direction.normalize() * speed + inherited_velocity
-        self.radius = 6
         self.damage = damage
         self.alive = True
 
@@ -292,38 +402,91 @@ class Projectile:
         if not (-3000 < self.pos.x < 3000 and -3000 < self.pos.y < 3000):
             self.alive = False
 
-    def draw(self, origin: tuple[float, float]):
-        """Render the projectile."""
-        self.origin = origin
-        screen_pos = self.pos + pygame.Vector2(origin)
-        pygame.draw.circle(self.screen, (255, 200, 200), screen_pos, self.radius)
+    def submit(self, queue: RenderQueue, scale: float = 1.0):
+        """Submit the projectile to the render queue."""
+        Projectile.submit_all(queue, (self,), scale)
+
+    @classmethod
+    def submit_all(cls, queue: RenderQueue, projectiles: Iterable[Projectile], scale: float = 1.0):
+        """Submit many projectiles at once, they all share one stamp."""
+        circle = queue.circle((255, 200, 200), max(1, round(cls.radius * scale)))
+        queue.submit_many(RenderLayer.PROJECTILES, circle, (projectile.pos for projectile in projectiles))
 
 class SwordSwingProjectile:
+    __slots__ = ("kind", "pos", "direction", "damage", "range_radius", "lifespan", "hit_npcs", "alive")
+
     def __init__(
         self,
-        screen: pygame.Surface,
-        origin: tuple[float, float],
+        kind: WeaponType,
         pos: pygame.Vector2,
         direction: pygame.Vector2,
         damage: int,
         range_radius: float = 60,
         lifespan: int = 2
     ):
-        self.screen = screen
-        self.origin = origin
+        self.kind = kind
         self.pos = pygame.Vector2(pos)
         self.direction = direction.normalize()
         self.damage = damage
         self.range_radius = range_radius
         self.lifespan = lifespan
-        self.hit_npcs = set()
+        # NPCs already hit, created on the first hit
+        self.hit_npcs: Optional[set[NPCCharacter]] = None
         self.alive = True
 
+    def has_hit(self, npc: NPCCharacter) -> bool:
+        return self.hit_npcs is not None and npc in self.hit_npcs
+
+    def mark_hit(self, npc: NPCCharacter):
+        if self.hit_npcs is None:
+            self.hit_npcs = set()
+        self.hit_npcs.add(npc)
+
     def update(self):
         """Move the projectile forward."""
         pass
 
-    def draw(self, origin: tuple[float, float]):
-        self.origin = origin
-        # world_pos = self.pos + pygame.Vector2(self.origin)
-        # pygame.draw.circle(self.screen, (255, 255, 100), world_pos, self.range_radius, 2)
+    def submit(self, queue: RenderQueue, scale: float = 1.0):
+        """Swings are invisible, the weapon texture shows the attack."""
+        # ring = queue.circle((255, 255, 100), round(self.range_radius * scale), 2)
+        # queue.submit(RenderLayer.PROJECTILES, ring, self.pos)
+
+
+class MagicBlast:
+    """
+    Area damage of a magic weapon. It is resolved once, in the tick it is
+    set off, and stays alive for ``lifespan`` ticks to draw its shock wave.
+    """
+    __slots__ = ("kind", "pos", "damage", "radius", "lifespan", "age", "detonated", "alive")
+
+    # Share of the damage left at the edge of the radius
+    edge_damage = 0.25
+
+    def __init__(
+        self,
+        kind: WeaponType,
+        pos: pygame.Vector2,
+        damage: int,
+        radius: float,
+        lifespan: int = 20
+    ):
+        self.kind = kind
+        self.pos = pygame.Vector2(pos)
+        self.damage = damage
+        self.radius = radius
+        self.lifespan = lifespan
+        self.age = 0
+        self.detonated = False
+        self.alive = True
+
+    def update(self):
+        """Age the shock wave."""
+        self.age += 1
+        if self.age >= self.lifespan:
+            self.alive = False
+
+    def submit(self, queue: RenderQueue, scale: float = 1.0):
+        """Submit the shock wave as a ring growing to the blast radius."""
+        progress = (self.age + 1) / self.lifespan
+        ring = queue.circle((120, 220, 255), max(1, round(self.radius * progress * scale)), max(1, round(4 * scale)))
+        queue.submit(RenderLayer.PROJECTILES, ring, self.pos)
@@ -1,6 +1,7 @@
 """Structure of Player characters with movement and visual rendering."""
 
 import math
+import numpy as np
 import pygame
 from typing import Optional
 
@@ -8,6 +9,10 @@ from assistent_skripts.color_print import custom_print as cprint
 from assistent_skripts.color_print import ValidColors as VC
 
 from player_attachments import Attachment
+from render_queue import RenderLayer, RenderQueue
+from stat_modifiers import StatModifiers, StatRegister
+from snake_path import PathHistory, SnakeBody
+from weapon_mounts import MountTransforms
 
 # === Color Constants ===
 GREEN = (0, 255, 0)
@@ -16,8 +21,14 @@ BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 
 
+class BodyMode:
+    CHAIN = "chain"  # every segment is pulled toward the one before it
+    PATH = "path"    # segments are laid along the recorded head path
+
+
 class Player:
-    def __init__(self, screen: pygame.Surface, origin: tuple[float, float], spawn: tuple[float, float], max_HP: int) -> None:
+    def __init__(self, screen: pygame.Surface, origin: tuple[float, float], spawn: tuple[float, float], max_HP: int,
+                 body_mode: str = BodyMode.CHAIN) -> None:
         """
         Initializes the player snake with movement and rendering properties.
 
@@ -25,6 +36,7 @@ class Player:
             screen: The Pygame surface to draw on.
             origin: The local origin offset for positioning.
             spawn: The initial spawn position of the snake.
+            body_mode: One of BodyMode.CHAIN or BodyMode.PATH.
         """
         self.screen = screen
 
@@ -32,26 +44,43 @@ class Player:
         self.max_HP = max_HP
         self.HP = self.max_HP -5
 
-        # Movement properties
+        # Movement properties, move_speed is a stat (see refresh_stats)
         self.max_speed = 8
         self.acceleration = 1
         self.deceleration = 1
-        self.move_speed = 15
         self.target_pos = spawn
 
         # Geometry
         self.girthness = 60
         self.segment_length = self.girthness * 0.8
         self.origin = origin
+        self.scale = 1.0
         self.snake_pos: list[tuple[float, float]] = [
             spawn,
             (spawn[0], spawn[1] - self.segment_length)
         ]
 
+        # Path following (only used in BodyMode.PATH)
+        self.body_mode = body_mode
+        self.path: Optional[PathHistory] = None
+        if self.body_mode == BodyMode.PATH:
+            self.path = PathHistory(spawn, (0, -1), self.segment_length, len(self.snake_pos))
+            self.snake_pos = SnakeBody(self.path, len(self.snake_pos))
+
         # Atachments
         self.weapon_start_index = 2
         self.weapon_interval = 3
         self.weapon_slots: dict[int, Optional[Attachment]] = {}
+        self.mounts = MountTransforms(self)
+
+        # Stats changed by attachments and buffs. They are worked out when those
+        # change and set as attributes: move_speed, armor, damage_multiplier
+        self.stat_modifiers = StatModifiers({
+            StatRegister.MOVE_SPEED: 15,
+            StatRegister.ARMOR: 0,
+            StatRegister.DAMAGE: 1.0,
+        })
+        self.refresh_stats()
 
         # Cached values
         self.radius_outer = self.girthness / 2
@@ -99,7 +128,13 @@ class Player:
         """
         Updates positions of body segments to follow the segment before them.
         Also applies a sine-based wave effect based on segment movement speed.
+        The mounted weapons are moved with the body.
         """
+        if self.body_mode == BodyMode.PATH:
+            self.update_path_positions()
+            self.mounts.update()
+            return
+
         self.calc_move_pos()
 
         screen_rect = self.screen.get_rect().inflate(self.radius_head_outer, self.radius_head_outer)
@@ -160,9 +195,27 @@ class Player:
 
             self.snake_pos[i] = (current + wave_offset).xy
 
-    def change_health(self, amount: int, reduce: bool = True):
-        """Reduces the NPC's HP and handles death."""
+        self.mounts.update()
+
+    def update_path_positions(self) -> None:
+        """
+        Moves the head, which records it into the path history.
+        Each segment is a single lookup at ``i * segment_length`` behind the head,
+        so the body keeps its shape no matter the frame rate or length.
+        """
+        self.calc_move_pos()
+        self.time += 0.1
+
+    def change_health(self, amount: int, reduce: bool = True) -> int:
+        """
+        Reduces the player's HP, less by their armor, and handles death.
+        Armor takes its points off every hit, but a hit always does at least 1 damage.
+
+        Returns:
+            The damage after armor, or the amount healed.
+        """
         if reduce:
+            amount = max(min(amount, 1), amount - round(self.armor))
             self.HP -= amount
 
             if self.HP <= 0:
@@ -173,6 +226,30 @@ class Player:
 
             if self.HP >= self.max_HP:
                 self.HP = self.max_HP
+        return amount
+
+    # ──────────────────────────────────────────────────────────────
+    # Stats
+    # ──────────────────────────────────────────────────────────────
+
+    def refresh_stats(self) -> None:
+        """
+        Works out the stats from the base values, the attached items and the
+        running buffs. Call whenever an attachment is attached or detached.
+        """
+        modifiers = (modifier for weapon in self.weapon_slots.values() if weapon for modifier in weapon.kind.modifiers)
+        for stat, value in self.stat_modifiers.compute(modifiers).items():
+            setattr(self, stat, value)
+
+    def add_buff(self, modifiers: tuple, ticks: int) -> None:
+        """Applies StatRegister modifiers for ``ticks`` ticks."""
+        self.stat_modifiers.add_buff(modifiers, ticks)
+        self.refresh_stats()
+
+    def update_buffs(self) -> None:
+        """Counts down the buffs, call once per tick."""
+        if self.stat_modifiers.tick():
+            self.refresh_stats()
 
     # ──────────────────────────────────────────────────────────────
     # Snake Structure
@@ -182,6 +259,10 @@ class Player:
         """
         Appends a new body segment at the end of the snake.
         """
+        if self.body_mode == BodyMode.PATH:
+            self.snake_pos.append()
+            return
+
         tail = pygame.Vector2(self.snake_pos[-1])
         before_tail = pygame.Vector2(self.snake_pos[-2])
         direction = (tail - before_tail).normalize()
@@ -192,30 +273,29 @@ class Player:
     # Rendering Helpers
     # ──────────────────────────────────────────────────────────────
 
-    def bezier_curve(self, start_point, end_point, control_point, resolution: int) -> list:
+    @staticmethod
+    def bezier_curves(start_points: np.ndarray, end_points: np.ndarray, control_points: np.ndarray,
+                      resolution: int) -> np.ndarray:
         """
-        Generates a quadratic Bezier curve through three points.
+        Generates quadratic Bezier curves through three points each, one row of points per curve.
 
         Args:
-            start_point: The first anchor point.
-            end_point: The second anchor point.
-            control_point: The midpoint control point.
+            start_points: The first anchor points, shape (curves, 2).
+            end_points: The second anchor points.
+            control_points: The midpoint control points.
             resolution: Number of interpolated points.
 
         Returns:
-            List of curve points.
+            Array of shape (curves, resolution + 1, 2).
         """
-        points = []
-        for i in range(resolution + 1):
-            t = i / resolution
-            x = (1 - t) ** 2 * start_point[0] + 2 * (1 - t) * t * control_point[0] + t ** 2 * end_point[0]
-            y = (1 - t) ** 2 * start_point[1] + 2 * (1 - t) * t * control_point[1] + t ** 2 * end_point[1]
-            points.append((x, y))
-        return points
-
-    def player_eyes(self) -> None:
+        t = np.linspace(0.0, 1.0, resolution + 1)[:, None]
+        return (((1 - t) ** 2) * start_points[:, None]
+                + (2 * (1 - t) * t) * control_points[:, None]
+                + (t ** 2) * end_points[:, None])
+
+    def player_eyes(self, queue: RenderQueue) -> None:
         """
-        Draws two forward-facing eyes on the snake's head using direction vector.
+        Submits two forward-facing eyes on the snake's head using direction vector.
         """
         head = self.snake_pos[0]
         neck = self.snake_pos[1]
@@ -228,21 +308,21 @@ class Player:
         perp = pygame.Vector2(-dir_norm.y, dir_norm.x)
 
         forward_offset = self.girthness * 0.2
-        head_screen = pygame.Vector2(self.origin) + pygame.Vector2(head) + dir_norm * forward_offset
+        eye_center = pygame.Vector2(head) + dir_norm * forward_offset
 
-        left_eye_pos = head_screen + perp * self.eye_distance
-        right_eye_pos = head_screen - perp * self.eye_distance
+        left_eye_pos = eye_center + perp * self.eye_distance
+        right_eye_pos = eye_center - perp * self.eye_distance
 
-        pygame.draw.circle(self.screen, WHITE, left_eye_pos, self.radius_eye)
-        pygame.draw.circle(self.screen, WHITE, right_eye_pos, self.radius_eye)
+        eye = queue.circle(WHITE, max(1, round(self.radius_eye * self.scale)))
+        queue.submit_many(RenderLayer.EYES, eye, (left_eye_pos, right_eye_pos))
 
         pupil_offset = dir_norm * (self.girthness * 0.1)
-        pygame.draw.circle(self.screen, BLACK, left_eye_pos + pupil_offset, self.radius_pupil)
-        pygame.draw.circle(self.screen, BLACK, right_eye_pos + pupil_offset, self.radius_pupil)
+        pupil = queue.circle(BLACK, max(1, round(self.radius_pupil * self.scale)))
+        queue.submit_many(RenderLayer.PUPILS, pupil, (left_eye_pos + pupil_offset, right_eye_pos + pupil_offset))
 
-    def draw_tongue(self):
+    def draw_tongue(self, queue: RenderQueue):
         """
-        Draw a wiggly tongue sticking out from the snake's head.
+        Submits a wiggly tongue sticking out from the snake's head.
         """
         head = pygame.Vector2(self.snake_pos[0])
         neck = pygame.Vector2(self.snake_pos[1])
@@ -253,26 +333,25 @@ class Player:
 
         dir_norm = direction.normalize()
         perp = pygame.Vector2(-dir_norm.y, dir_norm.x)
-        screen_head = head + pygame.Vector2(self.origin)
 
         tongue_length = self.girthness * 0.8
-        tongue_thickness = 6
+        tongue_thickness = max(1, round(6 * self.scale))
 
         # Wiggle using sine wave
         wiggle = perp * math.sin(self.time * 2) * 5
-        tip_pos = screen_head + dir_norm * tongue_length + wiggle
+        tongue = dir_norm * tongue_length + wiggle
 
-        pygame.draw.line(
-            self.screen,
+        line = queue.line(
             (255, 100, 100),  # Pinkish tongue color
-            screen_head,
-            tip_pos,
-            tongue_thickness
+            round(tongue.length() * self.scale),
+            tongue_thickness,
+            tongue.angle_to(pygame.Vector2(1, 0))
         )
+        queue.submit(RenderLayer.TONGUE, line, head + tongue * 0.5)
 
-    def draw_attachment_nodes(self, dragging_weapon: Optional[Attachment] = None) -> None:
+    def draw_attachment_nodes(self, queue: RenderQueue, dragging_weapon: Optional[Attachment] = None) -> None:
         """
-        Draws visual markers for possible weapon attachment nodes.
+        Submits visual markers for possible weapon attachment nodes.
         Highlights the closest one if dragging a weapon.
         """
 
@@ -287,84 +366,70 @@ class Player:
                     min_distance = dist
                     closest_idx = idx
 
+        # Highlight closest node in yellow, the other available nodes in cyan
+        highlight = queue.circle((255, 255, 0), max(1, round(10 * self.scale)))
+        node = queue.circle((0, 255, 255), max(1, round(5 * self.scale)))
         for idx in range(self.weapon_start_index, len(self.snake_pos)-2, self.weapon_interval):
             if idx in self.weapon_slots:
                 continue
-            segment_pos = pygame.Vector2(self.snake_pos[idx])
-            screen_pos = pygame.Vector2(self.origin) + segment_pos
-
             if idx == closest_idx and dragging_weapon:
-                # Highlight closest node in yellow
-                pygame.draw.circle(self.screen, (255, 255, 0), screen_pos, 10)
+                queue.submit(RenderLayer.NODES, highlight, self.snake_pos[idx])
             else:
-                # Normal available node in cyan
-                pygame.draw.circle(self.screen, (0, 255, 255), screen_pos, 5)
+                queue.submit(RenderLayer.NODES, node, self.snake_pos[idx])
 
     # ──────────────────────────────────────────────────────────────
     # Drawing & Rendering
     # ──────────────────────────────────────────────────────────────
 
-    def draw(self) -> None:
+    def draw(self, queue: RenderQueue) -> None:
         """
-        Renders the snake using Bezier curves and overlapping colored circles.
+        Submits the snake as Bezier curves of overlapping colored circles.
         """
-        body_to_draw = []
+        # All segments at once, a path body is read in one pass instead of a lookup per segment
+        if isinstance(self.snake_pos, SnakeBody):
+            body = self.snake_pos.array()
+        else:
+            body = np.array(self.snake_pos, dtype=float).reshape(-1, 2)
 
         screen_rect = self.screen.get_rect().inflate(self.radius_head_outer, self.radius_head_outer)
+        screen = body[1:-1] + self.origin
+        visible = ((screen[:, 0] >= screen_rect.left) & (screen[:, 0] < screen_rect.right)
+                   & (screen[:, 1] >= screen_rect.top) & (screen[:, 1] < screen_rect.bottom))
+        # Tail first, so the segments nearer the head are drawn over it
+        idx = np.flatnonzero(visible)[::-1] + 1
+
+        control = body[idx]
+        curves = self.bezier_curves((body[idx - 1] + control) / 2, (body[idx + 1] + control) / 2, control, 5)
+        body_to_draw = curves.reshape(-1, 2).tolist()
+
+        # The queue moves all points to screen coordinates
+        scale = self.scale
+        head = self.snake_pos[0]
 
-        for i in reversed(range(1, len(self.snake_pos) - 1)):
-            segment_screen = pygame.Vector2(self.origin) + pygame.Vector2(self.snake_pos[i])
-            if not screen_rect.collidepoint(segment_screen):
-                continue
-
-            body_coords = self.snake_pos[i]
-
-            prev_body_coords = (
-                (self.snake_pos[i - 1][0] + body_coords[0]) / 2,
-                (self.snake_pos[i - 1][1] + body_coords[1]) / 2
-            )
-            next_body_coords = (
-                (self.snake_pos[i + 1][0] + body_coords[0]) / 2,
-                (self.snake_pos[i + 1][1] + body_coords[1]) / 2
-            )
-            body_to_draw.extend(self.bezier_curve(prev_body_coords, next_body_coords, body_coords, 5))
-
-        # Offset all points to screen coordinates
-        screen_points = [(self.origin[0] + p[0], self.origin[1] + p[1]) for p in body_to_draw]
-
-        for p in screen_points:
-            pygame.draw.circle(self.screen, BLACK, p, self.radius_outer)
-        pygame.draw.circle(self.screen, BLACK, pygame.Vector2(self.origin) + pygame.Vector2(self.snake_pos[0]), self.radius_head_outer)
+        queue.submit_many(RenderLayer.BODY_OUTLINE, queue.circle(BLACK, max(1, round(self.radius_outer * scale))),
+                          body_to_draw)
+        queue.submit(RenderLayer.BODY_OUTLINE, queue.circle(BLACK, max(1, round(self.radius_head_outer * scale))), head)
 
-        self.draw_tongue()
+        self.draw_tongue(queue)
 
-        for p in screen_points:
-            pygame.draw.circle(self.screen, GREEN, p, self.radius_inner)
-        pygame.draw.circle(self.screen, LIGHT_GREEN, pygame.Vector2(self.origin) + pygame.Vector2(self.snake_pos[0]), self.radius_head_inner)
+        queue.submit_many(RenderLayer.BODY, queue.circle(GREEN, max(1, round(self.radius_inner * scale))), body_to_draw)
+        queue.submit(RenderLayer.BODY, queue.circle(LIGHT_GREEN, max(1, round(self.radius_head_inner * scale))), head)
 
-        self.player_eyes()
+        self.player_eyes(queue)
 
-    def render(self, origin: tuple[float, float]) -> None:
+    def render(self, queue: RenderQueue, origin: tuple[float, float], scale: float = 1.0) -> None:
         """
-        Public method to update the snake's origin and draw it to the screen.
+        Public method to update the snake's origin and submit it to the render queue.
+
+        Args:
+            queue: Render queue of the frame.
+            origin: The camera offset in window units.
+            scale: Resolution factor of the surface that is drawn on.
         """
         self.origin = origin
-        self.draw()
-        for idx, weapon in self.weapon_slots.items():
+        self.scale = scale
+        self.draw(queue)
+        # Positions and angles were set by the last update_body_positions
+        for weapon in self.weapon_slots.values():
             if weapon:
-                if 0 < idx < len(self.snake_pos) - 1:
-                    prev = pygame.Vector2(self.snake_pos[idx - 1])
-                    next_ = pygame.Vector2(self.snake_pos[idx + 1])
-                    direction = next_ - prev
-                    angle = direction.angle_to(pygame.Vector2(1, 0))
-                elif idx > 0:
-                    # Fallback: use previous segment if at end
-                    current = pygame.Vector2(self.snake_pos[idx])
-                    prev = pygame.Vector2(self.snake_pos[idx - 1])
-                    direction = current - prev
-                    angle = direction.angle_to(pygame.Vector2(1, 0))
-                else:
-                    angle = 0  # Segment 0 fallback
-
-                weapon.update(self.origin)
-                weapon.draw(self.origin, angle)
+                weapon.submit(queue, weapon.last_angle, scale, RenderLayer.MOUNTED)
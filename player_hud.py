@@ -1,18 +1,24 @@
 """hud for displaying player information"""
 
 import pygame
+from typing import Optional
 
 from assistent_skripts.color_print import custom_print as cprint
 from assistent_skripts.color_print import ValidColors as VC
 
 from player_character import Player
+from hub import HUB
+from minimap import Minimap
 
 
 class HUDRegister():
     OPTIONS = "options"
 
+    # transparent opening of the map frame (x, y, width, height) relative to its size
+    MAP_OPENING = (0.17, 0.14, 0.70, 0.71)
+
 class PlayerHUD():
-    def __init__(self, screen, player_snake: Player) -> None:
+    def __init__(self, screen, player_snake: Player, hub: Optional[HUB] = None, minimap_refresh: int = 3) -> None:
         self.screen: pygame.Surface = screen
         self.size = self.screen.get_size()
         self.player_snake = player_snake
@@ -24,12 +30,13 @@ class PlayerHUD():
 
         # player
         self.max_health = self.player_snake.max_HP
+        # Armor points the bar shows full
         self.max_armor = 10
         self.max_mana = 100
         self.max_length = 50
 
         self.health: int = self.player_snake.HP
-        self.armor: int = 10
+        self.armor: int = round(self.player_snake.armor)
         self.mana: int = 100
         self.length: int = len(self.player_snake.snake_pos)
 
@@ -42,6 +49,15 @@ class PlayerHUD():
         map_size = self.map_img.get_size()
         self.map_pos = (self.size[0] * 0.99 - map_size[0], self.size[1] * 0.01)
 
+        self.minimap: Optional[Minimap] = None
+        if hub is not None:
+            opening = HUDRegister.MAP_OPENING
+            self.minimap_pos = (self.map_pos[0] + map_size[0] * opening[0], self.map_pos[1] + map_size[1] * opening[1])
+            minimap_size = (int(map_size[0] * opening[2]), int(map_size[1] * opening[3]))
+            hub_rect = pygame.Rect(hub.pos, hub.hub_image.get_size())
+            world_rect = hub_rect.union(pygame.Rect(-1500, -1500, 3000, 3000))
+            self.minimap = Minimap(hub, minimap_size, world_rect, refresh_frames=minimap_refresh)
+
         # items
         self.item_list: list = []
         self.items_img = self.load_image("textures/player/hud/defult.jpeg", self.size[1] * 0.1)
@@ -120,8 +136,20 @@ class PlayerHUD():
         # ─ Length bar ─
         self.draw_bar(self.length, self.max_length, bar_x, y_offset, base_bar_width, base_bar_height, (0, 255, 0), 5)
 
+    def map_markers(self, npcs: list, weapons: list) -> Optional[tuple[list, list, float]]:
+        """picks the NPCs and weapons the minimap marks, None when it is not redrawn this frame"""
+        if self.minimap:
+            return self.minimap.markers(npcs, weapons)
+        return None
+
+    def update_map(self, markers: Optional[tuple[list, list, float]]) -> None:
+        """refreshes the minimap markers from the picked NPCs and weapons"""
+        if self.minimap:
+            self.minimap.update(self.player_snake, markers)
+
     def update(self) -> None:
         self.health = self.player_snake.HP
+        self.armor = round(self.player_snake.armor)
         self.length = len(self.player_snake.snake_pos)
 
     def render(self) -> None:
@@ -129,5 +157,7 @@ class PlayerHUD():
         self.size = self.screen.get_size()
         self.screen.blit(self.burger_img, self.burger_pos)
         self.player()
+        if self.minimap:
+            self.minimap.render(self.screen, self.minimap_pos)
         self.screen.blit(self.map_img, self.map_pos)
         self.screen.blit(self.items_img, self.items_pos)
@@ -0,0 +1,168 @@
+"""Queue the world's sprites are submitted to and drawn from with one blits call per layer."""
+
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+import pygame
+
+
+class RenderLayer:
+    """Layers in drawing order, a layer is drawn over the ones before it."""
+    BODY_OUTLINE = 0
+    TONGUE = 1
+    BODY = 2
+    EYES = 3
+    PUPILS = 4
+    MOUNTED = 5      # Weapons on the snake
+    NODES = 6        # Free attachment nodes while a weapon is dragged
+    WEAPONS = 7      # Loose and dragged weapons
+    PROJECTILES = 8
+    NPCS = 9
+    HEALTH_BARS = 10
+    COUNT = 11
+
+
+class RenderRegister:
+    # Stamps kept before the cache is emptied, e.g. after the render scale changed a lot
+    STAMP_LIMIT = 1024
+    # Degrees the angle of a line stamp is rounded to
+    LINE_ANGLE_STEP = 3
+    # Transparent color of the stamps, nothing in the world is drawn in it
+    COLORKEY = (255, 0, 255)
+
+
+class RenderQueue:
+    def __init__(self, surface: pygame.Surface) -> None:
+        """
+        Collects what the world entities draw in a frame and draws it on
+        ``surface`` in one go. An entity submits an image, its world
+        position and a layer. flush() moves all positions of a layer by the
+        camera origin and render scale at once and draws the layer with a
+        single Surface.blits call, so a frame makes one draw call per used
+        layer, however many entities there are.
+
+        Circles, rings, lines and bars are stamps: surfaces drawn once per
+        color and size, cached, and then blitted like any other image.
+
+        Args:
+            surface: Surface the world is drawn on.
+        """
+        self.surface = surface
+        # Per layer: (image, world x, world y, screen offset x, screen offset y)
+        self.layers: list[list[tuple]] = [[] for _ in range(RenderLayer.COUNT)]
+        self.stamps: dict[tuple, pygame.Surface] = {}
+
+        # Counters of the last flush
+        self.entries = 0
+        self.blit_calls = 0
+        self.last_ms = 0.0
+
+    # ──────────────────────────────────────────────────────────────
+    # Submitting
+    # ──────────────────────────────────────────────────────────────
+
+    def submit(self, layer: int, image: pygame.Surface, pos, offset: Optional[tuple[float, float]] = None) -> None:
+        """
+        Queues ``image`` at world position ``pos``. Without ``offset`` the image
+        is centered on it, else its top left corner is ``offset`` screen pixels away.
+        """
+        if offset is None:
+            width, height = image.get_size()
+            self.layers[layer].append((image, pos[0], pos[1], -(width // 2), -(height // 2)))
+        else:
+            # flush() rounds, a corner is cut off like a blit at a float position
+            self.layers[layer].append((image, pos[0], pos[1], offset[0] - 0.5, offset[1] - 0.5))
+
+    def submit_many(self, layer: int, image: pygame.Surface, positions: Iterable) -> None:
+        """Queues ``image`` centered on each of the world ``positions``."""
+        width, height = image.get_size()
+        dx, dy = -(width // 2), -(height // 2)
+        self.layers[layer].extend((image, x, y, dx, dy) for x, y in positions)
+
+    def flush(self, origin: tuple[float, float], scale: float = 1.0) -> None:
+        """
+        Draws the queued images layer by layer and empties the queue.
+
+        Args:
+            origin: The camera offset in window units.
+            scale: Resolution factor of the surface that is drawn on.
+        """
+        start = time.perf_counter()
+        entries = calls = 0
+        for layer in self.layers:
+            if not layer:
+                continue
+            images, xs, ys, dxs, dys = zip(*layer)
+            world = np.array((xs, ys), dtype=float)
+            world += np.reshape(origin, (2, 1))
+            world *= scale
+            world += np.array((dxs, dys), dtype=float)
+            # Rounded like a Rect centered on a float position
+            corners = np.floor(world + 0.5).astype(np.intp).T.tolist()
+            self.surface.blits(zip(images, corners), doreturn=False)
+            entries += len(layer)
+            calls += 1
+            layer.clear()
+        self.entries = entries
+        self.blit_calls = calls
+        self.last_ms = (time.perf_counter() - start) * 1000
+
+    # ──────────────────────────────────────────────────────────────
+    # Stamps
+    # ──────────────────────────────────────────────────────────────
+
+    def stamp(self, key: tuple) -> Optional[pygame.Surface]:
+        """The cached stamp for ``key``, None if it still has to be drawn and stored."""
+        return self.stamps.get(key)
+
+    @staticmethod
+    def new_stamp(size: tuple[int, int]) -> pygame.Surface:
+        """Empty surface to draw a stamp on, store() makes its background transparent."""
+        stamp = pygame.Surface((max(1, size[0]), max(1, size[1])))
+        stamp.fill(RenderRegister.COLORKEY)
+        return stamp
+
+    def store(self, key: tuple, stamp: pygame.Surface) -> pygame.Surface:
+        """Caches a drawn stamp under ``key`` and returns it."""
+        if len(self.stamps) >= RenderRegister.STAMP_LIMIT:
+            self.stamps.clear()
+        stamp.set_colorkey(RenderRegister.COLORKEY, pygame.RLEACCEL)
+        self.stamps[key] = stamp
+        return stamp
+
+    def circle(self, color: tuple[int, int, int], radius: int, width: int = 0) -> pygame.Surface:
+        """A filled circle, or a ring ``width`` pixels wide, of ``radius`` pixels."""
+        key = ("circle", color, radius, width)
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            stamp = self.new_stamp((radius * 2, radius * 2))
+            pygame.draw.circle(stamp, color, (radius, radius), radius, width)
+            stamp = self.store(key, stamp)
+        return stamp
+
+    def line(self, color: tuple[int, int, int], length: int, thickness: int, angle: float) -> pygame.Surface:
+        """
+        A line ``length`` pixels long pointing ``angle`` degrees counterclockwise
+        from the x axis, centered on the stamp. The angle is rounded to
+        RenderRegister.LINE_ANGLE_STEP.
+        """
+        step = RenderRegister.LINE_ANGLE_STEP
+        angle = round(angle / step) * step % 360
+        key = ("line", color, length, thickness, angle)
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            stamp = pygame.Surface((max(1, length), max(1, thickness)))
+            stamp.fill(color)
+            stamp.set_colorkey(RenderRegister.COLORKEY)
+            stamp = self.store(key, pygame.transform.rotate(stamp, angle))
+        return stamp
+
+    def stats(self) -> dict:
+        """Entries and blits calls of the last flush, cached stamps and the time the flush took."""
+        return {
+            "entries": self.entries,
+            "blit_calls": self.blit_calls,
+            "stamps": len(self.stamps),
+            "last_ms": self.last_ms,
+        }
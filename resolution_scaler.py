@@ -0,0 +1,88 @@
+"""Internal render surface whose resolution follows the measured frame time."""
+
+import pygame
+
+
+class ResolutionScaler:
+    def __init__(self, window: pygame.Surface, min_scale: float = 0.5, max_scale: float = 1.0,
+                 target_frame_ms: float = 14.0, step: float = 0.05, settle_frames: int = 30) -> None:
+        """
+        The world is drawn into the top left part of ``surface`` at ``scale``
+        times the window resolution and then stretched over the window.
+
+        World positions stay in window units, drawing code multiplies the
+        screen position and sizes by ``scale``. Because the result is
+        stretched back by ``1 / scale``, mouse positions on the window map
+        to the world exactly as without scaling.
+
+        Args:
+            window: The display surface the world is presented on.
+            min_scale: Lowest allowed resolution factor.
+            max_scale: Highest allowed resolution factor (at most 1).
+            target_frame_ms: Work time per frame the scaler tries to stay under.
+            step: How much the factor changes at once.
+            settle_frames: Frames to wait after a change before judging again.
+        """
+        self.window = window
+        self.max_scale = min(max_scale, 1.0)
+        self.min_scale = min(min_scale, self.max_scale)
+        self.target_frame_ms = target_frame_ms
+        self.step = step
+        self.settle_frames = settle_frames
+
+        # The backing surface has the window size, so culling in window
+        # units stays correct. Only the part for the current scale is used.
+        self.surface = pygame.Surface(self.window.get_size()).convert()
+        self.scale = self.max_scale
+        self.view_rect = self._view_rect()
+
+        self.average_ms = 0.0
+        self.smoothing = 0.1
+        self._frames_since_change = 0
+
+    def _view_rect(self) -> pygame.Rect:
+        width, height = self.window.get_size()
+        return pygame.Rect(0, 0, max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+
+    def clear(self, color: tuple[int, int, int] = (0, 0, 0)) -> None:
+        """Clears the part of the internal surface used at the current scale."""
+        self.surface.fill(color, self.view_rect)
+
+    def present(self) -> None:
+        """Stretches the rendered world over the whole window."""
+        if self.view_rect.size == self.window.get_size():
+            self.window.blit(self.surface, (0, 0))
+            return
+        view = self.surface.subsurface(self.view_rect)
+        pygame.transform.scale(view, self.window.get_size(), self.window)
+
+    def adapt(self, frame_ms: float) -> bool:
+        """
+        Feeds the work time of the last frame and adjusts the scale.
+
+        Returns:
+            True if the scale changed.
+        """
+        if self.average_ms == 0.0:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+
+        self._frames_since_change += 1
+        if self._frames_since_change < self.settle_frames:
+            return False
+
+        new_scale = self.scale
+        if self.average_ms > self.target_frame_ms:
+            new_scale = max(self.min_scale, self.scale - self.step)
+        elif self.average_ms < self.target_frame_ms * 0.7:
+            new_scale = min(self.max_scale, self.scale + self.step)
+
+        new_scale = round(new_scale, 2)
+        if new_scale == self.scale:
+            return False
+
+        self.scale = new_scale
+        self.view_rect = self._view_rect()
+        self._frames_since_change = 0
+        return True
@@ -0,0 +1,287 @@
+"""Sampling profiler for windows of frames, saved as collapsed stacks for flamegraph tools."""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+
+class ProfileRegister:
+    MANUAL = "manual"  # Started by the hotkey or the config
+    HITCH = "hitch"    # Started by a slow frame
+
+    # Threads besides the main one that are sampled, by name prefix
+    THREAD_PREFIXES = ("simulation",)
+    # Samples between two looks at which threads exist
+    THREAD_REFRESH = 200
+
+
+class _Capture:
+    """Samples of a run of frames that is written to one file when complete."""
+    __slots__ = ("reason", "first_frame", "last_frame", "remaining", "stacks", "samples", "slowest_ms")
+
+    def __init__(self, reason: str, first_frame: int, remaining: int) -> None:
+        self.reason = reason
+        self.first_frame = first_frame
+        self.last_frame = first_frame - 1
+        self.remaining = remaining
+        self.stacks: dict[tuple[str, ...], int] = {}
+        self.samples = 0
+        self.slowest_ms = 0.0
+
+    def add(self, frame: int, stacks: dict[tuple[str, ...], int], frame_ms: float) -> None:
+        for stack, count in stacks.items():
+            self.stacks[stack] = self.stacks.get(stack, 0) + count
+            self.samples += count
+        self.last_frame = frame
+        self.slowest_ms = max(self.slowest_ms, frame_ms)
+
+
+class SamplingProfiler:
+    def __init__(self, directory: str = "profiles", tag: str = "game", window_frames: int = 300,
+                 hitch_ms: float = 0.0, hitch_before: int = 30, hitch_after: int = 30,
+                 interval_ms: float = 1.0) -> None:
+        """
+        Records which Python functions the game spends its frames in. A
+        thread looks at the stacks of the game threads every ``interval_ms``
+        and counts each stack for the running frame. Nothing is traced, so a
+        frame pays only for the samples, and nothing runs while no capture
+        can happen.
+
+        Captures are written to ``directory`` as collapsed stacks (one
+        "root;caller;function count" line per stack), the input of
+        flamegraph.pl, speedscope and similar tools. The files are named
+        <tag>_<reason>_frames_<first>-<last>.folded.
+
+        A manual capture covers the next ``window_frames`` frames, or up to
+        stop(). With ``hitch_ms`` set, the last frames are kept all the time
+        and a frame slower than it saves the ``hitch_before`` frames up to it
+        and the ``hitch_after`` frames after it.
+
+        Args:
+            directory: Folder the captures are written to, created on the first capture.
+            tag: Scenario the captures belong to, e.g. the level.
+            window_frames: Frames of a manual capture.
+            hitch_ms: Frame time that triggers a capture, 0 turns the trigger off.
+            hitch_before: Frames up to and including a slow frame that are saved with it.
+            hitch_after: Frames after a slow frame that are saved with it.
+            interval_ms: Milliseconds between two samples. While sampling, the interpreter's switch
+                interval is lowered to it, so a sample does not wait long for the GIL.
+        """
+        self.directory = directory
+        self.tag = tag
+        self.window_frames = max(1, window_frames)
+        self.hitch_ms = hitch_ms
+        self.hitch_before = max(1, hitch_before)
+        self.hitch_after = hitch_after
+        self.interval = interval_ms / 1000
+
+        self.frame = 0
+        self.manual: Optional[_Capture] = None
+        self.hitch: Optional[_Capture] = None
+        # Stacks of the last frames, for hitches: (frame, stacks, frame_ms)
+        self.history: deque[tuple[int, dict, float]] = deque(maxlen=self.hitch_before - 1)
+        # Samples of the running frame, swapped for a new dict when the frame ends
+        self._stacks: dict[tuple[str, ...], int] = {}
+
+        self._labels: dict = {}
+        self._threads: dict[int, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._switch_interval = sys.getswitchinterval()
+
+        # Counters
+        self.samples = 0
+        self.sample_s = 0.0
+        self.saved: list[str] = []
+        self._update_sampling()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def armed(self) -> bool:
+        """Whether slow frames start captures."""
+        return self.hitch_ms > 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Sampling
+    # ──────────────────────────────────────────────────────────────
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+        return label
+
+    def _refresh_threads(self) -> None:
+        main = threading.main_thread()
+        self._threads = {
+            thread.ident: thread.name for thread in threading.enumerate()
+            if thread.ident is not None and (thread is main or thread.name.startswith(ProfileRegister.THREAD_PREFIXES))
+        }
+
+    def _sample(self) -> None:
+        """Counts the stack of every game thread once for the running frame."""
+        start = time.perf_counter()
+        frames = sys._current_frames()
+        stacks = self._stacks
+        label = self._label
+        for ident, name in self._threads.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(label(frame.f_code))
+                frame = frame.f_back
+            stack.append(name)
+            key = tuple(reversed(stack))
+            stacks[key] = stacks.get(key, 0) + 1
+        self.samples += 1
+        self.sample_s += time.perf_counter() - start
+
+    def _run(self) -> None:
+        count = 0
+        while not self._stop.wait(self.interval):
+            if count % ProfileRegister.THREAD_REFRESH == 0:
+                self._refresh_threads()
+            count += 1
+            self._sample()
+
+    def _start_sampling(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._refresh_threads()
+        # A busy thread only hands over the GIL every switch interval. With the default 5 ms most
+        # samples would wait for a call that releases the GIL (a blit, the flip) and land there
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def _stop_sampling(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+
+    def _update_sampling(self) -> None:
+        """Samples while a capture is open or slow frames can start one."""
+        if self.manual or self.hitch or self.armed:
+            self._start_sampling()
+        else:
+            self._stop_sampling()
+
+    # ──────────────────────────────────────────────────────────────
+    # Captures
+    # ──────────────────────────────────────────────────────────────
+
+    def start(self, frames: Optional[int] = None) -> None:
+        """Starts a manual capture of the next ``frames`` frames, window_frames if None."""
+        if self.manual:
+            return
+        self.manual = _Capture(ProfileRegister.MANUAL, self.frame + 1, frames or self.window_frames)
+        # Samples taken before now belong to no capture
+        self._stacks = {}
+        self._update_sampling()
+        cprint(f"Profiling the next {self.manual.remaining} frames", VC.MAGENTA)
+
+    def stop(self) -> None:
+        """Ends the manual capture early and saves what it has."""
+        if not self.manual:
+            return
+        self._save(self.manual)
+        self.manual = None
+        self._update_sampling()
+
+    def toggle(self) -> None:
+        if self.manual:
+            self.stop()
+        else:
+            self.start()
+
+    def end_frame(self, frame_ms: float) -> None:
+        """Closes the samples of a frame that took ``frame_ms``. Call once per frame, after the frame stats."""
+        if not self.running:
+            self.frame += 1
+            return
+        stacks, self._stacks = self._stacks, {}
+        self.frame += 1
+
+        if self.manual:
+            self.manual.add(self.frame, stacks, frame_ms)
+            self.manual.remaining -= 1
+            if self.manual.remaining <= 0:
+                self.stop()
+
+        if self.hitch:
+            self.hitch.add(self.frame, stacks, frame_ms)
+            self.hitch.remaining -= 1
+            if self.hitch.remaining <= 0:
+                self._save(self.hitch)
+                self.hitch = None
+                self._update_sampling()
+        elif self.armed and frame_ms >= self.hitch_ms:
+            # Slow frames within an open hitch capture are part of it
+            first = self.history[0][0] if self.history else self.frame
+            self.hitch = _Capture(ProfileRegister.HITCH, first, self.hitch_after)
+            for frame, old_stacks, old_ms in self.history:
+                self.hitch.add(frame, old_stacks, old_ms)
+            self.hitch.add(self.frame, stacks, frame_ms)
+            self.history.clear()
+            cprint(f"Frame {self.frame} took {frame_ms:.1f} ms, profiling the frames around it", VC.YELLOW)
+            if self.hitch.remaining <= 0:
+                self._save(self.hitch)
+                self.hitch = None
+
+        if self.armed and not self.hitch:
+            self.history.append((self.frame, stacks, frame_ms))
+
+    def _save(self, capture: _Capture) -> Optional[str]:
+        if not capture.stacks:
+            cprint(f"No samples in frames {capture.first_frame}-{capture.last_frame}, nothing saved", VC.RED)
+            return None
+        name = f"{self.tag}_{capture.reason}_frames_{capture.first_frame:06d}-{capture.last_frame:06d}.folded"
+        path = os.path.join(self.directory, name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                for stack, count in sorted(capture.stacks.items(), key=lambda item: -item[1]):
+                    file.write(f"{';'.join(stack)} {count}\n")
+        except OSError as error:
+            cprint(f"Could not save profile {path}: {error}", VC.RED)
+            return None
+        self.saved.append(path)
+        cprint(f"Profile of frames {capture.first_frame}-{capture.last_frame} ({capture.samples} samples, "
+               f"slowest {capture.slowest_ms:.1f} ms) saved to {path}", VC.MAGENTA)
+        return path
+
+    def close(self) -> None:
+        """Saves the open captures and stops sampling."""
+        for capture in (self.manual, self.hitch):
+            if capture:
+                self._save(capture)
+        self.manual = self.hitch = None
+        self.hitch_ms = 0.0
+        self._stop_sampling()
+
+    def stats(self) -> dict:
+        """Samples taken, their average cost, open captures and saved files."""
+        return {
+            "running": self.running,
+            "samples": self.samples,
+            "average_sample_us": self.sample_s / self.samples * 1e6 if self.samples else 0.0,
+            "manual_frames_left": self.manual.remaining if self.manual else 0,
+            "hitch_open": self.hitch is not None,
+            "saved": list(self.saved),
+        }
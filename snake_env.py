@@ -0,0 +1,449 @@
+"""Gym style environments around the headless game for bots and training."""
+
+import contextlib
+import math
+import multiprocessing
+import os
+import random
+import sys
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+import pygame
+
+from entity_activity import ActivityManager
+from headless import HeadlessGame
+from npc_character import NPCCharacter, NPCRegister
+from player_attachments import Attachment, WeaponRegister
+
+
+class Box:
+    def __init__(self, low, high, shape: tuple[int, ...], dtype=np.float32) -> None:
+        """
+        A space of arrays with values between ``low`` and ``high``, like gym's Box.
+
+        Args:
+            low, high: Bounds, a number or an array of ``shape``.
+            shape: Shape of the arrays.
+            dtype: Type of the values.
+        """
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self.low = np.broadcast_to(np.asarray(low, self.dtype), shape).copy()
+        self.high = np.broadcast_to(np.asarray(high, self.dtype), shape).copy()
+
+    def sample(self, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        rng = rng or np.random.default_rng()
+        return rng.uniform(self.low, self.high).astype(self.dtype)
+
+    def contains(self, value) -> bool:
+        value = np.asarray(value)
+        return value.shape == self.shape and bool(np.all(value >= self.low) and np.all(value <= self.high))
+
+
+class EnvRegister:
+    """Layout of actions and observations."""
+    # Action: steering target relative to the head (-1..1 of STEER_RANGE) and a weapon command
+    STEER_X = 0
+    STEER_Y = 1
+    COMMAND = 2
+    ACTION_SIZE = 3
+
+    NOOP = 0
+    ATTACH = 1  # Attach the closest ground weapon in reach to the first free slot
+    DETACH = 2  # Drop the weapon of the last used slot
+
+    STEER_RANGE = 300
+    # Positions in observations are divided by this
+    DISTANCE_SCALE = 1000
+
+    SEGMENTS = 32  # Body segments in an observation, relative to the head
+    NEAREST_NPCS = 8  # NPCs in an observation, each as (dx, dy, hp ratio)
+
+    # Reward per damage point dealt and taken, and per kill
+    DAMAGE_DEALT_REWARD = 1.0
+    DAMAGE_TAKEN_REWARD = -1.0
+    KILL_REWARD = 5.0
+
+
+def observation_layout() -> dict[str, slice]:
+    """Where each part of the observation sits in the flat array."""
+    sizes = [
+        ("head", 2),
+        ("hp", 1),
+        ("segments", EnvRegister.SEGMENTS * 2),
+        ("npcs", EnvRegister.NEAREST_NPCS * 3),
+        ("nearest_weapon", 2),
+        ("weapons", 1),
+    ]
+    layout = {}
+    start = 0
+    for name, size in sizes:
+        layout[name] = slice(start, start + size)
+        start += size
+    return layout
+
+
+OBSERVATION_LAYOUT = observation_layout()
+OBSERVATION_SIZE = max(part.stop for part in OBSERVATION_LAYOUT.values())
+
+
+# ─────────────────────────────────────────────────────────────
+# Single Environment
+# ─────────────────────────────────────────────────────────────
+
+class SnakeEnv:
+    def __init__(self, snake_length: int = 20, enemy: tuple = NPCRegister.VAMPIRE, enemy_count: int = 6,
+                 ground_weapons: int = 6, spawn_radius: float = 700, player_hp: int = 10,
+                 contact_cooldown: int = 30, max_steps: int = 60 * 30, frame_skip: int = 1,
+                 game: Optional[HeadlessGame] = None) -> None:
+        """
+        Gym style environment: a snake against a wave of NPCs, with weapons
+        lying around that it can pick up. reset() returns (observation, info),
+        step() returns (observation, reward, terminated, truncated, info).
+
+        Args:
+            snake_length: Body segments of the snake.
+            enemy: The NPCRegister entry of the wave.
+            enemy_count: How many NPCs the wave has.
+            ground_weapons: Weapons spawned on the ground around the snake.
+            spawn_radius: Distance from the head NPCs spawn at.
+            player_hp: Hit points the snake starts with.
+            contact_cooldown: Ticks between two hits of the same NPC.
+            max_steps: Steps before an episode is truncated.
+            frame_skip: Game ticks per step, the action is repeated for all of them.
+            game: Headless world to use, several environments of one process can share one.
+        """
+        self.snake_length = snake_length
+        self.enemy = enemy
+        self.enemy_count = enemy_count
+        self.ground_weapon_count = ground_weapons
+        self.spawn_radius = spawn_radius
+        self.player_hp = player_hp
+        self.contact_cooldown = contact_cooldown
+        self.max_steps = max_steps
+        self.frame_skip = max(1, frame_skip)
+
+        self.action_space = Box([-1, -1, 0], [1, 1, 2], (EnvRegister.ACTION_SIZE,))
+        self.observation_space = Box(-np.inf, np.inf, (OBSERVATION_SIZE,))
+
+        self.game = game or HeadlessGame()
+        self.rng = random.Random()
+        self.npcs: list[NPCCharacter] = []
+        self.weapons: list[Attachment] = []
+        self.next_hit: list[int] = []
+        self.tick = 0
+        self.steps = 0
+
+        # The world of this environment, swapped into the shared game on every step
+        self.world: Optional[dict] = None
+
+    # ──────────────────────────────────────────────────────────────
+    # World Handling
+    # ──────────────────────────────────────────────────────────────
+
+    def _save_world(self) -> None:
+        game = self.game
+        self.world = {
+            "origin": game.origin,
+            "player": game.player,
+            "players": game.players,
+            "npc_characters": game.npc_characters,
+            "ground_weapons": game.ground_weapons,
+            "npc_activity": game.npc_activity,
+            "weapon_activity": game.weapon_activity,
+            "projectiles": game.projectiles,
+            "tick_counter": game.tick_counter,
+        }
+
+    def _load_world(self) -> None:
+        for name, value in self.world.items():
+            setattr(self.game, name, value)
+
+    def reset(self, seed: Optional[int] = None) -> tuple[np.ndarray, dict]:
+        if seed is not None:
+            self.rng.seed(seed)
+        random.seed(self.rng.random())
+
+        game = self.game
+        # Every environment has its own activity sets, swapped in with the rest of its world
+        game.npc_activity = ActivityManager()
+        game.weapon_activity = ActivityManager()
+        game.reset_world()
+        player = game.player
+        for _ in range(self.snake_length - len(player.snake_pos)):
+            player.add_snake_part()
+        player.max_HP = player.HP = self.player_hp
+
+        head = player.snake_pos[0]
+        weapon_types = [WeaponRegister.GUN, WeaponRegister.SWORD, WeaponRegister.HEALING]
+        self.weapons = []
+        for _ in range(self.ground_weapon_count):
+            pos = (head[0] + self.rng.uniform(-400, 400), head[1] + self.rng.uniform(-400, 400))
+            weapon = Attachment(game.world_screen, player, pos, self.rng.choice(weapon_types))
+            game.add_ground_weapon(weapon)
+            self.weapons.append(weapon)
+
+        self.npcs = []
+        for i in range(self.enemy_count):
+            angle = self.rng.uniform(0, math.tau)
+            distance = self.spawn_radius * self.rng.uniform(0.8, 1.2)
+            spawn = (head[0] + math.cos(angle) * distance, head[1] + math.sin(angle) * distance)
+            self.npcs.append(game.spawn_npc(f"enemy_{i}", self.enemy, spawn))
+
+        self.next_hit = [0] * len(self.npcs)
+        self.tick = 0
+        self.steps = 0
+        self._save_world()
+        return self._observe(), {}
+
+    # ──────────────────────────────────────────────────────────────
+    # Stepping
+    # ──────────────────────────────────────────────────────────────
+
+    def step(self, action) -> tuple[np.ndarray, float, bool, bool, dict]:
+        self._load_world()
+        game = self.game
+        player = game.player
+
+        self._command(int(round(float(action[EnvRegister.COMMAND]))))
+
+        npc_hp = sum(npc.HP for npc in self.npcs)
+        player_hp = player.HP
+        alive_before = sum(1 for npc in self.npcs if npc.HP > 0)
+        damage_taken = 0
+
+        for _ in range(self.frame_skip):
+            head = player.snake_pos[0]
+            player.target_pos = (head[0] + float(action[EnvRegister.STEER_X]) * EnvRegister.STEER_RANGE,
+                                 head[1] + float(action[EnvRegister.STEER_Y]) * EnvRegister.STEER_RANGE)
+            damage_taken += self._npc_tick()
+            game.step()
+            self.tick += 1
+            if player.HP <= 0:
+                break
+
+        self.steps += 1
+        damage_dealt = npc_hp - sum(npc.HP for npc in self.npcs)
+        alive = sum(1 for npc in self.npcs if npc.HP > 0)
+        reward = (damage_dealt * EnvRegister.DAMAGE_DEALT_REWARD
+                  + damage_taken * EnvRegister.DAMAGE_TAKEN_REWARD
+                  + (alive_before - alive) * EnvRegister.KILL_REWARD)
+
+        terminated = player.HP <= 0 or alive == 0
+        truncated = not terminated and self.steps >= self.max_steps
+        info = {"damage_dealt": damage_dealt, "damage_taken": damage_taken, "kills": alive_before - alive,
+                "healed": max(0, player.HP - player_hp + damage_taken)}
+
+        self._save_world()
+        return self._observe(), float(reward), terminated, truncated, info
+
+    def _npc_tick(self) -> int:
+        """NPCs chase the head and hurt the snake on contact, returns the damage dealt to it."""
+        player = self.game.player
+        head = pygame.Vector2(player.snake_pos[0])
+        damage = self.enemy[NPCRegister.DAMAGE]
+        taken = 0
+        for i, npc in enumerate(self.npcs):
+            if npc.HP <= 0:
+                continue
+            npc.target_pos = pygame.Vector2(head)
+            if self.tick >= self.next_hit[i]:
+                reach = (npc.size * 0.5) ** 2
+                x, y = npc.pos
+                if any((sx - x) ** 2 + (sy - y) ** 2 < reach for sx, sy in player.snake_pos):
+                    taken += player.change_health(damage)
+                    self.next_hit[i] = self.tick + self.contact_cooldown
+        return taken
+
+    def _command(self, command: int) -> None:
+        game = self.game
+        player = game.player
+        if command == EnvRegister.ATTACH:
+            slots = game.free_slots(player)
+            if not slots:
+                return
+            head = player.snake_pos[0]
+            reach = Attachment.pickup_range * 2
+            candidates = [w for w in self.weapons if not w.attached
+                          and (w.pos[0] - head[0]) ** 2 + (w.pos[1] - head[1]) ** 2 <= reach * reach]
+            if candidates:
+                weapon = min(candidates, key=lambda w: (w.pos[0] - head[0]) ** 2 + (w.pos[1] - head[1]) ** 2)
+                game.attach(player, weapon, slots[0])
+        elif command == EnvRegister.DETACH:
+            used = [idx for idx, weapon in player.weapon_slots.items() if weapon]
+            if used:
+                game.detach(player, max(used))
+
+    # ──────────────────────────────────────────────────────────────
+    # Observations
+    # ──────────────────────────────────────────────────────────────
+
+    def _observe(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Writes the observation into ``out`` (a new array if None) and returns it."""
+        obs = np.zeros(OBSERVATION_SIZE, np.float32) if out is None else out
+        obs[:] = 0
+        scale = EnvRegister.DISTANCE_SCALE
+        layout = OBSERVATION_LAYOUT
+        player = self.game.player
+        hx, hy = player.snake_pos[0]
+
+        obs[layout["head"]] = hx / scale, hy / scale
+        obs[layout["hp"]] = player.HP / player.max_HP if player.max_HP else 0
+
+        segments = obs[layout["segments"]]
+        for i, (x, y) in enumerate(player.snake_pos[1:EnvRegister.SEGMENTS + 1]):
+            segments[2 * i] = (x - hx) / scale
+            segments[2 * i + 1] = (y - hy) / scale
+
+        alive = [npc for npc in self.npcs if npc.HP > 0]
+        alive.sort(key=lambda npc: (npc.pos.x - hx) ** 2 + (npc.pos.y - hy) ** 2)
+        npcs = obs[layout["npcs"]]
+        for i, npc in enumerate(alive[:EnvRegister.NEAREST_NPCS]):
+            npcs[3 * i] = (npc.pos.x - hx) / scale
+            npcs[3 * i + 1] = (npc.pos.y - hy) / scale
+            npcs[3 * i + 2] = npc.HP / npc.max_HP
+
+        ground = [w for w in self.weapons if not w.attached]
+        if ground:
+            nearest = min(ground, key=lambda w: (w.pos[0] - hx) ** 2 + (w.pos[1] - hy) ** 2)
+            obs[layout["nearest_weapon"]] = (nearest.pos[0] - hx) / scale, (nearest.pos[1] - hy) / scale
+        slots = range(player.weapon_start_index, len(player.snake_pos) - 1, player.weapon_interval)
+        obs[layout["weapons"]] = sum(1 for idx in slots if player.weapon_slots.get(idx)) / max(1, len(slots))
+        return obs
+
+
+# ─────────────────────────────────────────────────────────────
+# Vectorized Environments
+# ─────────────────────────────────────────────────────────────
+
+class VectorCommand:
+    STEP = "step"
+    RESET = "reset"
+    CLOSE = "close"
+
+
+def _worker(connection, env_ids: list[int], num_envs: int, names: dict[str, str], env_kwargs: dict) -> None:
+    """Steps the environments ``env_ids`` on commands, reading actions and writing results in shared memory."""
+    sys.stdout = open(os.devnull, "w")
+    buffers = {name: shared_memory.SharedMemory(name=shm_name) for name, shm_name in names.items()}
+    arrays = _shared_arrays(buffers, num_envs)
+
+    game = HeadlessGame()
+    envs = {i: SnakeEnv(game=game, **env_kwargs) for i in env_ids}
+    try:
+        while True:
+            command, seed = connection.recv()
+            if command == VectorCommand.CLOSE:
+                break
+            for i, env in envs.items():
+                if command == VectorCommand.RESET:
+                    env.reset(None if seed is None else seed + i)
+                    env._observe(arrays["observations"][i])
+                    arrays["rewards"][i] = 0
+                    arrays["terminated"][i] = arrays["truncated"][i] = False
+                else:
+                    _, reward, terminated, truncated, _ = env.step(arrays["actions"][i])
+                    # Finished environments start over, like gym's vector envs
+                    if terminated or truncated:
+                        env.reset()
+                    env._observe(arrays["observations"][i])
+                    arrays["rewards"][i] = reward
+                    arrays["terminated"][i] = terminated
+                    arrays["truncated"][i] = truncated
+            connection.send(True)
+    finally:
+        del arrays
+        for buffer in buffers.values():
+            buffer.close()
+
+
+def _shared_arrays(buffers: dict, num_envs: int) -> dict[str, np.ndarray]:
+    shapes = _buffer_shapes(num_envs)
+    return {name: np.ndarray(shape, dtype, buffer=buffers[name].buf) for name, (shape, dtype) in shapes.items()}
+
+
+def _buffer_shapes(num_envs: int) -> dict[str, tuple[tuple[int, ...], type]]:
+    return {
+        "observations": ((num_envs, OBSERVATION_SIZE), np.float32),
+        "actions": ((num_envs, EnvRegister.ACTION_SIZE), np.float32),
+        "rewards": ((num_envs,), np.float32),
+        "terminated": ((num_envs,), np.bool_),
+        "truncated": ((num_envs,), np.bool_),
+    }
+
+
+class VectorSnakeEnv:
+    def __init__(self, num_envs: int, workers: Optional[int] = None, **env_kwargs) -> None:
+        """
+        Steps ``num_envs`` independent SnakeEnvs in lockstep, spread over worker
+        processes. Observations, actions, rewards and done flags live in shared
+        memory, only a short command per step goes through the pipes.
+        Environments that finish are reset right away.
+
+        Args:
+            num_envs: Number of environments.
+            workers: Worker processes, at most one per environment (default: CPU count).
+            env_kwargs: Passed to every SnakeEnv.
+        """
+        self.num_envs = num_envs
+        self.workers = max(1, min(num_envs, workers or os.cpu_count() or 1))
+        self.single_action_space = Box([-1, -1, 0], [1, 1, 2], (EnvRegister.ACTION_SIZE,))
+        self.single_observation_space = Box(-np.inf, np.inf, (OBSERVATION_SIZE,))
+
+        self.buffers: dict[str, shared_memory.SharedMemory] = {}
+        for name, (shape, dtype) in _buffer_shapes(num_envs).items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self.buffers[name] = shared_memory.SharedMemory(create=True, size=size)
+        self.arrays = _shared_arrays(self.buffers, num_envs)
+
+        names = {name: buffer.name for name, buffer in self.buffers.items()}
+        self.connections = []
+        self.processes = []
+        for env_ids in np.array_split(np.arange(num_envs), self.workers):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker, args=(child, [int(i) for i in env_ids], num_envs, names, env_kwargs), daemon=True
+            )
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.closed = False
+
+    def _broadcast(self, command: str, seed: Optional[int] = None) -> None:
+        for connection in self.connections:
+            connection.send((command, seed))
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self, seed: Optional[int] = None) -> tuple[np.ndarray, dict]:
+        self._broadcast(VectorCommand.RESET, seed)
+        return self.arrays["observations"].copy(), {}
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Steps every environment with its row of ``actions``."""
+        self.arrays["actions"][:] = actions
+        self._broadcast(VectorCommand.STEP)
+        return (self.arrays["observations"].copy(), self.arrays["rewards"].copy(),
+                self.arrays["terminated"].copy(), self.arrays["truncated"].copy(), {})
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self.connections:
+            with contextlib.suppress(BrokenPipeError, OSError):
+                connection.send((VectorCommand.CLOSE, None))
+        for process in self.processes:
+            process.join(timeout=5)
+        del self.arrays
+        for buffer in self.buffers.values():
+            buffer.close()
+            buffer.unlink()
+
+    def __enter__(self) -> "VectorSnakeEnv":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,218 @@
+"""Recorded head path that the snake body can be laid along."""
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class PathHistory:
+    def __init__(self, head: tuple[float, float], tail_direction: tuple[float, float], spacing: float, samples: int) -> None:
+        """
+        Ring buffer of head positions sampled at a fixed arc length.
+
+        Sample 0 is the newest one, sample k lies k * spacing further back
+        along the path. The distance between the newest sample and the head
+        itself is tracked in ``lead``.
+
+        Args:
+            head: The current head position.
+            tail_direction: Direction the body trails off to before any movement.
+            spacing: Arc length between two samples.
+            samples: Number of samples the path has to provide from the start.
+        """
+        self.spacing = spacing
+        self.head = head
+        self.lead = 0.0
+
+        length = math.hypot(tail_direction[0], tail_direction[1])
+        self.tail_direction = (tail_direction[0] / length, tail_direction[1] / length) if length else (0.0, 1.0)
+
+        self.capacity = max(8, samples * 2)
+        self.xs = [0.0] * self.capacity
+        self.ys = [0.0] * self.capacity
+        self.newest = 0
+        self.count = 1
+        self.xs[0], self.ys[0] = head
+        self.ensure_samples(samples)
+
+    # ──────────────────────────────────────────────────────────────
+    # Recording
+    # ──────────────────────────────────────────────────────────────
+
+    def _push(self, x: float, y: float) -> None:
+        """Adds a new newest sample, overwriting the oldest one when full."""
+        self.newest = (self.newest + 1) % self.capacity
+        self.xs[self.newest] = x
+        self.ys[self.newest] = y
+        if self.count < self.capacity:
+            self.count += 1
+
+    def record(self, pos: tuple[float, float]) -> None:
+        """
+        Extends the path from the last head position to the new one.
+        Emits a sample every time another ``spacing`` of arc length is covered.
+        """
+        hx, hy = self.head
+        dx = pos[0] - hx
+        dy = pos[1] - hy
+        distance = math.hypot(dx, dy)
+        if distance == 0:
+            return
+
+        ux = dx / distance
+        uy = dy / distance
+        while self.lead + distance >= self.spacing:
+            step = self.spacing - self.lead
+            hx += ux * step
+            hy += uy * step
+            self._push(hx, hy)
+            distance -= step
+            self.lead = 0.0
+
+        self.lead += distance
+        self.head = (pos[0], pos[1])
+
+    def ensure_samples(self, samples: int) -> None:
+        """
+        Makes sure the path reaches at least ``samples`` samples back.
+        Missing history is extrapolated straight behind the oldest sample,
+        so growing the snake is just an extension of the valid index range.
+        """
+        if samples <= self.count:
+            return
+
+        if samples > self.capacity:
+            self._grow(samples * 2)
+
+        oldest = (self.newest - self.count + 1) % self.capacity
+        if self.count >= 2:
+            before = (oldest + 1) % self.capacity
+            dx = self.xs[oldest] - self.xs[before]
+            dy = self.ys[oldest] - self.ys[before]
+            length = math.hypot(dx, dy)
+            if length:
+                self.tail_direction = (dx / length, dy / length)
+
+        x, y = self.xs[oldest], self.ys[oldest]
+        tx, ty = self.tail_direction
+        while self.count < samples:
+            x += tx * self.spacing
+            y += ty * self.spacing
+            oldest = (oldest - 1) % self.capacity
+            self.xs[oldest] = x
+            self.ys[oldest] = y
+            self.count += 1
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocates the ring with the newest sample kept at the end."""
+        xs, ys = self.ordered()
+        xs.reverse()
+        ys.reverse()
+        padding = [0.0] * (capacity - len(xs))
+        self.xs = padding + xs
+        self.ys = padding.copy() + ys
+        self.capacity = capacity
+        self.newest = capacity - 1
+
+    # ──────────────────────────────────────────────────────────────
+    # Lookups
+    # ──────────────────────────────────────────────────────────────
+
+    def ordered(self) -> tuple[list[float], list[float]]:
+        """Returns the valid samples as coordinate lists, newest first."""
+        start = self.newest
+        stop = self.newest - self.count
+        if stop >= -1:
+            xs = self.xs[start:stop:-1] if stop >= 0 else self.xs[start::-1]
+            ys = self.ys[start:stop:-1] if stop >= 0 else self.ys[start::-1]
+        else:
+            wrap = self.capacity + stop
+            xs = self.xs[start::-1] + self.xs[:wrap:-1]
+            ys = self.ys[start::-1] + self.ys[:wrap:-1]
+        return xs, ys
+
+    def segment_position(self, index: int) -> tuple[float, float]:
+        """Returns body part ``index`` when parts are spaced ``spacing`` apart."""
+        if index == 0:
+            return self.head
+
+        t = (self.spacing - self.lead) / self.spacing
+        a = (self.newest - index + 1) % self.capacity
+        b = (a - 1) % self.capacity
+        return (
+            self.xs[a] + (self.xs[b] - self.xs[a]) * t,
+            self.ys[a] + (self.ys[b] - self.ys[a]) * t
+        )
+
+    def segment_positions(self, segments: int) -> list[tuple[float, float]]:
+        """
+        Returns the positions of ``segments`` body parts spaced ``spacing`` apart,
+        starting with the head. Every body part sits at the same fraction
+        between two neighbouring samples, so this is one pass over the buffer.
+        """
+        self.ensure_samples(segments)
+        xs, ys = self.ordered()
+        t = (self.spacing - self.lead) / self.spacing
+        s = 1 - t
+
+        body = [self.head]
+        body.extend(
+            (ax * s + bx * t, ay * s + by * t)
+            for ax, ay, bx, by in zip(xs[:segments - 1], ys, xs[1:segments], ys[1:])
+        )
+        return body
+
+    def segment_array(self, segments: int) -> np.ndarray:
+        """segment_positions() as an array of shape (segments, 2), without a tuple per body part."""
+        self.ensure_samples(segments)
+        xs, ys = self.ordered()
+        t = (self.spacing - self.lead) / self.spacing
+
+        samples = np.array((xs[:segments], ys[:segments]), dtype=float).T
+        body = np.empty((segments, 2))
+        body[0] = self.head
+        body[1:] = samples[:-1] * (1 - t) + samples[1:] * t
+        return body
+
+
+class SnakeBody(Sequence):
+    """
+    List-like view of the snake segments laid along a PathHistory.
+    Positions are looked up when indexed instead of being stored, so moving
+    the head costs the same for any body length.
+    """
+
+    def __init__(self, path: PathHistory, length: int) -> None:
+        self.path = path
+        self.length = length
+        self.path.ensure_samples(length)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.path.segment_position(i) for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("snake segment index out of range")
+        return self.path.segment_position(index)
+
+    def __setitem__(self, index: int, pos: tuple[float, float]) -> None:
+        """Only the head can be moved, the rest of the body follows its path."""
+        if index != 0:
+            raise IndexError("only the head of a path body can be moved")
+        self.path.record(pos)
+
+    def append(self, pos: tuple[float, float] = None) -> None:
+        """Grows the body by one segment, ``pos`` is implied by the path."""
+        self.length += 1
+        self.path.ensure_samples(self.length)
+
+    def copy(self) -> list[tuple[float, float]]:
+        return self.path.segment_positions(self.length)
+
+    def array(self) -> np.ndarray:
+        return self.path.segment_array(self.length)
@@ -0,0 +1,232 @@
+"""Preloaded sound effects played through a fixed pool of mixer channels."""
+
+import os
+import time
+from typing import Optional
+
+import numpy as np
+import pygame
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+
+class SoundRegister:
+    """
+    Sound events: name, waveform, start and end frequency (Hz), duration (ms),
+    volume, priority and the shortest time between two plays (ms).
+    """
+    NAME = 0
+    WAVE = 1
+    START_HZ = 2
+    END_HZ = 3
+    DURATION = 4
+    VOLUME = 5
+    PRIORITY = 6
+    MIN_INTERVAL = 7
+
+    # Waveforms for synthesized sounds
+    NOISE = "noise"
+    SWEEP = "sweep"
+    TONE = "tone"
+
+    GUN = ("gun", NOISE, 180, 60, 120, 0.5, 2, 40)
+    SWORD = ("sword", SWEEP, 900, 300, 140, 0.3, 1, 50)
+    HEAL = ("heal", TONE, 600, 1200, 250, 0.4, 2, 200)
+    HIT = ("hit", TONE, 320, 200, 60, 0.4, 3, 30)
+    DEATH = ("death", TONE, 400, 80, 450, 0.6, 4, 0)
+    MAGIC = ("magic", SWEEP, 200, 1400, 400, 0.5, 3, 100)
+    EVENTS = [GUN, SWORD, HEAL, HIT, DEATH, MAGIC]
+
+    # Sound of each weapon type, by weapon name
+    WEAPON_SOUNDS = {"Gun": GUN, "Sword": SWORD, "Healing": HEAL, "Magic": MAGIC}
+
+    FOLDER = "sounds"
+
+
+class SoundBank:
+    def __init__(self, channels: int = 8, enabled: bool = True) -> None:
+        """
+        Decodes every sound event once and plays them on ``channels`` mixer channels.
+
+        A sound file ``sounds/<name>.wav`` is used when it exists, otherwise the
+        effect is synthesized. A play request is dropped when the same event was
+        played less than its minimal interval ago. When every channel is busy the
+        voice with the lowest priority (the oldest one among equals) is stolen,
+        unless all of them are more important than the new sound.
+
+        Args:
+            channels: Size of the channel pool.
+            enabled: False turns every play into a no-op, e.g. for simulations.
+        """
+        self.enabled = enabled and self._init_mixer()
+        self.sounds: dict[tuple, pygame.mixer.Sound] = {}
+        self.channels: list[pygame.mixer.Channel] = []
+
+        # Per channel: event playing, its priority, start and end time (ms)
+        self.voice_event: list[Optional[tuple]] = []
+        self.voice_priority: list[int] = []
+        self.voice_start: list[float] = []
+        self.voice_end: list[float] = []
+
+        self.last_played: dict[tuple, float] = {}
+
+        # Counters
+        self.played = 0
+        self.stolen = 0
+        self.dropped_rate_limit = 0
+        self.dropped_busy = 0
+
+        if not self.enabled:
+            return
+
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+        for i in range(channels):
+            self.channels.append(pygame.mixer.Channel(i))
+            self.voice_event.append(None)
+            self.voice_priority.append(0)
+            self.voice_start.append(0.0)
+            self.voice_end.append(0.0)
+
+        for event in SoundRegister.EVENTS:
+            self.sounds[event] = self._load(event)
+        cprint(f"Sound bank loaded {len(self.sounds)} sounds on {channels} channels", VC.MAGENTA)
+
+    @staticmethod
+    def _init_mixer() -> bool:
+        if pygame.mixer.get_init():
+            return True
+        try:
+            pygame.mixer.init()
+            return True
+        except pygame.error as e:
+            cprint(f"[ERROR] No audio, sounds are disabled: {e}", VC.RED)
+            return False
+
+    # ──────────────────────────────────────────────────────────────
+    # Loading
+    # ──────────────────────────────────────────────────────────────
+
+    def _load(self, event: tuple) -> pygame.mixer.Sound:
+        path = os.path.join(SoundRegister.FOLDER, f"{event[SoundRegister.NAME]}.wav")
+        if os.path.isfile(path):
+            sound = pygame.mixer.Sound(path)
+        else:
+            sound = self._synthesize(event)
+        sound.set_volume(event[SoundRegister.VOLUME])
+        return sound
+
+    def _synthesize(self, event: tuple) -> pygame.mixer.Sound:
+        """Builds the effect from its register entry in the mixer's sample format."""
+        rate, _, channels = pygame.mixer.get_init()
+        count = max(1, int(rate * event[SoundRegister.DURATION] / 1000))
+        t = np.arange(count) / rate
+        progress = t / t[-1] if count > 1 else t
+
+        # Frequency glides from start to end, the phase is its running sum
+        frequency = event[SoundRegister.START_HZ] + (event[SoundRegister.END_HZ] - event[SoundRegister.START_HZ]) * progress
+        phase = np.cumsum(frequency) / rate * 2 * np.pi
+        rng = np.random.default_rng(len(event[SoundRegister.NAME]))
+
+        wave = event[SoundRegister.WAVE]
+        if wave == SoundRegister.NOISE:
+            # Noise burst over a low thump
+            samples = rng.uniform(-1, 1, count) * np.exp(-progress * 8) + np.sin(phase) * np.exp(-progress * 4)
+        elif wave == SoundRegister.SWEEP:
+            # Noise shaped by a gliding tone, swelling in and out
+            samples = rng.uniform(-1, 1, count) * (0.5 + 0.5 * np.sin(phase)) * np.sin(np.pi * progress)
+        else:
+            samples = np.sin(phase) * np.exp(-progress * 3)
+
+        # Short fade in against clicks
+        fade = min(count, rate // 500)
+        samples[:fade] *= np.linspace(0, 1, fade)
+
+        pcm = (np.clip(samples / max(1e-9, np.abs(samples).max()), -1, 1) * 32000).astype(np.int16)
+        if channels > 1:
+            pcm = np.repeat(pcm[:, None], channels, axis=1)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(pcm))
+
+    # ──────────────────────────────────────────────────────────────
+    # Playing
+    # ──────────────────────────────────────────────────────────────
+
+    def play(self, event: tuple, volume: float = 1.0) -> bool:
+        """
+        Plays a sound event from SoundRegister if the rate limit and the pool allow it.
+
+        Returns:
+            True if the sound is playing.
+        """
+        if not self.enabled:
+            return False
+
+        now = time.perf_counter() * 1000
+        if now - self.last_played.get(event, -1e9) < event[SoundRegister.MIN_INTERVAL]:
+            self.dropped_rate_limit += 1
+            return False
+
+        priority = event[SoundRegister.PRIORITY]
+        channel_idx = self._free_channel(now)
+        if channel_idx is None:
+            channel_idx = self._steal_channel(priority)
+            if channel_idx is None:
+                self.dropped_busy += 1
+                return False
+            self.channels[channel_idx].stop()
+            self.stolen += 1
+
+        sound = self.sounds[event]
+        channel = self.channels[channel_idx]
+        channel.play(sound)
+        channel.set_volume(volume)
+
+        self.voice_event[channel_idx] = event
+        self.voice_priority[channel_idx] = priority
+        self.voice_start[channel_idx] = now
+        self.voice_end[channel_idx] = now + sound.get_length() * 1000
+        self.last_played[event] = now
+        self.played += 1
+        return True
+
+    def play_weapon(self, weapon_name: str) -> bool:
+        """Plays the sound of a weapon type, if it has one."""
+        event = SoundRegister.WEAPON_SOUNDS.get(weapon_name)
+        return self.play(event) if event else False
+
+    def _free_channel(self, now: float) -> Optional[int]:
+        # Voices end by their length, so the pool also works on drivers that never finish a sound
+        for i, end in enumerate(self.voice_end):
+            if now >= end:
+                return i
+        return None
+
+    def _steal_channel(self, priority: int) -> Optional[int]:
+        """The voice with the lowest priority, oldest first, if it is not above ``priority``."""
+        victim = None
+        for i in range(len(self.channels)):
+            if self.voice_priority[i] > priority:
+                continue
+            if victim is None or (self.voice_priority[i], self.voice_start[i]) < \
+                    (self.voice_priority[victim], self.voice_start[victim]):
+                victim = i
+        return victim
+
+    def active_voices(self) -> int:
+        now = time.perf_counter() * 1000
+        return sum(1 for end in self.voice_end if end > now)
+
+    def stats(self) -> dict:
+        return {
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped": self.dropped_rate_limit + self.dropped_busy,
+            "dropped_rate_limit": self.dropped_rate_limit,
+            "dropped_busy": self.dropped_busy,
+            "active_voices": self.active_voices(),
+        }
+
+    def stop(self) -> None:
+        for channel in self.channels:
+            channel.stop()
+        self.voice_end = [0.0] * len(self.channels)
@@ -0,0 +1,71 @@
+"""Stats of the player that attachments and timed buffs modify."""
+
+from typing import Iterable
+
+
+class StatRegister:
+    """
+    Stats modifiers can change, by their attribute name on the Player.
+    A modifier is (stat, added amount, factor): the stat becomes
+    (base + sum of added amounts) * product of factors.
+    """
+    STAT = 0
+    ADD = 1
+    MUL = 2
+
+    MOVE_SPEED = "move_speed"
+    ARMOR = "armor"
+    DAMAGE = "damage_multiplier"
+    STATS = [MOVE_SPEED, ARMOR, DAMAGE]
+
+
+def aggregate(base: dict[str, float], modifiers: Iterable[tuple[str, float, float]]) -> dict[str, float]:
+    """Every stat of ``base`` with all ``modifiers`` applied."""
+    added = dict.fromkeys(base, 0.0)
+    factor = dict.fromkeys(base, 1.0)
+    for stat, add, mul in modifiers:
+        added[stat] += add
+        factor[stat] *= mul
+    return {stat: (value + added[stat]) * factor[stat] for stat, value in base.items()}
+
+
+class StatModifiers:
+    def __init__(self, base: dict[str, float]) -> None:
+        """
+        Base stats and the timed buffs of one player. Working out the stats is
+        only done when something changed, the results are kept as plain
+        attributes on the player.
+
+        Args:
+            base: Stat name -> value without any modifier.
+        """
+        self.base = dict(base)
+        # (expiry tick, modifiers) of the running buffs
+        self.buffs: list[tuple[int, tuple]] = []
+        self.tick_count = 0
+        self.next_expiry: float = float("inf")
+        self.recomputes = 0
+
+    def compute(self, attachment_modifiers: Iterable[tuple]) -> dict[str, float]:
+        """The stats with the modifiers of the attachments and the running buffs."""
+        self.recomputes += 1
+        buff_modifiers = (modifier for _, modifiers in self.buffs for modifier in modifiers)
+        return aggregate(self.base, (*attachment_modifiers, *buff_modifiers))
+
+    def add_buff(self, modifiers: tuple, ticks: int) -> None:
+        expiry = self.tick_count + ticks
+        self.buffs.append((expiry, modifiers))
+        self.next_expiry = min(self.next_expiry, expiry)
+
+    def tick(self) -> bool:
+        """Counts a tick. Returns True if a buff ran out, the stats then need to be worked out again."""
+        self.tick_count += 1
+        if self.tick_count < self.next_expiry:
+            return False
+        self.buffs = [buff for buff in self.buffs if buff[0] > self.tick_count]
+        self.next_expiry = min((expiry for expiry, _ in self.buffs), default=float("inf"))
+        return True
+
+    def clear_buffs(self) -> None:
+        self.buffs = []
+        self.next_expiry = float("inf")
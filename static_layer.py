@@ -0,0 +1,142 @@
+"""World content that does not move, baked into one cached surface around the camera."""
+
+import math
+import time
+from typing import Callable, Optional
+
+import pygame
+
+
+class StaticLayer:
+    def __init__(self, screen: pygame.Surface,
+                 bake: Callable[[pygame.Surface, tuple[float, float], float, pygame.Rect], None],
+                 margin: int = 400) -> None:
+        """
+        Caches the static part of the world (hub, terrain, weapons lying on the
+        ground) for the view grown by ``margin`` world units on every side.
+        A frame then costs one blit of the visible part instead of drawing
+        everything again.
+
+        When the camera leaves the baked region the layer is centered on the
+        view again. At scale 1 the baked pixels are scrolled along and only
+        the strips that came into the region are drawn, otherwise and after a
+        scale change everything is baked again. When something static changes,
+        invalidate() with its position only repaints the area around it,
+        without a position the whole layer is baked on the next draw.
+
+        Args:
+            screen: Surface the layer is drawn on, also gives the view size and pixel format.
+            bake: Draws the static content as bake(surface, origin, scale, world_rect), where
+                ``origin`` and ``scale`` work like the ones of the render methods and
+                ``world_rect`` is the world area that needs to be drawn.
+            margin: World units baked beyond each side of the view.
+        """
+        self.screen = screen
+        self.bake = bake
+        self.margin = margin
+
+        self.surface: Optional[pygame.Surface] = None
+        # Baked world area and the scale it was baked at
+        self.world_rect = pygame.Rect(0, 0, 0, 0)
+        self.scale = 0.0
+        self.dirty = True
+
+        self.bakes = 0
+        self.repaints = 0
+        self.scrolls = 0
+        self.max_bake_ms = 0.0
+        self.max_scroll_ms = 0.0
+
+    def _view(self, origin: tuple[float, float]) -> pygame.Rect:
+        """The visible world area for a camera origin, world units are window units at any scale."""
+        width, height = self.screen.get_size()
+        return pygame.Rect(math.floor(-origin[0]), math.floor(-origin[1]), width + 1, height + 1)
+
+    def _origin(self) -> tuple[float, float]:
+        return -self.world_rect.x, -self.world_rect.y
+
+    def _bake_all(self, view: pygame.Rect, scale: float) -> None:
+        start = time.perf_counter()
+        self.world_rect = view.inflate(2 * self.margin, 2 * self.margin)
+        size = (math.ceil(self.world_rect.width * scale), math.ceil(self.world_rect.height * scale))
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size).convert(self.screen)
+        self.scale = scale
+
+        self.surface.fill((0, 0, 0))
+        self.bake(self.surface, self._origin(), scale, self.world_rect)
+        self.dirty = False
+        self.bakes += 1
+        self.max_bake_ms = max(self.max_bake_ms, (time.perf_counter() - start) * 1000)
+
+    def invalidate(self, pos: Optional[tuple[float, float]] = None, radius: float = 100) -> None:
+        """
+        Marks static content as changed.
+
+        Args:
+            pos: World position of the change, None if everything may have changed.
+            radius: Half the size of the area around ``pos`` that is repainted.
+        """
+        if self.surface is None or self.dirty:
+            return
+        if pos is None:
+            self.dirty = True
+            return
+
+        area = pygame.Rect(math.floor(pos[0] - radius), math.floor(pos[1] - radius),
+                           math.ceil(2 * radius), math.ceil(2 * radius))
+        if area.colliderect(self.world_rect):
+            self._repaint(area)
+            self.repaints += 1
+
+    def _repaint(self, area: pygame.Rect) -> None:
+        """Bakes one world area again, everything drawn is clipped to its pixels."""
+        clip = pygame.Rect(round((area.x - self.world_rect.x) * self.scale),
+                           round((area.y - self.world_rect.y) * self.scale),
+                           math.ceil(area.width * self.scale), math.ceil(area.height * self.scale))
+        self.surface.set_clip(clip)
+        self.surface.fill((0, 0, 0))
+        self.bake(self.surface, self._origin(), self.scale, area)
+        self.surface.set_clip(None)
+
+    def _scroll(self, view: pygame.Rect) -> None:
+        """Centers the layer on ``view`` by moving the baked pixels, then bakes the strips that are new."""
+        start = time.perf_counter()
+        old = self.world_rect
+        self.world_rect = view.inflate(2 * self.margin, 2 * self.margin)
+        self.surface.scroll(old.x - self.world_rect.x, old.y - self.world_rect.y)
+
+        new = self.world_rect
+        kept = new.clip(old)
+        strips = [
+            pygame.Rect(new.left, new.top, new.width, kept.top - new.top),
+            pygame.Rect(new.left, kept.bottom, new.width, new.bottom - kept.bottom),
+            pygame.Rect(new.left, kept.top, kept.left - new.left, kept.height),
+            pygame.Rect(kept.right, kept.top, new.right - kept.right, kept.height),
+        ]
+        for strip in strips:
+            if strip.width > 0 and strip.height > 0:
+                self._repaint(strip)
+        self.scrolls += 1
+        self.max_scroll_ms = max(self.max_scroll_ms, (time.perf_counter() - start) * 1000)
+
+    def draw(self, origin: tuple[float, float], scale: float = 1.0) -> None:
+        """Blits the visible part of the layer, baking it first if needed."""
+        view = self._view(origin)
+        if self.dirty or scale != self.scale:
+            self._bake_all(view, scale)
+        elif not self.world_rect.contains(view):
+            if scale == 1.0 and view.colliderect(self.world_rect):
+                self._scroll(view)
+            else:
+                self._bake_all(view, scale)
+
+        offset = (round((-origin[0] - self.world_rect.x) * scale), round((-origin[1] - self.world_rect.y) * scale))
+        width, height = self.screen.get_size()
+        area = pygame.Rect(offset, (math.ceil(width * scale), math.ceil(height * scale)))
+        self.screen.blit(self.surface, (0, 0), area)
+
+    def stats(self) -> dict:
+        return {"bakes": self.bakes, "scrolls": self.scrolls, "repaints": self.repaints,
+                "max_bake_ms": self.max_bake_ms, "max_scroll_ms": self.max_scroll_ms,
+                "size": self.surface.get_size() if self.surface else (0, 0)}
@@ -0,0 +1,315 @@
+"""Line of sight through walls on a coarse grid, and aggro checks of hostile NPCs built on it."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from npc_character import NPCCharacter
+
+
+class VisibilityRegister:
+    # Edge length of a grid cell in world units, walls are rounded out to whole cells
+    CELL = 50
+    # NPCs farther than this from the player's head never aggro
+    AGGRO_RANGE = 1500
+
+
+# ─────────────────────────────────────────────────────────────
+# Grid
+# ─────────────────────────────────────────────────────────────
+
+class VisibilityGrid:
+    def __init__(self, cell_size: float = VisibilityRegister.CELL) -> None:
+        """
+        Walls rasterized into the cells they touch. Line of sight walks the
+        cells a ray crosses (DDA) and is blocked by the first wall cell.
+
+        Results between two cells are cached per (target cell, viewer cell)
+        and hold for anything standing in those cells, a pair is only
+        traced again after one side moved to another cell. Changing the
+        walls drops the whole cache.
+
+        Args:
+            cell_size: Edge length of a cell in world units.
+        """
+        self.cell_size = cell_size
+        self.walls: list[tuple[float, float, float, float]] = []
+        self.blocked: set[tuple[int, int]] = set()
+        # Target cell -> viewer cell -> whether the viewer sees the target
+        self.cache: dict[tuple[int, int], dict[tuple[int, int], bool]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.traced_cells = 0
+
+    def cell(self, pos) -> tuple[int, int]:
+        return int(math.floor(pos[0] / self.cell_size)), int(math.floor(pos[1] / self.cell_size))
+
+    # ──────────────────────────────────────────────────────────────
+    # Walls
+    # ──────────────────────────────────────────────────────────────
+
+    def add_wall(self, left: float, top: float, width: float, height: float) -> None:
+        """Blocks every cell the rectangle touches."""
+        self.walls.append((left, top, width, height))
+        self._rasterize(left, top, width, height)
+        self.cache.clear()
+
+    def add_room(self, left: float, top: float, width: float, height: float, thickness: float = 50,
+                 door: float = 150) -> None:
+        """Four walls around a rectangle with a ``door`` wide gap in the middle of each."""
+        side = (width - door) * 0.5
+        upright = (height - door) * 0.5
+        for x in (left, left + side + door):
+            self.add_wall(x, top, side, thickness)
+            self.add_wall(x, top + height - thickness, side, thickness)
+        for y in (top, top + upright + door):
+            self.add_wall(left, y, thickness, upright)
+            self.add_wall(left + width - thickness, y, thickness, upright)
+
+    def clear(self) -> None:
+        self.walls.clear()
+        self.blocked.clear()
+        self.cache.clear()
+
+    def _rasterize(self, left: float, top: float, width: float, height: float) -> None:
+        x0, y0 = self.cell((left, top))
+        # A wall ending exactly on a cell border does not touch the next cell
+        x1 = math.ceil((left + width) / self.cell_size) - 1
+        y1 = math.ceil((top + height) / self.cell_size) - 1
+        for x in range(x0, max(x0, x1) + 1):
+            for y in range(y0, max(y0, y1) + 1):
+                self.blocked.add((x, y))
+
+    # ──────────────────────────────────────────────────────────────
+    # Line of sight
+    # ──────────────────────────────────────────────────────────────
+
+    def trace(self, start: tuple[int, int], end: tuple[int, int]) -> bool:
+        """
+        Whether the ray between the centers of two cells crosses no wall cell.
+        The two cells themselves do not block, something standing in a wall
+        cell can still see out of it.
+        """
+        if not self.blocked or start == end:
+            return True
+        x, y = start
+        end_x, end_y = end
+        dx = end_x - x
+        dy = end_y - y
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Ray length to the next vertical and horizontal cell border, and between two of them
+        delta_x = abs(1 / dx) if dx else math.inf
+        delta_y = abs(1 / dy) if dy else math.inf
+        next_x = 0.5 * delta_x
+        next_y = 0.5 * delta_y
+
+        blocked = self.blocked
+        steps = abs(dx) + abs(dy) - 1
+        for _ in range(steps):
+            # Never step past the end on one axis, rounding can not make the walk longer
+            if (next_x < next_y and x != end_x) or y == end_y:
+                x += step_x
+                next_x += delta_x
+            else:
+                y += step_y
+                next_y += delta_y
+            if (x, y) in blocked:
+                self.traced_cells += steps
+                return False
+        self.traced_cells += steps
+        return True
+
+    def line_of_sight(self, a, b) -> bool:
+        """Whether the cell of world position ``a`` sees the cell of ``b``, cached."""
+        return self.sees(self.cell(a), self.cell(b))
+
+    def sees(self, viewer: tuple[int, int], target: tuple[int, int]) -> bool:
+        """Whether cell ``viewer`` sees cell ``target``, traced once per pair."""
+        targets = self.cache.get(target)
+        if targets is None:
+            targets = self.cache[target] = {}
+        seen = targets.get(viewer)
+        if seen is None:
+            self.misses += 1
+            seen = targets[viewer] = self.trace(viewer, target)
+        else:
+            self.hits += 1
+        return seen
+
+    def keep_targets(self, targets: Iterable[tuple[int, int]]) -> None:
+        """Drops the cached pairs of every target cell not in ``targets``, the ones the targets have left."""
+        keep = set(targets)
+        for target in [target for target in self.cache if target not in keep]:
+            del self.cache[target]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "walls": len(self.walls),
+            "blocked_cells": len(self.blocked),
+            "cached_pairs": sum(len(viewers) for viewers in self.cache.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "traced_cells": self.traced_cells,
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# Aggro
+# ─────────────────────────────────────────────────────────────
+
+class _BodyCells:
+    def __init__(self, grid: VisibilityGrid, body) -> None:
+        """
+        Cells of the body in order from the head, each once. They are only
+        worked out as far as a check asks for them, a check that sees the
+        head cell never walks the rest of a long body.
+        """
+        self.cells: list[tuple[int, int]] = []
+        self._known: set[tuple[int, int]] = set()
+        self._rest = map(grid.cell, body)
+
+    def __iter__(self):
+        i = 0
+        while True:
+            if i == len(self.cells):
+                for cell in self._rest:
+                    if cell not in self._known:
+                        self._known.add(cell)
+                        self.cells.append(cell)
+                        break
+                else:
+                    return
+            yield self.cells[i]
+            i += 1
+
+
+class AggroDetector:
+    def __init__(self, grid: VisibilityGrid, budget_ms: float = 0.5,
+                 aggro_range: float = VisibilityRegister.AGGRO_RANGE) -> None:
+        """
+        Finds the registered NPCs that see the player. An NPC aggros once it
+        is within ``aggro_range`` of the player's head and its cell sees the
+        cell of the head or of any body segment, and stays aggroed until it
+        is unregistered.
+
+        NPCs are checked round robin, each at most once per tick, and a tick
+        stops checking once ``budget_ms`` is used up. The rest go first on
+        the next tick. Most checks are cache hits of the grid, the player
+        moves a cell every few ticks and NPCs of one cell share their result.
+
+        Args:
+            grid: Walls that block the view.
+            budget_ms: Milliseconds per tick checks may take.
+            aggro_range: Farthest distance to the player's head an NPC aggros at.
+        """
+        self.grid = grid
+        self.budget_ms = budget_ms
+        self.aggro_range = aggro_range
+
+        self.waiting: deque[NPCCharacter] = deque()
+        self.registered: set[NPCCharacter] = set()
+        self.aggro: set[NPCCharacter] = set()
+
+        # Counters
+        self.last_checks = 0
+        self.last_ms = 0.0
+        self.check_ms: deque[float] = deque(maxlen=600)
+        self.max_ms = 0.0
+        self.checks = 0
+
+    def __len__(self) -> int:
+        return len(self.registered)
+
+    def register(self, npc: NPCCharacter) -> None:
+        if npc not in self.registered:
+            self.registered.add(npc)
+            self.waiting.append(npc)
+
+    def unregister(self, npc: NPCCharacter) -> None:
+        """Forgets an NPC and its aggro, a pooled NPC starts over when it is registered again."""
+        self.registered.discard(npc)
+        self.aggro.discard(npc)
+
+    def clear(self) -> None:
+        self.waiting.clear()
+        self.registered.clear()
+        self.aggro.clear()
+
+    def is_aggro(self, npc: NPCCharacter) -> bool:
+        return npc in self.aggro
+
+    def update(self, body) -> None:
+        """
+        Checks waiting NPCs against the player, within the budget. Call once per tick.
+
+        Args:
+            body: Positions of the player's body, the head first.
+        """
+        start = time.perf_counter()
+        if not self.waiting:
+            self.last_checks = 0
+            self.last_ms = 0.0
+            return
+        head = body[0]
+        if self.grid.blocked:
+            # Checked until one is seen
+            targets = _BodyCells(self.grid, body)
+        else:
+            # Nothing blocks the view, the head is seen by every NPC in range
+            targets = _BodyCells(self.grid, (head,))
+
+        range_sq = self.aggro_range * self.aggro_range
+        budget_s = self.budget_ms / 1000
+        cell = self.grid.cell
+        sees = self.grid.sees
+        checked = set()
+        for _ in range(len(self.waiting)):
+            npc = self.waiting.popleft()
+            # Unregistered NPCs leave the queue here, one registered again may be in it twice
+            if npc not in self.registered or npc in self.aggro or npc in checked:
+                continue
+            checked.add(npc)
+            seen = False
+            if npc.HP > 0:
+                dx = npc.pos.x - head[0]
+                dy = npc.pos.y - head[1]
+                if dx * dx + dy * dy <= range_sq:
+                    viewer = cell(npc.pos)
+                    seen = any(sees(viewer, target) for target in targets)
+            if seen:
+                self.aggro.add(npc)
+            else:
+                self.waiting.append(npc)
+            if time.perf_counter() - start >= budget_s:
+                break
+        checks = len(checked)
+        # Forgets the cells past the part of the body the checks walked, the body may have left them
+        if targets.cells:
+            self.grid.keep_targets(targets.cells)
+
+        self.last_checks = checks
+        self.checks += checks
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.check_ms.append(self.last_ms)
+        self.max_ms = max(self.max_ms, self.last_ms)
+
+    def stats(self) -> dict:
+        """NPCs checked and time used last tick, aggroed NPCs and the grid's cache numbers."""
+        return {
+            "npcs": len(self.registered),
+            "aggro": len(self.aggro),
+            "last_checks": self.last_checks,
+            "last_ms": self.last_ms,
+            "average_ms": sum(self.check_ms) / len(self.check_ms) if self.check_ms else 0.0,
+            "max_ms": self.max_ms,
+            "checks": self.checks,
+            **self.grid.stats(),
+        }
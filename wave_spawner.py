@@ -0,0 +1,296 @@
+"""Timed levels whose hostile NPCs come in waves from a precomputed spawn schedule."""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+import pygame
+
+from assistent_skripts.color_print import custom_print as cprint
+from assistent_skripts.color_print import ValidColors as VC
+
+from npc_character import NPCCharacter, NPCRegister
+
+if TYPE_CHECKING:
+    from main import Game
+
+
+class LevelRegister:
+    """
+    Levels: name, length in seconds and waves. A wave is its start (seconds),
+    the NPCRegister entry, how many NPCs it has, the seconds its spawns are
+    spread over and the distance from the player they appear at.
+    """
+    NAME = 0
+    DURATION = 1
+    WAVES = 2
+
+    START = 0
+    CHARACTER = 1
+    COUNT = 2
+    SPREAD = 3
+    DISTANCE = 4
+
+    LEVEL_1 = ("1", 120, [
+        (2, NPCRegister.VAMPIRE, 10, 4, 900),
+        (20, NPCRegister.VAMPIRE, 40, 8, 1000),
+        (50, NPCRegister.VAMPIRE, 120, 10, 1100),
+    ])
+    LEVEL_2 = ("2", 180, [
+        (2, NPCRegister.VAMPIRE, 40, 6, 900),
+        (30, NPCRegister.VAMPIRE, 150, 10, 1000),
+        (90, NPCRegister.VAMPIRE, 500, 5, 1200),
+    ])
+    LEVELS = {LEVEL_1[NAME]: LEVEL_1, LEVEL_2[NAME]: LEVEL_2}
+
+    TICK_RATE = 60
+    # Ticks a dead NPC stays on the ground before it goes back to its pool
+    CORPSE_TICKS = 120
+    # Ticks between two looks at one NPC for corpses to recycle, NPCs are spread over them
+    SCAN_TICKS = 10
+
+
+def build_schedule(level: tuple, seed: int = 0) -> list[tuple[int, tuple, float, float]]:
+    """
+    Every spawn of a level as (tick, NPCRegister entry, x offset, y offset),
+    sorted by tick. Offsets are relative to the player's head at spawn time.
+    """
+    rng = random.Random(seed)
+    schedule = []
+    for wave in level[LevelRegister.WAVES]:
+        start = wave[LevelRegister.START] * LevelRegister.TICK_RATE
+        spread = wave[LevelRegister.SPREAD] * LevelRegister.TICK_RATE
+        count = wave[LevelRegister.COUNT]
+        for i in range(count):
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = wave[LevelRegister.DISTANCE] * rng.uniform(1.0, 1.3)
+            tick = start + i * spread // count
+            schedule.append((tick, wave[LevelRegister.CHARACTER], math.cos(angle) * distance, math.sin(angle) * distance))
+    schedule.sort(key=lambda spawn: spawn[0])
+    return schedule
+
+
+# ─────────────────────────────────────────────────────────────
+# Pool
+# ─────────────────────────────────────────────────────────────
+
+class NPCPool:
+    def __init__(self, screen: pygame.Surface) -> None:
+        """
+        Keeps dead NPCs per NPCRegister entry and hands them out again instead
+        of building new ones.
+
+        Args:
+            screen: Surface new NPCs draw on.
+        """
+        self.screen = screen
+        self.free: dict[tuple, list[NPCCharacter]] = {}
+        self.hits: dict[tuple, int] = {}
+        self.misses: dict[tuple, int] = {}
+
+    def prewarm(self, character: tuple, count: int) -> None:
+        """Fills the pool of ``character`` up to ``count`` NPCs, e.g. while a level loads."""
+        free = self.free.setdefault(character, [])
+        while len(free) < count:
+            free.append(NPCCharacter(self.screen, character, spawn=(0, 0)))
+
+    def acquire(self, character: tuple, spawn: tuple[float, float]) -> NPCCharacter:
+        """A pooled NPC brought back to life at ``spawn``, or a new one if the pool is empty."""
+        free = self.free.get(character)
+        if free:
+            self.hits[character] = self.hits.get(character, 0) + 1
+            npc = free.pop()
+            npc.reset(spawn)
+            return npc
+        self.misses[character] = self.misses.get(character, 0) + 1
+        return NPCCharacter(self.screen, character, spawn=spawn, active=True)
+
+    def release(self, npc: NPCCharacter) -> None:
+        npc.activity = None
+        npc.active = False
+        self.free.setdefault(npc.character, []).append(npc)
+
+    def stats(self) -> dict[str, dict]:
+        """Hits, misses, hit rate and free NPCs per NPC name."""
+        stats = {}
+        for character in {*self.free, *self.hits, *self.misses}:
+            hits = self.hits.get(character, 0)
+            misses = self.misses.get(character, 0)
+            stats[character[NPCRegister.NAME]] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "free": len(self.free.get(character, ())),
+            }
+        return stats
+
+
+# ─────────────────────────────────────────────────────────────
+# Spawner
+# ─────────────────────────────────────────────────────────────
+
+class WaveSpawner:
+    def __init__(self, game: Game, level: tuple, seed: int = 0, spawns_per_frame: int = 8,
+                 spawn_budget_ms: float = 1.0, prewarm: bool = True) -> None:
+        """
+        Runs a timed level: spawns its waves around the player, lets the NPCs
+        chase the player and returns dead ones to their pool.
+
+        Spawns that are due wait in a queue, each frame takes at most
+        ``spawns_per_frame`` of them and stops early once ``spawn_budget_ms``
+        is used up, so a big wave is spread over several frames.
+
+        Args:
+            game: Game the NPCs are added to.
+            level: LevelRegister entry.
+            seed: Seed of the spawn positions.
+            spawns_per_frame: Most NPCs spawned in one frame.
+            spawn_budget_ms: Spawn time per frame after which the rest waits for the next frame.
+            prewarm: Build the NPCs of the biggest wave of each type up front.
+        """
+        self.game = game
+        self.level = level
+        self.spawns_per_frame = spawns_per_frame
+        self.spawn_budget_ms = spawn_budget_ms
+
+        self.schedule = build_schedule(level, seed)
+        self.duration_ticks = level[LevelRegister.DURATION] * LevelRegister.TICK_RATE
+        self.pool = NPCPool(game.world_screen)
+        if prewarm:
+            biggest: dict[tuple, int] = {}
+            for wave in level[LevelRegister.WAVES]:
+                character = wave[LevelRegister.CHARACTER]
+                biggest[character] = max(biggest.get(character, 0), wave[LevelRegister.COUNT])
+            for character, count in biggest.items():
+                self.pool.prewarm(character, count)
+
+        # (name, NPC) of every spawned NPC that is not back in its pool, and the tick each dead one died at
+        self.live: list[tuple[str, NPCCharacter]] = []
+        self.dead_since: dict[NPCCharacter, int] = {}
+        self.reset()
+        cprint(f"Level {level[LevelRegister.NAME]}: {len(self.schedule)} spawns in "
+               f"{len(level[LevelRegister.WAVES])} waves", VC.MAGENTA)
+
+    def reset(self) -> None:
+        """Starts the level over, NPCs still alive go back to their pools."""
+        for name, npc in self.live:
+            self.game.ai.unregister(npc)
+            self.game.aggro.unregister(npc)
+            self.game.remove_npc(name)
+            self.pool.release(npc)
+
+        self.tick = 0
+        self.cursor = 0
+        self.pending: deque[tuple[int, tuple, float, float]] = deque()
+        self.live = []
+        self.dead_since = {}
+        self.serial = 0
+
+        self.spawned = 0
+        self.recycled = 0
+        self.last_spawns = 0
+        self.last_spawn_ms = 0.0
+        self.max_spawns = 0
+        self.max_spawn_ms = 0.0
+        self.spawn_ms: deque[float] = deque(maxlen=600)
+
+    @property
+    def finished(self) -> bool:
+        return self.tick >= self.duration_ticks
+
+    def time_left(self) -> float:
+        """Seconds until the level ends."""
+        return max(0, self.duration_ticks - self.tick) / LevelRegister.TICK_RATE
+
+    # ──────────────────────────────────────────────────────────────
+    # Tick
+    # ──────────────────────────────────────────────────────────────
+
+    def update(self) -> None:
+        """Spawns what is due and recycles dead NPCs. Call once per tick."""
+        if self.finished:
+            return
+        head = self.game.player.snake_pos[0]
+
+        while self.cursor < len(self.schedule) and self.schedule[self.cursor][0] <= self.tick:
+            self.pending.append(self.schedule[self.cursor])
+            self.cursor += 1
+        self._spawn_pending(head)
+        self._tend()
+
+        self.tick += 1
+        if self.finished:
+            cprint(f"Level {self.level[LevelRegister.NAME]} is over", VC.MAGENTA)
+
+    def _spawn_pending(self, head) -> None:
+        start = time.perf_counter()
+        spawns = 0
+        while self.pending and spawns < self.spawns_per_frame:
+            _, character, offset_x, offset_y = self.pending.popleft()
+            npc = self.pool.acquire(character, (head[0] + offset_x, head[1] + offset_y))
+            npc.set_target_pos((-offset_x, -offset_y))
+
+            name = f"wave_{self.serial}"
+            self.serial += 1
+            self.game.add_npc(name, npc)
+            self.game.ai.register(npc)
+            self.game.aggro.register(npc)
+            self.live.append((name, npc))
+            spawns += 1
+            if (time.perf_counter() - start) * 1000 >= self.spawn_budget_ms:
+                break
+
+        spawn_ms = (time.perf_counter() - start) * 1000
+        self.spawned += spawns
+        self.last_spawns = spawns
+        self.last_spawn_ms = spawn_ms
+        if spawns:
+            self.spawn_ms.append(spawn_ms)
+            self.max_spawns = max(self.max_spawns, spawns)
+            self.max_spawn_ms = max(self.max_spawn_ms, spawn_ms)
+
+    def _tend(self) -> None:
+        """Looks at every SCAN_TICKS-th NPC, a corpse goes back to the pool once it is old. The AI scheduler steers the living."""
+        recycled = []
+        for name, npc in self.live[self.tick % LevelRegister.SCAN_TICKS::LevelRegister.SCAN_TICKS]:
+            if npc.HP > 0:
+                continue
+
+            died = self.dead_since.setdefault(npc, self.tick)
+            if self.tick - died >= LevelRegister.CORPSE_TICKS:
+                del self.dead_since[npc]
+                self.game.ai.unregister(npc)
+                self.game.aggro.unregister(npc)
+                self.game.remove_npc(name)
+                self.pool.release(npc)
+                recycled.append(npc)
+
+        if recycled:
+            gone = set(recycled)
+            self.live = [entry for entry in self.live if entry[1] not in gone]
+            self.recycled += len(recycled)
+
+    # ──────────────────────────────────────────────────────────────
+    # Stats
+    # ──────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        """Spawn counts, spawn time per frame and the pool hit rates."""
+        return {
+            "level": self.level[LevelRegister.NAME],
+            "time_left": self.time_left(),
+            "spawned": self.spawned,
+            "pending": len(self.pending) + len(self.schedule) - self.cursor,
+            "alive": sum(1 for _, npc in self.live if npc.HP > 0),
+            "recycled": self.recycled,
+            "last_spawns": self.last_spawns,
+            "last_spawn_ms": self.last_spawn_ms,
+            "max_spawns_per_frame": self.max_spawns,
+            "max_spawn_ms": self.max_spawn_ms,
+            "spawn_ms_avg": sum(self.spawn_ms) / len(self.spawn_ms) if self.spawn_ms else 0.0,
+            "pools": self.pool.stats(),
+        }
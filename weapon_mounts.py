@@ -0,0 +1,96 @@
+"""Positions, angles and velocities of the weapons mounted on a snake, worked out in one pass per tick."""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+import pygame
+
+if TYPE_CHECKING:
+    from player_attachments import Attachment
+    from player_character import Player
+
+
+class MountTransforms:
+    def __init__(self, player: Player) -> None:
+        """
+        Moves the weapons in ``player.weapon_slots`` with the body. One pass
+        per tick gives every occupied slot its position and the angle of the
+        body around it, and writes both to the weapon (pos, last_angle) for
+        drawing. Where each weapon was before the pass is kept, a firing
+        weapon asks motion() how far it moved and turned.
+
+        A weapon new on its slot starts with no velocity.
+
+        Args:
+            player: Player whose mounted weapons are moved.
+        """
+        self.player = player
+
+        # (slot, weapon) pairs of the last pass, in row order
+        self.layout: tuple[tuple[int, Attachment], ...] = ()
+        self.weapons: list[Attachment] = []
+        self.row_of: dict[Attachment, int] = {}
+        # (position, angle) per row before the last pass, None for a weapon new on its slot
+        self.previous: list = []
+
+        # Counters
+        self.passes = 0
+        self.rebuilds = 0
+        self.last_ms = 0.0
+
+    def _rebuild(self, layout: tuple[tuple[int, Attachment], ...]) -> None:
+        """Rows for a changed set of slots, a weapon that stays on its slot keeps its last transform."""
+        kept = set(self.layout)
+        self.previous = [(weapon.pos, weapon.last_angle) if (idx, weapon) in kept else None for idx, weapon in layout]
+        self.layout = layout
+        self.weapons = [weapon for _, weapon in layout]
+        self.row_of = {weapon: row for row, weapon in enumerate(self.weapons)}
+        self.rebuilds += 1
+
+    def update(self) -> None:
+        """Moves every mounted weapon to its segment, call once per tick after the body moved."""
+        start = time.perf_counter()
+        layout = tuple((idx, weapon) for idx, weapon in self.player.weapon_slots.items() if weapon)
+        if layout != self.layout:
+            self._rebuild(layout)
+        else:
+            self.previous = [(weapon.pos, weapon.last_angle) for weapon in self.weapons]
+
+        body = self.player.snake_pos
+        last = len(body) - 1
+        for idx, weapon in layout:
+            if idx:
+                # Direction of the body around a slot, from the segment before it to the one after it
+                before = body[idx - 1]
+                after = body[min(idx + 1, last)]
+                weapon.last_angle = -math.degrees(math.atan2(after[1] - before[1], after[0] - before[0]))
+            else:
+                weapon.last_angle = 0.0
+            weapon.pos = pygame.Vector2(body[idx])
+
+        self.passes += 1
+        self.last_ms = (time.perf_counter() - start) * 1000
+
+    def motion(self, weapon: Attachment) -> tuple[pygame.Vector2, float]:
+        """
+        How far ``weapon`` moved and how many degrees it turned in the last
+        pass, nothing for a weapon that was not mounted then.
+        """
+        row = self.row_of.get(weapon)
+        if row is None or self.previous[row] is None:
+            return pygame.Vector2(0, 0), 0.0
+        pos, angle = self.previous[row]
+        # Shortest turn, a body crossing the -180/180 seam has not spun around
+        return weapon.pos - pos, (weapon.last_angle - angle + 180.0) % 360.0 - 180.0
+
+    def stats(self) -> dict:
+        """Mounted weapons, passes, slot rebuilds and the time of the last pass."""
+        return {
+            "mounted": len(self.layout),
+            "passes": self.passes,
+            "rebuilds": self.rebuilds,
+            "last_ms": self.last_ms,
+        }